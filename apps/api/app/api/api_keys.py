@@ -12,6 +12,7 @@ from app.services.api_key_service import (
     get_all_api_keys,
     delete_api_key
 )
+from app.services.cli.availability import cli_availability
 
 router = APIRouter(prefix="/api/settings/api-keys", tags=["api-keys"])
 
@@ -39,6 +40,7 @@ async def create_or_update_api_key(body: APIKeyCreate, db: Session = Depends(get
     
     try:
         save_api_key(db, body.provider, body.key.strip())
+        cli_availability.invalidate()
         return {"message": "API key saved successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save API key: {str(e)}")
@@ -54,6 +56,7 @@ async def delete_api_key_endpoint(provider: str, db: Session = Depends(get_db)):
         success = delete_api_key(db, provider)
         if not success:
             raise HTTPException(status_code=404, detail="API key not found")
+        cli_availability.invalidate()
         return {"message": "API key deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete API key: {str(e)}")
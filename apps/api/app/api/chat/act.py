@@ -2,7 +2,7 @@
 Act Execution API Endpoints
 Handles CLI execution and AI actions
 """
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from datetime import datetime
 import uuid
@@ -13,6 +13,7 @@ from pydantic import BaseModel
 import os
 
 from app.api.deps import get_db
+from app.db.session import SessionLocal
 from app.core.config import settings
 from app.models.projects import Project
 from app.models.messages import Message
@@ -22,8 +23,11 @@ from app.models.user_requests import UserRequest
 from app.services.cli.unified_manager import UnifiedCLIManager
 from app.services.cli.base import CLIType
 from app.services.git_ops import commit_all
+from app.services.request_queue import request_queue, QueueFullError
 from app.core.websocket.manager import manager
 from app.core.terminal_ui import ui
+
+
 def build_project_info(project: Project, db: Session) -> dict:
     """Ensure project has a usable repo path and collect runtime info."""
     repo_path = project.repo_path
@@ -524,11 +528,128 @@ async def execute_act_task(
         })
 
 
+async def _fail_queued_request(db: Session, user_request: UserRequest, session: ChatSession | None, error: str):
+    """Mark a queued request as failed before it reached the CLI"""
+    user_request.is_completed = True
+    user_request.is_successful = False
+    user_request.completed_at = datetime.utcnow()
+    user_request.error_message = error
+    if session:
+        session.status = "failed"
+        session.error = error
+        session.completed_at = datetime.utcnow()
+    db.commit()
+
+    event_type = "chat_complete" if user_request.request_type == "chat" else "act_complete"
+    await manager.broadcast_to_project(user_request.project_id, {
+        "type": event_type,
+        "data": {
+            "status": "failed",
+            "session_id": user_request.session_id,
+            "request_id": user_request.id,
+            "error": error
+        }
+    })
+
+
+async def run_queued_request(request_id: str):
+    """Queue worker entry point: execute a persisted ACT/chat request with its own DB session"""
+    db = SessionLocal()
+    try:
+        user_request = db.get(UserRequest, request_id)
+        if not user_request or user_request.is_completed:
+            return
+
+        user_request.attempts = (user_request.attempts or 0) + 1
+        db.commit()
+
+        project = db.get(Project, user_request.project_id)
+        session = db.get(ChatSession, user_request.session_id) if user_request.session_id else None
+        if not project or not session:
+            await _fail_queued_request(db, user_request, session, "Project or session no longer exists")
+            return
+
+        try:
+            project_info = build_project_info(project, db)
+        except HTTPException as e:
+            await _fail_queued_request(db, user_request, session, str(e.detail))
+            return
+
+        payload = user_request.queue_payload or {}
+        cli_preference = CLIType(payload["cli_preference"]) if payload.get("cli_preference") else None
+        fallback_enabled = payload.get("fallback_enabled", True)
+        images = [ImageAttachment(**img) for img in payload.get("images", [])]
+        conversation_id = payload.get("conversation_id") or str(uuid.uuid4())
+        is_initial_prompt = payload.get("is_initial_prompt", False)
+
+        if user_request.request_type == "chat":
+            user_request.started_at = datetime.utcnow()
+            user_request.cli_type_used = cli_preference.value if cli_preference else project_info['preferred_cli']
+            user_request.model_used = project_info['selected_model']
+            db.commit()
+
+            await execute_chat_task(
+                project_info,
+                session,
+                user_request.instruction,
+                conversation_id,
+                images,
+                db,
+                cli_preference,
+                fallback_enabled,
+                is_initial_prompt
+            )
+
+            # execute_chat_task reports its outcome through the session only
+            user_request.is_completed = True
+            user_request.is_successful = session.status == "completed"
+            user_request.completed_at = datetime.utcnow()
+            if not user_request.is_successful:
+                user_request.error_message = session.error
+            db.commit()
+        else:
+            await execute_act_task(
+                project_info,
+                session,
+                user_request.instruction,
+                conversation_id,
+                images,
+                db,
+                cli_preference,
+                fallback_enabled,
+                is_initial_prompt,
+                request_id
+            )
+    except Exception as e:
+        ui.error(f"Queued request {request_id[:8]}... crashed: {e}", "QUEUE")
+        db.rollback()
+        user_request = db.get(UserRequest, request_id)
+        if user_request and not user_request.is_completed:
+            session = db.get(ChatSession, user_request.session_id) if user_request.session_id else None
+            await _fail_queued_request(db, user_request, session, str(e))
+    finally:
+        db.close()
+
+
+request_queue.register_runner("act", run_queued_request)
+request_queue.register_runner("chat", run_queued_request)
+
+
+def _queue_payload(body: ActRequest, conversation_id: str, cli_preference: CLIType, fallback_enabled: bool) -> dict:
+    """Everything needed to re-run the request after a restart"""
+    return {
+        "conversation_id": conversation_id,
+        "cli_preference": cli_preference.value,
+        "fallback_enabled": fallback_enabled,
+        "images": [img.model_dump() if hasattr(img, "model_dump") else img.dict() for img in body.images],
+        "is_initial_prompt": body.is_initial_prompt
+    }
+
+
 @router.post("/{project_id}/act", response_model=ActResponse)
 async def run_act(
     project_id: str,
     body: ActRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Execute instruction using unified CLI system"""
@@ -539,6 +660,11 @@ async def run_act(
     if not project:
         ui.error(f"Project {project_id} not found", "ACT API")
         raise HTTPException(status_code=404, detail="Project not found")
+
+    try:
+        request_queue.ensure_capacity(project_id)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     
     # Determine CLI preference
     cli_preference = CLIType(body.cli_preference or project.preferred_cli)
@@ -644,6 +770,7 @@ async def run_act(
         session_id=session.id,
         instruction=body.instruction,
         request_type="act",
+        queue_payload=_queue_payload(body, conversation_id, cli_preference, fallback_enabled),
         created_at=datetime.utcnow()
     )
     db.add(user_request)
@@ -675,28 +802,24 @@ async def run_act(
     except Exception as e:
         ui.error(f"WebSocket failed: {e}", "ACT API")
     
-    # Extract project info to avoid DetachedInstanceError in background task
-    project_info = build_project_info(project, db)
+    # Validate repo path up front; the worker re-checks it before running
+    try:
+        build_project_info(project, db)
+    except HTTPException as e:
+        user_request.is_completed = True
+        user_request.is_successful = False
+        user_request.completed_at = datetime.utcnow()
+        user_request.error_message = str(e.detail)
+        db.commit()
+        raise
     
-    # Add background task
-    background_tasks.add_task(
-        execute_act_task,
-        project_info,
-        session,
-        body.instruction,
-        conversation_id,
-        body.images,
-        db,
-        cli_preference,
-        fallback_enabled,
-        body.is_initial_prompt,
-        request_id
-    )
+    # Hand off to the request queue (one execution per project at a time)
+    position = await request_queue.enqueue(request_id, project_id, "act", cli_preference.value)
     return ActResponse(
         session_id=session.id,
         conversation_id=conversation_id,
-        status="running",
-        message="Act execution started"
+        status="queued" if position > 0 else "running",
+        message=f"Act execution queued (position {position})" if position > 0 else "Act execution started"
     )
 
 
@@ -704,7 +827,6 @@ async def run_act(
 async def run_chat(
     project_id: str,
     body: ActRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Execute chat instruction using unified CLI system (same as act but different event type)"""
@@ -714,6 +836,11 @@ async def run_chat(
     if not project:
         ui.error(f"Project {project_id} not found", "CHAT API")
         raise HTTPException(status_code=404, detail="Project not found")
+
+    try:
+        request_queue.ensure_capacity(project_id)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     
     # Determine CLI preference
     cli_preference = CLIType(body.cli_preference or project.preferred_cli)
@@ -785,6 +912,20 @@ async def run_chat(
     )
     db.add(session)
     
+    # Track chat requests too so they can be queued and resumed
+    request_id = str(uuid.uuid4())
+    user_request = UserRequest(
+        id=request_id,
+        project_id=project_id,
+        user_message_id=user_message.id,
+        session_id=session.id,
+        instruction=body.instruction,
+        request_type="chat",
+        queue_payload=_queue_payload(body, conversation_id, cli_preference, fallback_enabled),
+        created_at=datetime.utcnow()
+    )
+    db.add(user_request)
+    
     try:
         db.commit()
     except Exception as e:
@@ -804,6 +945,7 @@ async def run_chat(
                 "parent_message_id": None,
                 "session_id": session.id,
                 "conversation_id": conversation_id,
+                "request_id": request_id,
                 "created_at": user_message.created_at.isoformat()
             },
             "timestamp": user_message.created_at.isoformat()
@@ -811,26 +953,23 @@ async def run_chat(
     except Exception as e:
         ui.error(f"WebSocket failed: {e}", "CHAT API")
     
-    # Extract project info (with validated repo_path) to avoid DetachedInstanceError
-    project_info = build_project_info(project, db)
+    # Validate repo path up front; the worker re-checks it before running
+    try:
+        build_project_info(project, db)
+    except HTTPException as e:
+        user_request.is_completed = True
+        user_request.is_successful = False
+        user_request.completed_at = datetime.utcnow()
+        user_request.error_message = str(e.detail)
+        db.commit()
+        raise
     
-    # Add background task for chat (same as act but with different event type)
-    background_tasks.add_task(
-        execute_chat_task,
-        project_info,
-        session,
-        body.instruction,
-        conversation_id,
-        body.images,
-        db,
-        cli_preference,
-        fallback_enabled,
-        body.is_initial_prompt
-    )
+    # Hand off to the request queue (same as act but with different event type)
+    position = await request_queue.enqueue(request_id, project_id, "chat", cli_preference.value)
     
     return ActResponse(
         session_id=session.id,
         conversation_id=conversation_id,
-        status="running",
-        message="Chat execution started"
+        status="queued" if position > 0 else "running",
+        message=f"Chat execution queued (position {position})" if position > 0 else "Chat execution started"
     )
@@ -6,11 +6,13 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
+import asyncio
 
 from app.api.deps import get_db
 from app.models.projects import Project
 from app.services.cli import UnifiedCLIManager
 from app.services.cli.base import CLIType
+from app.services.cli.availability import cli_availability
 
 
 router = APIRouter()
@@ -97,6 +99,7 @@ async def set_cli_preference(
     # Update project preferences
     project.preferred_cli = cli_type.value
     db.commit()
+    cli_availability.invalidate(cli_type)
     
     return {
         "preferred_cli": project.preferred_cli,
@@ -130,9 +133,10 @@ async def set_model_preference(
 async def get_cli_status(
     project_id: str,
     cli_type: str,
+    refresh: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Check status of a specific CLI"""
+    """Check status of a specific CLI (cached, pass ?refresh=true to re-probe)"""
     project = db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -150,7 +154,7 @@ async def get_cli_status(
         db=db
     )
     
-    status = await cli_manager.check_cli_status(cli_enum)
+    status = await cli_manager.check_cli_status(cli_enum, force_refresh=refresh)
     
     return CLIStatusResponse(
         cli_type=cli_type,
@@ -162,8 +166,12 @@ async def get_cli_status(
 
 
 @router.get("/{project_id}/cli-status", response_model=AllCLIStatusResponse)
-async def get_all_cli_status(project_id: str, db: Session = Depends(get_db)):
-    """Check status of all CLIs"""
+async def get_all_cli_status(
+    project_id: str,
+    refresh: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Check status of all CLIs (cached, pass ?refresh=true to re-probe)"""
     project = db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -188,11 +196,14 @@ async def get_all_cli_status(project_id: str, db: Session = Depends(get_db)):
             models=status.get("models"),
         )
 
-    claude_status = await manager.check_cli_status(CLIType.CLAUDE)
-    cursor_status = await manager.check_cli_status(CLIType.CURSOR)
-    codex_status = await manager.check_cli_status(CLIType.CODEX)
-    qwen_status = await manager.check_cli_status(CLIType.QWEN)
-    gemini_status = await manager.check_cli_status(CLIType.GEMINI)
+    # Probe concurrently; cached results return immediately
+    claude_status, cursor_status, codex_status, qwen_status, gemini_status = await asyncio.gather(
+        manager.check_cli_status(CLIType.CLAUDE, force_refresh=refresh),
+        manager.check_cli_status(CLIType.CURSOR, force_refresh=refresh),
+        manager.check_cli_status(CLIType.CODEX, force_refresh=refresh),
+        manager.check_cli_status(CLIType.QWEN, force_refresh=refresh),
+        manager.check_cli_status(CLIType.GEMINI, force_refresh=refresh),
+    )
 
     return AllCLIStatusResponse(
         claude=to_resp("claude", claude_status),
@@ -2,18 +2,21 @@
 Chat Messages API Endpoints
 Handles message CRUD operations
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import List, Optional, Tuple
 from datetime import datetime
+import base64
 import uuid
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
 from app.models.projects import Project
 from app.models.messages import Message
 from app.models.user_requests import UserRequest
 from app.core.websocket.manager import manager
+from app.services.request_queue import request_queue
 
 
 router = APIRouter()
@@ -38,20 +41,49 @@ class SendMessageRequest(BaseModel):
     conversation_id: str | None = None
 
 
+def _encode_cursor(message: Message) -> str:
+    raw = f"{message.created_at.isoformat()}|{message.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, message_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), message_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/{project_id}/messages", response_model=List[MessageResponse])
 async def get_messages(
     project_id: str, 
+    response: Response,
     conversation_id: Optional[str] = None, 
     cli_filter: Optional[str] = None,
     limit: int = Query(100, le=1000),
-    db: Session = Depends(get_db)
+    before: Optional[str] = Query(None, description="Cursor: return messages older than this one"),
+    after: Optional[str] = Query(None, description="Cursor: return messages newer than this one"),
+    db: Session = Depends(get_read_db)
 ):
-    """Get messages for a project with optional filters"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    """Get messages for a project with optional filters.
+
+    Keyset-paginated on (created_at, id). Messages are returned oldest first;
+    the X-Before-Cursor / X-After-Cursor response headers page further back
+    or forward.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either 'before' or 'after', not both")
+
+    project = db.query(Project.id).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    query = db.query(Message).filter(Message.project_id == project_id)
+    query = (
+        db.query(Message)
+        .filter(Message.project_id == project_id)
+        .filter(Message.hidden_from_ui == False)  # noqa: E712
+    )
     
     if conversation_id:
         query = query.filter(Message.conversation_id == conversation_id)
@@ -59,14 +91,32 @@ async def get_messages(
     if cli_filter:
         query = query.filter(Message.cli_source == cli_filter)
     
-    messages = query.order_by(Message.created_at.desc()).limit(limit).all()
+    if after:
+        cursor_at, cursor_id = _decode_cursor(after)
+        query = query.filter(or_(
+            Message.created_at > cursor_at,
+            and_(Message.created_at == cursor_at, Message.id > cursor_id),
+        ))
+        rows = query.order_by(Message.created_at.asc(), Message.id.asc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        messages = rows[:limit]
+    else:
+        if before:
+            cursor_at, cursor_id = _decode_cursor(before)
+            query = query.filter(or_(
+                Message.created_at < cursor_at,
+                and_(Message.created_at == cursor_at, Message.id < cursor_id),
+            ))
+        rows = query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        messages = list(reversed(rows[:limit]))
     
-    # Filter out messages marked as hidden from UI
-    filtered_messages = []
-    for msg in messages:
-        if msg.metadata_json and msg.metadata_json.get("hidden_from_ui", False):
-            continue  # Skip hidden messages
-        filtered_messages.append(msg)
+    if messages:
+        older_available = has_more if not after else True
+        if older_available:
+            response.headers["X-Before-Cursor"] = _encode_cursor(messages[0])
+        response.headers["X-After-Cursor"] = _encode_cursor(messages[-1])
+    response.headers["X-Has-More"] = "true" if has_more else "false"
     
     return [
         MessageResponse(
@@ -80,12 +130,12 @@ async def get_messages(
             conversation_id=msg.conversation_id,
             cli_source=msg.metadata_json.get("cli_type") if msg.metadata_json else None,
             created_at=msg.created_at
-        ) for msg in reversed(filtered_messages)
+        ) for msg in messages
     ]
 
 
 @router.get("/{project_id}/active-session")
-async def get_active_session(project_id: str, db: Session = Depends(get_db)):
+async def get_active_session(project_id: str, db: Session = Depends(get_read_db)):
     """Get the currently active session for a project"""
     from app.models.sessions import Session as ChatSession
     
@@ -172,7 +222,7 @@ async def send_message(
 
 
 @router.get("/{project_id}/sessions/{session_id}/status")
-async def get_session_status(project_id: str, session_id: str, db: Session = Depends(get_db)):
+async def get_session_status(project_id: str, session_id: str, db: Session = Depends(get_read_db)):
     """Get the status of a specific session"""
     from app.models.sessions import Session as ChatSession
     
@@ -231,7 +281,7 @@ async def clear_messages(
 @router.get("/{project_id}/requests/active")
 async def get_active_requests(
     project_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get active user requests for a project (no logging for polling)"""
     # No logging to keep server logs clean
@@ -247,4 +297,8 @@ async def get_active_requests(
         .count()
     )
     
-    return {"hasActiveRequests": active_count > 0, "activeCount": active_count}
\ No newline at end of file
+    return {
+        "hasActiveRequests": active_count > 0,
+        "activeCount": active_count,
+        "queuedCount": request_queue.pending_count(project_id)
+    }
\ No newline at end of file
@@ -34,4 +34,10 @@ async def websocket_endpoint(websocket: WebSocket, project_id: str):
     except Exception as e:
         ui.error(f"Setup error for project {project_id}: {e}", "WebSocket")
     finally:
-        manager.disconnect(websocket, project_id)
\ No newline at end of file
+        manager.disconnect(websocket, project_id)
+
+
+@router.get("/{project_id}/ws-stats")
+async def websocket_stats(project_id: str):
+    """Per-connection outbound queue depth, drops and send lag"""
+    return {"connections": manager.connection_stats(project_id).get(project_id, [])}
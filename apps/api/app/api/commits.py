@@ -1,15 +1,29 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+import asyncio
+import json
 import os
+import re
+import subprocess
 from app.core.config import settings
 from app.api.deps import get_db
 from sqlalchemy.orm import Session
 from app.models.projects import Project as ProjectModel
-from app.services.git_ops import list_commits, show_diff, hard_reset
+from app.services.commit_history import CursorError, commit_history
+from app.services.git_ops import (
+    commit_file_stats,
+    file_diff,
+    hard_reset,
+    iter_commit_diff,
+    show_diff,
+)
 
 router = APIRouter(prefix="/api/commits", tags=["commits"])
 
+_SHA_RE = re.compile(r"^[0-9a-fA-F]{4,64}$")
+
 
 class Commit(BaseModel):
     commit_sha: str
@@ -19,29 +33,97 @@ class Commit(BaseModel):
     message: str
 
 
-@router.get("/{project_id}", response_model=List[Commit])
-async def commits(project_id: str, db: Session = Depends(get_db)) -> List[Commit]:
+def _project_repo(project_id: str, db: Session) -> str:
     row = db.get(ProjectModel, project_id)
     if not row:
         raise HTTPException(status_code=404, detail="Project not found")
-    repo = os.path.join(settings.projects_root, project_id, "repo")
-    return [Commit(**c) for c in list_commits(repo)]
+    return os.path.join(settings.projects_root, project_id, "repo")
+
+
+def _check_sha(commit_sha: str) -> None:
+    if not _SHA_RE.match(commit_sha):
+        raise HTTPException(status_code=400, detail="Invalid commit SHA")
+
+
+@router.get("/{project_id}", response_model=List[Commit])
+async def commits(
+    project_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = Query(None, description="commit_sha of the last commit on the previous page"),
+    path: Optional[str] = Query(None, description="Only commits touching this path"),
+    db: Session = Depends(get_db),
+) -> List[Commit]:
+    repo = _project_repo(project_id, db)
+    try:
+        # Walking to a cursor or a path's history reads git objects: keep it off the event loop
+        page, next_cursor = await asyncio.to_thread(
+            commit_history.page, repo, min(limit, settings.commit_page_max_limit), cursor, path
+        )
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [Commit(**c) for c in page]
+
+
+@router.get("/{project_id}/{commit_sha}/files")
+async def commit_files(project_id: str, commit_sha: str, db: Session = Depends(get_db)):
+    """Per-file stats; files flagged `large` are fetched one by one via /diff?path="""
+    repo = _project_repo(project_id, db)
+    _check_sha(commit_sha)
+    try:
+        files = commit_file_stats(repo, commit_sha)
+    except subprocess.CalledProcessError:
+        raise HTTPException(status_code=404, detail="Commit not found")
+    return {
+        "commit_sha": commit_sha,
+        "files": files,
+        "additions": sum(f["additions"] for f in files),
+        "deletions": sum(f["deletions"] for f in files),
+    }
 
 
 @router.get("/{project_id}/{commit_sha}/diff")
-async def commit_diff(project_id: str, commit_sha: str, db: Session = Depends(get_db)):
-    row = db.get(ProjectModel, project_id)
-    if not row:
-        raise HTTPException(status_code=404, detail="Project not found")
-    repo = os.path.join(settings.projects_root, project_id, "repo")
-    return {"diff": show_diff(repo, commit_sha)}
+async def commit_diff(
+    project_id: str,
+    commit_sha: str,
+    path: Optional[str] = Query(None, description="Return only this file's diff"),
+    db: Session = Depends(get_db),
+):
+    repo = _project_repo(project_id, db)
+    _check_sha(commit_sha)
+    try:
+        if path:
+            return file_diff(repo, commit_sha, path)
+        return {"diff": show_diff(repo, commit_sha, settings.commit_diff_max_bytes)}
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not changed in this commit")
+    except subprocess.CalledProcessError:
+        raise HTTPException(status_code=404, detail="Commit not found")
+
+
+@router.get("/{project_id}/{commit_sha}/diff/stream")
+async def commit_diff_stream(project_id: str, commit_sha: str, db: Session = Depends(get_db)):
+    """NDJSON: a `stats` line, then one `file` line per file (large ones as `lazy` placeholders)"""
+    repo = _project_repo(project_id, db)
+    _check_sha(commit_sha)
+    try:
+        items = iter_commit_diff(repo, commit_sha)
+        first = next(items)
+    except subprocess.CalledProcessError:
+        raise HTTPException(status_code=404, detail="Commit not found")
+
+    def ndjson():
+        yield json.dumps(first) + "\n"
+        for item in items:
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @router.post("/{project_id}/{commit_sha}/revert")
 async def revert_to(project_id: str, commit_sha: str, db: Session = Depends(get_db)):
-    row = db.get(ProjectModel, project_id)
-    if not row:
-        raise HTTPException(status_code=404, detail="Project not found")
-    repo = os.path.join(settings.projects_root, project_id, "repo")
+    repo = _project_repo(project_id, db)
     hard_reset(repo, commit_sha)
     return {"ok": True}
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, ReadSessionLocal
 
 
 def get_db():
@@ -9,3 +9,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Read-only database session dependency (for GET endpoints)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -13,6 +13,7 @@ from app.services.env_manager import (
     delete_env_var,
     sync_env_file_to_db,
     sync_db_to_env_file,
+    sync_env_bidirectional,
     get_env_var_conflicts
 )
 from app.core.crypto import secret_box
@@ -49,6 +50,14 @@ class SyncResponse(BaseModel):
     message: str
 
 
+class TwoWaySyncResponse(BaseModel):
+    success: bool
+    to_db: int
+    to_file: int
+    conflicts: List[str]
+    message: str
+
+
 class ConflictResponse(BaseModel):
     conflicts: List[dict]
     has_conflicts: bool
@@ -229,6 +238,33 @@ async def sync_database_to_file(project_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to sync DB to file: {str(e)}")
 
 
+@router.post("/{project_id}/sync", response_model=TwoWaySyncResponse)
+async def sync_both_ways(project_id: str, prefer: Optional[str] = None, db: Session = Depends(get_db)):
+    """Two-way sync of changes since the last sync; `prefer` (file|db) resolves conflicts"""
+    # Verify project exists
+    project = db.get(ProjectModel, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if prefer not in (None, "file", "db"):
+        raise HTTPException(status_code=400, detail="prefer must be 'file' or 'db'")
+    
+    try:
+        result = sync_env_bidirectional(db, project_id, prefer=prefer)
+        return TwoWaySyncResponse(
+            success=not result["conflicts"],
+            to_db=result["to_db"],
+            to_file=result["to_file"],
+            conflicts=result["conflicts"],
+            message=(
+                f"Synced {result['to_db']} changes to database and {result['to_file']} to .env file"
+                + (f"; {len(result['conflicts'])} conflicts left unresolved" if result["conflicts"] else "")
+            )
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to sync env vars: {str(e)}")
+
+
 # Legacy endpoint for backward compatibility
 @router.post("/{project_id}/upsert")
 async def upsert_env(project_id: str, body: EnvVarCreate, db: Session = Depends(get_db)):
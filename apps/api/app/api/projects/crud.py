@@ -2,18 +2,20 @@
 Project CRUD Operations
 Handles create, read, update, delete operations for projects
 """
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Request, Response
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy import desc, func
 from sqlalchemy.orm import Session
+import hashlib
 import re
+import time
 import uuid
 import asyncio
 import os
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
 from app.models.projects import Project as ProjectModel
 from app.models.messages import Message
 from app.models.project_services import ProjectServiceConnection
@@ -21,6 +23,8 @@ from app.models.sessions import Session as SessionModel
 from app.services.project.initializer import initialize_project
 from app.core.websocket.manager import manager as websocket_manager
 from app.services.local_runtime import get_npm_executable
+from app.services.npm_store import npm_store
+from app.services.env_sync import env_sync
 
 # Project ID validation regex
 PROJECT_ID_REGEX = re.compile(r"^[a-z0-9-]{3,}$")
@@ -160,9 +164,14 @@ async def install_dependencies_background(project_id: str, project_path: str):
 
         package_json_path = os.path.join(project_path, "package.json")
         if os.path.exists(package_json_path):
+            if await asyncio.to_thread(npm_store.materialize, project_path):
+                print(f"Dependencies restored from shared npm store for project {project_id}")
+                return
+
             print(f"Installing dependencies for project {project_id}...")
 
             npm_cmd = get_npm_executable()
+            install_started = time.perf_counter()
             process = await asyncio.create_subprocess_exec(
                 npm_cmd, "install",
                 cwd=project_path,
@@ -173,6 +182,9 @@ async def install_dependencies_background(project_id: str, project_path: str):
 
             if process.returncode == 0:
                 print(f"Dependencies installed successfully for project {project_id}")
+                await asyncio.to_thread(
+                    npm_store.populate, project_path, time.perf_counter() - install_started
+                )
             else:
                 print(
                     f"Failed to install dependencies for project {project_id}: {stderr.decode()}"
@@ -209,44 +221,70 @@ async def projects_health():
 
 
 
+def _projects_etag(db: Session, limit: Optional[int], offset: int) -> str:
+    """Cheap version token for the project list (no row materialization)"""
+    project_count, project_updated, project_last_message, project_last_active = db.query(
+        func.count(ProjectModel.id),
+        func.max(ProjectModel.updated_at),
+        # A sum, not max: clearing messages moves last_message_at backwards
+        func.total(func.julianday(ProjectModel.last_message_at)),
+        func.max(ProjectModel.last_active_at),
+    ).one()
+    conn_count, conn_updated, conn_created = db.query(
+        func.count(ProjectServiceConnection.id),
+        func.max(ProjectServiceConnection.updated_at),
+        func.max(ProjectServiceConnection.created_at),
+    ).one()
+    raw = "|".join(str(v) for v in (
+        project_count, project_updated, project_last_message, project_last_active,
+        conn_count, conn_updated, conn_created, limit, offset,
+    ))
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
 @router.get("/", response_model=List[Project])
-async def list_projects(db: Session = Depends(get_db)) -> List[Project]:
+async def list_projects(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+) -> List[Project]:
     """List all projects with their status and last activity"""
     
-    # Get projects with their last message time using subquery
-    last_message_subquery = (
-        db.query(
-            Message.project_id,
-            func.max(Message.created_at).label('last_message_at')
-        )
-        .group_by(Message.project_id)
-        .subquery()
-    )
-    
-    # Query projects with last message time
-    projects_with_last_message = (
-        db.query(ProjectModel, last_message_subquery.c.last_message_at)
-        .outerjoin(
-            last_message_subquery,
-            ProjectModel.id == last_message_subquery.c.project_id
-        )
-        .order_by(desc(ProjectModel.created_at))
-        .all()
-    )
-    
-    result: List[Project] = []
-    for project, last_message_at in projects_with_last_message:
-        # Get service connections for this project
-        services = {}
-        service_connections = db.query(ProjectServiceConnection).filter(
-            ProjectServiceConnection.project_id == project.id
+    # Conditional GET: dashboard polls are answered without building the list
+    etag = _projects_etag(db, limit, offset)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # last_message_at is denormalized on projects (kept current by a trigger)
+    query = db.query(ProjectModel).order_by(desc(ProjectModel.created_at))
+    if offset:
+        query = query.offset(offset)
+    if limit:
+        query = query.limit(limit)
+    projects = query.all()
+    
+    # Load service connections for the whole page in one query
+    services_by_project: dict = {project.id: {} for project in projects}
+    if projects:
+        service_connections = db.query(
+            ProjectServiceConnection.project_id,
+            ProjectServiceConnection.provider,
+            ProjectServiceConnection.status,
+        ).filter(
+            ProjectServiceConnection.project_id.in_(list(services_by_project.keys()))
         ).all()
-        
-        for conn in service_connections:
-            services[conn.provider] = {
+        for project_id, provider, status in service_connections:
+            services_by_project[project_id][provider] = {
                 "connected": True,
-                "status": conn.status
+                "status": status
             }
+    
+    result: List[Project] = []
+    for project in projects:
+        services = services_by_project[project.id]
         
         # Ensure all service types are represented
         for provider in ["github", "supabase", "vercel"]:
@@ -267,7 +305,7 @@ async def list_projects(db: Session = Depends(get_db)) -> List[Project]:
             preview_url=project.preview_url,
             created_at=project.created_at,
             last_active_at=project.last_active_at,
-            last_message_at=last_message_at,
+            last_message_at=project.last_message_at,
             services=services,
             features=ai_info.get('features'),
             tech_stack=ai_info.get('tech_stack'),
@@ -281,7 +319,7 @@ async def list_projects(db: Session = Depends(get_db)) -> List[Project]:
 
 
 @router.get("/{project_id}", response_model=Project)
-async def get_project(project_id: str, db: Session = Depends(get_db)) -> Project:
+async def get_project(project_id: str, db: Session = Depends(get_read_db)) -> Project:
     """Get a specific project by ID"""
     
     try:
@@ -300,7 +338,7 @@ async def get_project(project_id: str, db: Session = Depends(get_db)) -> Project
             preview_url=project.preview_url,
             created_at=project.created_at,
             last_active_at=project.last_active_at,
-            last_message_at=None,  # Simplified for debugging
+            last_message_at=project.last_message_at,
             services={},  # Simplified for debugging
             features=ai_info.get('features'),
             tech_stack=ai_info.get('tech_stack'),
@@ -475,6 +513,7 @@ async def delete_project(project_id: str, db: Session = Depends(get_db)):
     # Delete project
     db.delete(project)
     db.commit()
+    env_sync.forget(project_id)
     
     # Clean up project files from disk
     try:
@@ -2,23 +2,25 @@
 Project Preview Management
 Handles preview server operations for projects
 """
+import json
 import os
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.db.session import ReadSessionLocal
 from app.models.projects import Project as ProjectModel
 from app.core.config import settings
 from app.services.local_runtime import (
-    start_preview_process,
-    stop_preview_process,
-    preview_status,
     get_preview_logs,
     get_all_preview_logs
 )
+from app.services.preview_logs import preview_log_store
+from app.services.preview_supervisor import preview_supervisor
 
 
 router = APIRouter()
@@ -34,11 +36,23 @@ class PreviewStatusResponse(BaseModel):
     url: Optional[str] = None
     process_id: Optional[int] = None
     error: Optional[str] = None
+    # Idle server stopped behind its proxy; the URL wakes it on the next request
+    hibernated: bool = False
+
+
+class PreviewLogEntry(BaseModel):
+    seq: int
+    line: str
 
 
 class PreviewLogsResponse(BaseModel):
     logs: str
     running: bool
+    # Incremental tail (?since=<seq>): pass last_seq back as the next cursor
+    entries: Optional[List[PreviewLogEntry]] = None
+    first_seq: Optional[int] = None
+    last_seq: Optional[int] = None
+    reset: bool = False
 
 
 @router.post("/{project_id}/preview/start", response_model=PreviewStatusResponse)
@@ -54,7 +68,7 @@ async def start_preview(
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Check if preview is already running
-    status = preview_status(project_id)
+    status = preview_supervisor.status(project_id)
     if status == "running":
         # Return stored preview info if available
         return PreviewStatusResponse(
@@ -79,13 +93,15 @@ async def start_preview(
                 detail="Project repository is not initialized yet. Please wait for project setup to complete."
             )
 
-    # Start preview
-    process_name, port = start_preview_process(project_id, repo_path, port=body.port)
+    # Start preview (off the event loop; waits for the health probe)
+    try:
+        port = await preview_supervisor.ensure_running(project_id, repo_path, port=body.port)
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     result = {
         "success": True,
         "port": port,
-        "url": f"http://localhost:{port}",
-        "process_name": process_name
+        "url": f"http://localhost:{port}"
     }
     
     if not result["success"]:
@@ -131,7 +147,7 @@ async def stop_preview(project_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Stop preview
-    stop_preview_process(project_id)
+    await preview_supervisor.stop(project_id)
     
     # Update project status
     project.status = "idle"
@@ -150,14 +166,17 @@ async def get_preview_status(project_id: str, db: Session = Depends(get_db)):
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    status = preview_status(project_id)
+    status = preview_supervisor.status(project_id)
+    # A hibernated preview keeps its URL; the proxy restarts it on demand
+    available = status in ("running", "starting", "hibernated")
     
     return PreviewStatusResponse(
-        running=(status == "running"),
-        port=project.preview_port if status == "running" else None,
-        url=project.preview_url if status == "running" else None,
+        running=available,
+        port=project.preview_port if available else None,
+        url=project.preview_url if available else None,
         process_id=None,
-        error=None
+        error=None,
+        hibernated=(status == "hibernated")
     )
 
 
@@ -165,16 +184,29 @@ async def get_preview_status(project_id: str, db: Session = Depends(get_db)):
 async def get_preview_logs_endpoint(
     project_id: str,
     lines: int = 100,
+    since: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """Get preview server logs for a project"""
+    """Get preview server logs for a project (only lines after `since` when given)"""
     
     project = db.get(ProjectModel, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
+    status = preview_supervisor.status(project_id)
+    
+    if since is not None:
+        entries, first_seq, last_seq, reset = preview_log_store.since(project_id, since, limit=lines)
+        return PreviewLogsResponse(
+            logs='\n'.join(line for _seq, line in entries),
+            running=(status == "running"),
+            entries=[PreviewLogEntry(seq=seq, line=line) for seq, line in entries],
+            first_seq=first_seq,
+            last_seq=entries[-1][0] if entries else last_seq,
+            reset=reset
+        )
+    
     logs = get_preview_logs(project_id, lines=lines)
-    status = preview_status(project_id)
     
     return PreviewLogsResponse(
         logs=logs,
@@ -182,6 +214,54 @@ async def get_preview_logs_endpoint(
     )
 
 
+@router.get("/{project_id}/preview/logs/stream")
+async def stream_preview_logs(
+    project_id: str,
+    request: Request,
+    since: Optional[int] = None
+):
+    """
+    Server-Sent Events tail of the preview logs.
+    
+    Each line is sent as a `log` event whose id is its sequence number, so
+    browsers resume from Last-Event-ID after a reconnect. The same lines are
+    also pushed as batched `preview_log` frames on the project WebSocket.
+    """
+    
+    # Short-lived session: a Depends() session would pin a pooled connection for the whole stream
+    db = ReadSessionLocal()
+    try:
+        project = db.get(ProjectModel, project_id)
+    finally:
+        db.close()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    last_event_id = request.headers.get("last-event-id")
+    cursor = since if since is not None else int(last_event_id) if (last_event_id or "").isdigit() else 0
+    
+    async def event_stream():
+        nonlocal cursor
+        while not await request.is_disconnected():
+            entries, first_seq, last_seq, reset = preview_log_store.since(project_id, cursor, limit=500)
+            if reset:
+                yield f"event: reset\ndata: {json.dumps({'first_seq': first_seq, 'last_seq': last_seq})}\n\n"
+            if entries:
+                for seq, line in entries:
+                    yield f"id: {seq}\nevent: log\ndata: {json.dumps({'seq': seq, 'line': line})}\n\n"
+                cursor = entries[-1][0]
+                continue
+            cursor = last_seq
+            if not await preview_log_store.wait(project_id, timeout=15):
+                yield ": keep-alive\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/{project_id}/preview/restart")
 async def restart_preview(
     project_id: str,
@@ -194,12 +274,6 @@ async def restart_preview(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Stop if running
-    status = preview_status(project_id)
-    if status == "running":
-        stop_preview_process(project_id)
-        # No need to check result as stop_preview_process returns None
-    
     # Ensure project has a repository path
     repo_path = project.repo_path
 
@@ -215,13 +289,15 @@ async def restart_preview(
                 detail="Project repository is not initialized yet. Please wait for project setup to complete."
             )
 
-    # Start preview
-    process_name, port = start_preview_process(project_id, repo_path, port=body.port)
+    # Restart preview (keeps the public port when the proxy is already up)
+    try:
+        port = await preview_supervisor.restart(project_id, repo_path, port=body.port)
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     result = {
         "success": True,
         "port": port,
-        "url": f"http://localhost:{port}",
-        "process_name": process_name
+        "url": f"http://localhost:{port}"
     }
     
     if not result["success"]:
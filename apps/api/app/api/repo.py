@@ -1,10 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
+from email.utils import formatdate, parsedate_to_datetime
+import asyncio
+import mimetypes
+import mmap
 import os
+import time
 from pathlib import Path
 from app.core.config import settings
-from app.api.deps import get_db
+from app.api.deps import get_read_db
+from app.services.repo_index import repo_indexes
 from sqlalchemy.orm import Session
 from app.models.projects import Project as ProjectModel
 
@@ -15,6 +22,21 @@ class RepoEntry(BaseModel):
     path: str
     type: str  # file | dir
     size: Optional[int] = None
+    ignored: bool = False
+
+
+class RepoTreeChange(BaseModel):
+    revision: int
+    op: str  # add | modify | delete
+    path: str
+    type: Optional[str] = None
+    size: Optional[int] = None
+
+
+class RepoTreeChanges(BaseModel):
+    revision: int
+    full: bool  # True: changes were not retained, reload the tree
+    changes: List[RepoTreeChange] = []
 
 
 def _safe_join(repo_root: str, rel_path: str) -> str:
@@ -24,8 +46,7 @@ def _safe_join(repo_root: str, rel_path: str) -> str:
     return full
 
 
-@router.get("/{project_id}/tree", response_model=List[RepoEntry])
-async def repo_tree(project_id: str, dir: str = Query("."), db: Session = Depends(get_db)) -> List[RepoEntry]:
+def _repo_root(project_id: str, db: Session) -> str:
     row = db.get(ProjectModel, project_id)
     if not row:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -42,14 +63,14 @@ async def repo_tree(project_id: str, dir: str = Query("."), db: Session = Depend
             raise HTTPException(status_code=400, detail="Project initialization failed")
         else:
             raise HTTPException(status_code=400, detail="Project repository not found")
-    
-    target = _safe_join(repo_root, dir)
-    if not os.path.isdir(target):
-        raise HTTPException(status_code=400, detail="Not a directory")
-    
+    return repo_root
+
+
+def _list_dir(repo_root: str, target: str) -> List[RepoEntry]:
+    """Direct listing, used for directories the index does not descend into"""
     entries: List[RepoEntry] = []
     for child in sorted(Path(target).iterdir(), key=lambda p: (p.is_file(), p.name.lower())):
-        rel = os.path.relpath(str(child), repo_root)
+        rel = os.path.relpath(str(child), repo_root).replace(os.sep, "/")
         if child.is_dir():
             entries.append(RepoEntry(path=rel, type="dir"))
         else:
@@ -57,8 +78,188 @@ async def repo_tree(project_id: str, dir: str = Query("."), db: Session = Depend
     return entries
 
 
+@router.get("/{project_id}/tree", response_model=List[RepoEntry])
+async def repo_tree(
+    project_id: str,
+    request: Request,
+    response: Response,
+    dir: str = Query("."),
+    depth: int = Query(1, description="Levels below dir to include; 0 for the whole tree"),
+    include_ignored: bool = Query(True, description="List .gitignore'd entries (never descended into)"),
+    db: Session = Depends(get_read_db)
+):
+    repo_root = _repo_root(project_id, db)
+    
+    target = _safe_join(repo_root, dir)
+    if not os.path.isdir(target):
+        raise HTTPException(status_code=400, detail="Not a directory")
+    
+    index = repo_indexes.get(project_id, repo_root)
+    rel_dir = os.path.relpath(target, repo_root).replace(os.sep, "/")
+    # One thread hop: the first scan of a large repo holds the index lock for a while
+    listing, etag, revision = await asyncio.to_thread(index.snapshot, rel_dir, depth or None, include_ignored)
+    if listing is None:
+        # Inside node_modules/.next/ignored dirs: not indexed, list directly
+        return await asyncio.to_thread(_list_dir, repo_root, target)
+    
+    headers = {"ETag": etag, "X-Tree-Revision": str(revision)}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    
+    return [
+        RepoEntry(path=path, type=entry.type, size=entry.size, ignored=entry.ignored)
+        for path, entry in listing
+    ]
+
+
+@router.get("/{project_id}/tree/changes", response_model=RepoTreeChanges)
+async def repo_tree_changes(project_id: str, since: int, db: Session = Depends(get_read_db)):
+    """Index changes after revision `since` (from X-Tree-Revision)"""
+    repo_root = _repo_root(project_id, db)
+    index = repo_indexes.get(project_id, repo_root)
+    changes, revision = await asyncio.to_thread(index.changes_snapshot, since)
+    if changes is None:
+        return RepoTreeChanges(revision=revision, full=True)
+    return RepoTreeChanges(
+        revision=revision,
+        full=False,
+        changes=[RepoTreeChange(**change) for change in changes]
+    )
+
+
+def _file_validators(st: os.stat_result) -> dict:
+    """ETag/Last-Modified keyed by mtime and size"""
+    return {
+        # Strong: nanosecond mtime plus size is byte-exact in practice, and
+        # If-Range only accepts strong validators
+        "ETag": f'"{st.st_mtime_ns:x}-{st.st_size:x}"',
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        # Always revalidate, so polling reloads get 304s instead of bodies
+        "Cache-Control": "no-cache",
+    }
+
+
+def _not_modified(request: Request, st: os.stat_result, headers: dict) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, so copies cached under the former W/ tags still revalidate
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return headers["ETag"] in tags or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(st.st_mtime) <= int(parsedate_to_datetime(if_modified_since).timestamp())
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _if_range_matches(if_range: Optional[str], st: os.stat_result, headers: dict) -> bool:
+    """If-Range with strong comparison (RFC 9110 13.1.5): weak tags never match"""
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith("W/"):
+        return False
+    if if_range.startswith('"'):
+        return if_range == headers["ETag"]
+    # A date is only a strong validator if the file has not changed within that second
+    return if_range == headers["Last-Modified"] and time.time() - st.st_mtime >= 1
+
+
+def _is_binary(sample: bytes) -> bool:
+    return b"\x00" in sample
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Single `bytes=` range -> inclusive (start, end); None if unsatisfiable"""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        raise ValueError("unsupported range")
+    start_s, _, end_s = spec.strip().partition("-")
+    if start_s == "":
+        # Suffix range: last N bytes
+        length = int(end_s)
+        if length <= 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(start_s)
+    end = int(end_s) if end_s else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _iter_file(target: str, start: int, end: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield bytes [start, end] from disk; large files are served through mmap"""
+    length = end - start + 1
+    with open(target, "rb") as f:
+        if length >= settings.repo_file_mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in range(start, end + 1, chunk_size):
+                    yield mm[offset:min(offset + chunk_size, end + 1)]
+            return
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
 @router.get("/{project_id}/file")
-async def repo_file(project_id: str, path: str, db: Session = Depends(get_db)):
+async def repo_file(project_id: str, path: str, request: Request, db: Session = Depends(get_read_db)):
+    """
+    File content as JSON for the editor.
+    
+    Binary files return no content; text beyond REPO_FILE_MAX_BYTES is cut off
+    with `truncated` set (use /file/raw for the full bytes).
+    """
+    row = db.get(ProjectModel, project_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Project not found")
+    repo_root = os.path.join(settings.projects_root, project_id, "repo")
+    target = _safe_join(repo_root, path)
+    if not os.path.isfile(target):
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    st = os.stat(target)
+    headers = _file_validators(st)
+    if _not_modified(request, st, headers):
+        return Response(status_code=304, headers=headers)
+    
+    limit = settings.repo_file_max_bytes
+    
+    def _read() -> bytes:
+        with open(target, "rb") as f:
+            return f.read(limit)
+    
+    data = await asyncio.to_thread(_read)
+    if _is_binary(data[:8192]):
+        return JSONResponse(
+            {"path": path, "content": "", "binary": True, "size": st.st_size, "truncated": False},
+            headers=headers
+        )
+    
+    truncated = st.st_size > limit
+    return JSONResponse(
+        {
+            "path": path,
+            "content": data.decode("utf-8", errors="ignore"),
+            "binary": False,
+            "size": st.st_size,
+            "truncated": truncated,
+        },
+        headers=headers
+    )
+
+
+@router.get("/{project_id}/file/raw")
+async def repo_file_raw(project_id: str, path: str, request: Request, db: Session = Depends(get_read_db)):
+    """Stream raw file bytes with Range and conditional GET support"""
     row = db.get(ProjectModel, project_id)
     if not row:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -66,5 +267,37 @@ async def repo_file(project_id: str, path: str, db: Session = Depends(get_db)):
     target = _safe_join(repo_root, path)
     if not os.path.isfile(target):
         raise HTTPException(status_code=404, detail="File not found")
-    with open(target, "r", encoding="utf-8", errors="ignore") as f:
-        return {"path": path, "content": f.read()}
+    
+    st = os.stat(target)
+    size = st.st_size
+    headers = _file_validators(st)
+    headers["Accept-Ranges"] = "bytes"
+    if _not_modified(request, st, headers):
+        return Response(status_code=304, headers=headers)
+    
+    media_type = mimetypes.guess_type(target)[0] or "application/octet-stream"
+    start, end, status_code = 0, size - 1, 200
+    
+    range_header = request.headers.get("range")
+    # If-Range: only honour the range when the client's copy is current
+    if range_header and _if_range_matches(request.headers.get("if-range"), st, headers):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            byte_range = (0, size - 1)  # malformed/multi-range: serve the whole file
+        if byte_range is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        start, end = byte_range
+        if (start, end) != (0, size - 1):
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    
+    headers["Content-Length"] = str(max(0, end - start + 1))
+    if size == 0:
+        return Response(content=b"", media_type=media_type, headers=headers)
+    return StreamingResponse(
+        _iter_file(target, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
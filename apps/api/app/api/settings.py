@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.services.cli.unified_manager import CursorAgentCLI
 from app.services.cli.base import CLIType
+from app.services.cli.availability import cli_availability
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
@@ -79,38 +80,16 @@ async def check_cli_installation(cli_id: str, command: list) -> CLIStatusRespons
 
 
 @router.get("/cli-status")
-async def get_cli_status() -> Dict[str, Any]:
+async def get_cli_status(refresh: bool = False) -> Dict[str, Any]:
     """모든 CLI의 설치 상태를 확인하고 반환합니다."""
     results = {}
     
-    # 새로운 UnifiedCLIManager의 CLI 인스턴스 사용
-    from app.services.cli.unified_manager import ClaudeCodeCLI, CursorAgentCLI, CodexCLI, QwenCLI, GeminiCLI
-    cli_instances = {
-        "claude": ClaudeCodeCLI(),
-        "cursor": CursorAgentCLI(),
-        "codex": CodexCLI(),
-        "qwen": QwenCLI(),
-        "gemini": GeminiCLI()
-    }
-    
-    # 모든 CLI를 병렬로 확인
-    tasks = []
-    for cli_id, cli_instance in cli_instances.items():
-        print(f"[DEBUG] Setting up check for CLI: {cli_id}")
-        async def check_cli(cli_id, cli_instance):
-            print(f"[DEBUG] Checking CLI: {cli_id}")
-            status = await cli_instance.check_availability()
-            print(f"[DEBUG] CLI {cli_id} status: {status}")
-            return cli_id, status
-        
-        tasks.append(check_cli(cli_id, cli_instance))
-    
-    # 모든 태스크 실행
-    cli_results = await asyncio.gather(*tasks)
+    # 캐시된 상태를 사용하고, 만료된 CLI만 병렬로 다시 확인
+    statuses = await cli_availability.get_all(force=refresh)
     
     # 결과를 딕셔너리로 변환
-    for cli_id, status in cli_results:
-        results[cli_id] = {
+    for cli_type, status in statuses.items():
+        results[cli_type.value] = {
             "installed": status.get("available", False) and status.get("configured", False),
             "version": status.get("models", ["Unknown"])[0] if status.get("models") else None,
             "error": status.get("error"),
@@ -149,5 +128,6 @@ async def update_global_settings(settings: GlobalSettingsModel) -> Dict[str, Any
         "default_cli": settings.default_cli,
         "cli_settings": settings.cli_settings
     })
+    cli_availability.invalidate()
     
     return {"success": True, "settings": GLOBAL_SETTINGS}
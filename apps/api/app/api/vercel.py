@@ -1,10 +1,13 @@
 """
 Vercel integration API endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
+import hashlib
+import hmac
+import json
 import logging
 from uuid import uuid4
 from datetime import datetime
@@ -14,6 +17,8 @@ from app.models.projects import Project
 from app.models.project_services import ProjectServiceConnection
 from app.services.vercel_service import VercelService, VercelAPIError, check_project_availability, start_deployment_monitoring, stop_deployment_monitoring, get_active_monitoring_projects
 from app.services.token_service import get_token
+from app.services.deployment_tracker import deployment_tracker
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["vercel"])
@@ -319,7 +324,8 @@ async def deploy_to_vercel(
                 project_id=project_id,
                 deployment_id=deployment_result["deployment_id"],
                 vercel_token=vercel_token,
-                db_session_factory=SessionLocal
+                db_session_factory=SessionLocal,
+                status=deployment_result["status"]
             )
             logger.info(f"🚀 Background monitoring started successfully")
         except Exception as e:
@@ -446,13 +452,16 @@ async def get_current_deployment_status(project_id: str, db: Session = Depends(g
             "last_deployment_at": service_data.get("last_deployment_at")
         }
     
-    # 진행 중인 배포가 있음
+    # 진행 중인 배포가 있음 (DB는 상태 전이 시에만 기록되므로 tracker의 최신 확인 시각 우선)
+    live = deployment_tracker.snapshot(project_id) or {}
+    if live.get("deployment_id") != current_deployment["deployment_id"]:
+        live = {}
     return {
         "has_deployment": True,
         "deployment_id": current_deployment["deployment_id"],
         "status": current_deployment["status"],
         "deployment_url": current_deployment["deployment_url"],
-        "last_checked_at": current_deployment["last_checked_at"]
+        "last_checked_at": live.get("last_checked_at") or current_deployment.get("last_checked_at")
     }
 
 
@@ -476,3 +485,24 @@ async def get_active_monitoring():
     except Exception as e:
         logger.error(f"Failed to get active monitoring: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/vercel/webhook")
+async def vercel_webhook(request: Request):
+    """Vercel deployment webhook (x-vercel-signature: HMAC-SHA1 of the body)"""
+    if not settings.vercel_webhook_secret:
+        raise HTTPException(status_code=404, detail="Webhooks not configured")
+    body = await request.body()
+    expected = hmac.new(settings.vercel_webhook_secret.encode(), body, hashlib.sha1).hexdigest()
+    if not hmac.compare_digest(expected, request.headers.get("x-vercel-signature", "")):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+    try:
+        event = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+    payload = event.get("payload") if isinstance(event, dict) else None
+    deployment = payload.get("deployment") if isinstance(payload, dict) else None
+    if not isinstance(deployment, dict):
+        raise HTTPException(status_code=400, detail="Expected an object with payload.deployment")
+    applied = await deployment_tracker.handle_webhook(str(event.get("type", "")), deployment)
+    return {"ok": True, "applied": applied}
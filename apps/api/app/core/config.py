@@ -40,13 +40,122 @@ class Settings(BaseModel):
         f"sqlite:///{PROJECT_ROOT / 'data' / 'cc.db'}",
     )
     
+    # Connection pools (SQLite pragmas are set via SQLITE_PROFILE, see app/db/sqlite_profile.py)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_read_pool_size: int = int(os.getenv("DB_READ_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    
     # Use project root relative paths
     projects_root: str = os.getenv("PROJECTS_ROOT", str(PROJECT_ROOT / "data" / "projects"))
     projects_root_host: str = os.getenv("PROJECTS_ROOT_HOST", os.getenv("PROJECTS_ROOT", str(PROJECT_ROOT / "data" / "projects")))
     
     preview_port_start: int = int(os.getenv("PREVIEW_PORT_START", "3100"))
     preview_port_end: int = int(os.getenv("PREVIEW_PORT_END", "3999"))
-    
+
+    # Preview supervisor (proxy + hibernation, see app/services/preview_supervisor.py)
+    preview_supervisor_enabled: bool = os.getenv("PREVIEW_SUPERVISOR_ENABLED", "true").lower() == "true"
+    preview_proxy_host: str = os.getenv("PREVIEW_PROXY_HOST", "0.0.0.0")
+    preview_max_running: int = int(os.getenv("PREVIEW_MAX_RUNNING", "4"))
+    preview_warm_standby: int = int(os.getenv("PREVIEW_WARM_STANDBY", "1"))
+    preview_idle_timeout: float = float(os.getenv("PREVIEW_IDLE_TIMEOUT", "900"))  # seconds
+    preview_reap_interval: float = float(os.getenv("PREVIEW_REAP_INTERVAL", "30"))
+    preview_ready_timeout: float = float(os.getenv("PREVIEW_READY_TIMEOUT", "60"))
+
+    # Shared content-addressed node_modules store (see app/services/npm_store.py)
+    npm_store_enabled: bool = os.getenv("NPM_STORE_ENABLED", "true").lower() == "true"
+    npm_store_root: str = os.getenv("NPM_STORE_ROOT", str(PROJECT_ROOT / "data" / "npm-store"))
+
+    # Pre-built project template cache (see app/services/template_cache.py)
+    template_cache_root: str = os.getenv("TEMPLATE_CACHE_ROOT", str(PROJECT_ROOT / "data" / "templates"))
+    template_cache_keep: int = int(os.getenv("TEMPLATE_CACHE_KEEP", "2"))
+    template_refresh_interval: float = float(os.getenv("TEMPLATE_REFRESH_INTERVAL", "86400"))  # seconds
+    template_offline: bool = os.getenv("TEMPLATE_OFFLINE", "false").lower() == "true"
+
+    # Editor file tree index (watchdog watcher when installed, else polling)
+    repo_index_watch: bool = os.getenv("REPO_INDEX_WATCH", "true").lower() == "true"
+    repo_index_poll_interval: float = float(os.getenv("REPO_INDEX_POLL_INTERVAL", "2"))  # seconds
+    repo_index_max_changes: int = int(os.getenv("REPO_INDEX_MAX_CHANGES", "5000"))
+    repo_index_max_projects: int = int(os.getenv("REPO_INDEX_MAX_PROJECTS", "16"))
+
+    # Repo file reads
+    repo_file_max_bytes: int = int(os.getenv("REPO_FILE_MAX_BYTES", str(2 * 1024 * 1024)))  # JSON editor endpoint cap
+    repo_file_mmap_threshold: int = int(os.getenv("REPO_FILE_MMAP_THRESHOLD", str(8 * 1024 * 1024)))
+
+    # Git reads (see app/services/git_backend.py): auto | pygit2 | catfile | subprocess
+    git_backend: str = os.getenv("GIT_BACKEND", "auto")
+    git_backend_max_repos: int = int(os.getenv("GIT_BACKEND_MAX_REPOS", "16"))  # each catfile repo holds one process
+
+    # Commit history cache and diffs (see app/services/commit_history.py)
+    commit_history_max_repos: int = int(os.getenv("COMMIT_HISTORY_MAX_REPOS", "16"))
+    commit_history_max_paths: int = int(os.getenv("COMMIT_HISTORY_MAX_PATHS", "32"))  # per repo
+    commit_page_max_limit: int = int(os.getenv("COMMIT_PAGE_MAX_LIMIT", "200"))
+    commit_diff_inline_lines: int = int(os.getenv("COMMIT_DIFF_INLINE_LINES", "500"))  # larger file diffs load on demand
+    commit_diff_max_bytes: int = int(os.getenv("COMMIT_DIFF_MAX_BYTES", str(1024 * 1024)))
+
+    # ACT/chat request queue
+    queue_workers: int = int(os.getenv("QUEUE_WORKERS", "4"))
+    queue_cli_concurrency: int = int(os.getenv("QUEUE_CLI_CONCURRENCY", "2"))  # per CLI type, override with QUEUE_CLI_CONCURRENCY_<CLI>
+    queue_max_pending_per_project: int = int(os.getenv("QUEUE_MAX_PENDING_PER_PROJECT", "10"))
+    queue_max_attempts: int = int(os.getenv("QUEUE_MAX_ATTEMPTS", "2"))
+
+    # Warm CLI agent process pool
+    cli_pool_max_processes: int = int(os.getenv("CLI_POOL_MAX_PROCESSES", "8"))
+    cli_pool_idle_timeout: float = float(os.getenv("CLI_POOL_IDLE_TIMEOUT", "600"))  # seconds
+    cli_pool_prewarm: bool = os.getenv("CLI_POOL_PREWARM", "true").lower() == "true"
+
+    # ACP agents (Qwen, Gemini): concurrent agent->client requests per process
+    acp_max_concurrent_requests: int = int(os.getenv("ACP_MAX_CONCURRENT_REQUESTS", "16"))
+    acp_fs_workers: int = int(os.getenv("ACP_FS_WORKERS", "4"))  # threads for fs/* handlers
+
+    # CLI availability cache (seconds)
+    cli_status_ttl: float = float(os.getenv("CLI_STATUS_TTL", "300"))
+    cli_status_negative_ttl: float = float(os.getenv("CLI_STATUS_NEGATIVE_TTL", "30"))
+    cli_status_refresh_interval: float = float(os.getenv("CLI_STATUS_REFRESH_INTERVAL", "240"))
+
+    # WebSocket fan-out
+    ws_send_queue_size: int = int(os.getenv("WS_SEND_QUEUE_SIZE", "512"))  # frames per connection
+    ws_send_timeout: float = float(os.getenv("WS_SEND_TIMEOUT", "10"))  # seconds before a stuck client is dropped
+
+    # Preview server logs (ring buffer lines per project, batched WS frames)
+    preview_log_capacity: int = int(os.getenv("PREVIEW_LOG_CAPACITY", "1000"))
+    preview_log_flush_interval_ms: int = int(os.getenv("PREVIEW_LOG_FLUSH_INTERVAL_MS", "250"))
+    preview_log_max_lines_per_frame: int = int(os.getenv("PREVIEW_LOG_MAX_LINES_PER_FRAME", "200"))
+
+    # Streamed message persistence (write-behind batching)
+    message_batch_size: int = int(os.getenv("MESSAGE_BATCH_SIZE", "50"))
+    message_flush_interval_ms: int = int(os.getenv("MESSAGE_FLUSH_INTERVAL_MS", "200"))
+
+    # Live assistant text (coalesced `message_delta` frames, not persisted)
+    stream_delta_interval_ms: int = int(os.getenv("STREAM_DELTA_INTERVAL_MS", "80"))
+    stream_delta_max_chars: int = int(os.getenv("STREAM_DELTA_MAX_CHARS", "2048"))
+
+    # Outbound API calls (GitHub, Vercel): pooled clients, retries, conditional GETs
+    github_api_base: str = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+    vercel_api_base: str = os.getenv("VERCEL_API_BASE", "https://api.vercel.com")
+    http_http2: bool = os.getenv("HTTP_HTTP2", "true").lower() == "true"
+    http_max_connections_per_host: int = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))  # seconds
+    http_timeout: float = float(os.getenv("HTTP_TIMEOUT", "30"))  # seconds
+    http_max_retries: int = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    http_retry_backoff: float = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))  # seconds, doubled per attempt
+    http_max_retry_wait: float = float(os.getenv("HTTP_MAX_RETRY_WAIT", "30"))  # longer Retry-After: give up
+    http_etag_cache_size: int = int(os.getenv("HTTP_ETAG_CACHE_SIZE", "512"))
+
+    # Vercel deployment tracking (one shared poller; webhooks when a secret is set)
+    vercel_webhook_secret: str = os.getenv("VERCEL_WEBHOOK_SECRET", "")
+    deploy_poll_interval: float = float(os.getenv("DEPLOY_POLL_INTERVAL", "3"))  # seconds, after a transition
+    deploy_poll_max_interval: float = float(os.getenv("DEPLOY_POLL_MAX_INTERVAL", "15"))
+    deploy_poll_backoff: float = float(os.getenv("DEPLOY_POLL_BACKOFF", "1.5"))  # per unchanged poll
+    deploy_poll_concurrency: int = int(os.getenv("DEPLOY_POLL_CONCURRENCY", "8"))
+    deploy_track_timeout: float = float(os.getenv("DEPLOY_TRACK_TIMEOUT", "900"))  # seconds
+
+    # Decrypted secret cache (env vars, API keys) and ENCRYPTION_KEY rotation
+    secret_cache_size: int = int(os.getenv("SECRET_CACHE_SIZE", "1024"))  # 0 disables
+    secret_cache_ttl: float = float(os.getenv("SECRET_CACHE_TTL", "300"))  # seconds
+    secret_cache_zeroize: bool = os.getenv("SECRET_CACHE_ZEROIZE", "true").lower() == "true"
+    key_rotation_batch_size: int = int(os.getenv("KEY_ROTATION_BATCH_SIZE", "200"))  # rows per commit
+    key_rotation_batch_pause: float = float(os.getenv("KEY_ROTATION_BATCH_PAUSE", "0.05"))  # seconds
+
     # Environment detection
     is_production: bool = os.getenv("ENVIRONMENT", "development").lower() == "production"
     is_render: bool = os.getenv("RENDER", "false").lower() == "true"
@@ -1,33 +1,168 @@
 import base64
+import hashlib
 import os
-from typing import Optional
-from cryptography.fernet import Fernet
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+
+from app.core.config import settings
+
+
+class _SecretCache:
+    """Bounded TTL cache of decrypted values, keyed by a hash of the ciphertext.
+
+    Fernet ciphertexts are unique per encryption (random IV), so a changed
+    value never hits a stale entry; invalidate() exists to drop replaced or
+    deleted plaintexts from memory early. With zeroize, values are held as
+    bytearrays and overwritten on eviction (only the cache's own copy: the
+    str handed to callers is immutable and reclaimed by the GC as usual).
+    """
+
+    def __init__(self, max_entries: int, ttl: float, zeroize: bool) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.zeroize = zeroize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, bytearray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    @staticmethod
+    def _key(ciphertext: str) -> bytes:
+        return hashlib.sha256(ciphertext.encode("utf-8")).digest()
+
+    def get(self, ciphertext: str) -> Optional[str]:
+        if self.max_entries <= 0:
+            return None
+        key = self._key(ciphertext)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1].decode("utf-8")
+
+    def put(self, ciphertext: str, plaintext: str) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self._key(ciphertext)
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (now + self.ttl, bytearray(plaintext.encode("utf-8")))
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+            if now >= self._next_sweep:
+                # LRU order is not expiry order: scan for expired values now and then
+                for stale in [k for k, (expires, _) in self._entries.items() if expires < now]:
+                    self._drop(stale)
+                self._next_sweep = now + self.ttl / 2
+
+    def invalidate(self, *ciphertexts: str) -> None:
+        with self._lock:
+            for ciphertext in ciphertexts:
+                key = self._key(ciphertext)
+                if key in self._entries:
+                    self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def _drop(self, key: bytes) -> None:
+        _, value = self._entries.pop(key)
+        if self.zeroize:
+            value[:] = bytes(len(value))
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
 
 
 class SecretBox:
-    def __init__(self, key: Optional[str] = None) -> None:
+    def __init__(self, key: Optional[str] = None, previous_keys: Optional[List[str]] = None) -> None:
         # Expect a base64 urlsafe key. If none provided, derive from env or generate (dev only)
         key = key or os.getenv("ENCRYPTION_KEY")
         if key is None:
             # Dev fallback: generate ephemeral key
             key = base64.urlsafe_b64encode(os.urandom(32)).decode()
             print(f"Warning: Generated ephemeral encryption key. Data will be lost on restart!")
-        
+
         try:
-            self._fernet = Fernet(key)
+            self._primary = Fernet(key)
         except Exception as e:
             print(f"Error initializing encryption: {e}")
             # Generate a new key if the provided one is invalid
             key = base64.urlsafe_b64encode(os.urandom(32)).decode()
-            self._fernet = Fernet(key)
+            self._primary = Fernet(key)
             print("Generated new encryption key due to invalid key")
 
+        # Key rotation: old keys still decrypt, new values use the primary key
+        if previous_keys is None:
+            previous_keys = [k.strip() for k in os.getenv("ENCRYPTION_KEYS_PREVIOUS", "").split(",") if k.strip()]
+        self._previous: List[Fernet] = []
+        for old_key in previous_keys:
+            try:
+                self._previous.append(Fernet(old_key))
+            except Exception as e:
+                print(f"Warning: Ignoring invalid previous encryption key: {e}")
+        self._fernet = MultiFernet([self._primary, *self._previous])
+
+        self._cache = _SecretCache(
+            settings.secret_cache_size, settings.secret_cache_ttl, settings.secret_cache_zeroize
+        )
+
+    @property
+    def has_previous_keys(self) -> bool:
+        return bool(self._previous)
+
     def encrypt(self, plaintext: str) -> str:
         token = self._fernet.encrypt(plaintext.encode("utf-8"))
         return token.decode("utf-8")
 
     def decrypt(self, ciphertext: str) -> str:
-        return self._fernet.decrypt(ciphertext.encode("utf-8")).decode("utf-8")
+        cached = self._cache.get(ciphertext)
+        if cached is not None:
+            return cached
+        plaintext = self._fernet.decrypt(ciphertext.encode("utf-8")).decode("utf-8")
+        self._cache.put(ciphertext, plaintext)
+        return plaintext
+
+    def invalidate(self, *ciphertexts: str) -> None:
+        """Forget cached plaintexts of replaced or deleted values"""
+        self._cache.invalidate(*ciphertexts)
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    def needs_rotation(self, ciphertext: str) -> bool:
+        """True if the value is encrypted with a previous key (InvalidToken if with none)"""
+        if not self._previous:
+            return False
+        try:
+            self._primary.decrypt(ciphertext.encode("utf-8"))
+            return False
+        except InvalidToken:
+            # Raises InvalidToken itself if no previous key matches either
+            self._fernet.decrypt(ciphertext.encode("utf-8"))
+            return True
+
+    def rotate(self, ciphertext: str) -> str:
+        """Re-encrypt a value with the primary key"""
+        token = self._fernet.rotate(ciphertext.encode("utf-8")).decode("utf-8")
+        self._cache.invalidate(ciphertext)
+        return token
 
 
 secret_box = SecretBox()
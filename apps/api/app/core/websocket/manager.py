@@ -1,53 +1,173 @@
 """
 WebSocket Connection Manager
 Handles WebSocket connections for real-time chat updates
+
+Each payload is serialized once and handed to a bounded per-connection
+outbound queue drained by that connection's own sender task, so a slow
+browser tab never stalls other clients or the producing agent.
 """
-from typing import Dict, List
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 import json
 from fastapi import WebSocket
+from app.core.config import settings
 from app.core.terminal_ui import ui
 
 
+# Frame types where only the latest pending value matters; a newer frame
+# replaces the queued one instead of taking another slot
+COALESCE_TYPES = {"status", "project_status", "preview_status", "deployment_status"}
+
+
+def _coalesce_key(message_data: dict) -> Optional[str]:
+    msg_type = message_data.get("type")
+    return msg_type if msg_type in COALESCE_TYPES else None
+
+
+class _ClientChannel:
+    """Outbound queue + sender task for a single WebSocket"""
+
+    def __init__(self, manager: "ConnectionManager", websocket: WebSocket, project_id: str):
+        self.manager = manager
+        self.websocket = websocket
+        self.project_id = project_id
+        self.max_queue = max(1, settings.ws_send_queue_size)
+        self._pending: Deque[Tuple[Optional[str], str, float]] = deque()
+        self._wakeup = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._task = asyncio.create_task(self._sender())
+
+    def offer(self, text: str, coalesce_key: Optional[str]) -> None:
+        now = time.monotonic()
+        if coalesce_key is not None:
+            for idx, (key, _text, enqueued_at) in enumerate(self._pending):
+                if key == coalesce_key:
+                    # Keep the original position/age, deliver the newest value
+                    self._pending[idx] = (key, text, enqueued_at)
+                    self.coalesced += 1
+                    return
+
+        if len(self._pending) >= self.max_queue:
+            # Prefer evicting a coalescable (state) frame over chat content
+            victim = next(
+                (i for i, (key, _t, _e) in enumerate(self._pending) if key is not None),
+                0,
+            )
+            del self._pending[victim]
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                ui.warning(
+                    f"Slow client on project {self.project_id}: dropped {self.dropped} frames",
+                    "WebSocket",
+                )
+
+        self._pending.append((coalesce_key, text, now))
+        self._wakeup.set()
+
+    async def _sender(self) -> None:
+        try:
+            while True:
+                if not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                _key, text, enqueued_at = self._pending.popleft()
+                await asyncio.wait_for(
+                    self.websocket.send_text(text), timeout=settings.ws_send_timeout
+                )
+                self.sent += 1
+                self.last_lag_ms = (time.monotonic() - enqueued_at) * 1000
+                self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Connection failed or client too slow - remove it silently
+            self.manager.disconnect(self.websocket, self.project_id)
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        if not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._pending),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_lag_ms": round(self.last_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+        }
+
+
 class ConnectionManager:
     """WebSocket connection manager for real-time updates"""
-    
+
     def __init__(self):
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        self._channels: Dict[int, _ClientChannel] = {}
 
     async def connect(self, websocket: WebSocket, project_id: str):
         """Connect a new WebSocket client"""
         await websocket.accept()
-        
+
         # Initialize connection list if needed
         if project_id not in self.active_connections:
             self.active_connections[project_id] = []
-        
+
         # Add new connection to the list (allow multiple connections per project)
         self.active_connections[project_id].append(websocket)
+        self._channels[id(websocket)] = _ClientChannel(self, websocket, project_id)
 
     def disconnect(self, websocket: WebSocket, project_id: str):
         """Disconnect a WebSocket client"""
+        channel = self._channels.pop(id(websocket), None)
+        if channel:
+            channel.close()
+
         if project_id in self.active_connections:
             try:
                 self.active_connections[project_id].remove(websocket)
             except ValueError:
                 pass
-            
+
             if not self.active_connections[project_id]:
                 del self.active_connections[project_id]
 
     async def send_message(self, project_id: str, message_data: dict):
-        """Send message to all WebSocket connections for a project"""
-        if project_id in self.active_connections:
-            for connection in self.active_connections[project_id][:]:
-                try:
-                    await connection.send_text(json.dumps(message_data))
-                except Exception:
-                    # Connection failed - remove it silently
-                    try:
-                        self.active_connections[project_id].remove(connection)
-                    except (ValueError, KeyError):
-                        pass
+        """Queue message for all WebSocket connections for a project (never blocks on clients)"""
+        connections = self.active_connections.get(project_id)
+        if not connections:
+            return
+        # Serialize once for every recipient
+        text = json.dumps(message_data)
+        coalesce_key = _coalesce_key(message_data)
+        for connection in connections[:]:
+            channel = self._channels.get(id(connection))
+            if channel:
+                channel.offer(text, coalesce_key)
+
+    def connection_stats(self, project_id: Optional[str] = None) -> Dict[str, List[dict]]:
+        """Per-connection queue depth, drops and send lag"""
+        result: Dict[str, List[dict]] = {}
+        for pid, connections in self.active_connections.items():
+            if project_id and pid != project_id:
+                continue
+            result[pid] = [
+                self._channels[id(ws)].stats()
+                for ws in connections
+                if id(ws) in self._channels
+            ]
+        return result
 
     async def broadcast_status(self, project_id: str, status: str, data: dict = None):
         """Broadcast status update to all connections"""
@@ -73,4 +193,4 @@ class ConnectionManager:
 
 
 # Global connection manager instance
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager()
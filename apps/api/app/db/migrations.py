@@ -1,24 +1,133 @@
 """Database migrations module for SQLite."""
 
 import logging
-from pathlib import Path
-from typing import Optional
+from typing import Dict, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
 
 logger = logging.getLogger(__name__)
 
 
-def run_sqlite_migrations(db_path: Optional[str] = None) -> None:
+# Additive column migrations: table -> {column: SQLite column definition}.
+# `Base.metadata.create_all` only creates missing tables, so columns added to
+# existing models must be listed here to reach databases created earlier.
+ADDITIVE_COLUMNS: Dict[str, Dict[str, str]] = {
+    "user_requests": {
+        "queue_payload": "JSON",
+        "attempts": "INTEGER NOT NULL DEFAULT 0",
+    },
+    "messages": {
+        "hidden_from_ui": "BOOLEAN NOT NULL DEFAULT 0",
+    },
+    "projects": {
+        "last_message_at": "DATETIME",
+    },
+}
+
+# Backfill statements run once, right after the column is added.
+COLUMN_BACKFILLS: Dict[str, Dict[str, str]] = {
+    "messages": {
+        "hidden_from_ui": (
+            "UPDATE messages SET hidden_from_ui = 1 "
+            "WHERE json_extract(metadata_json, '$.hidden_from_ui') = 1"
+        ),
+    },
+    "projects": {
+        "last_message_at": (
+            "UPDATE projects SET last_message_at = "
+            "(SELECT max(created_at) FROM messages WHERE messages.project_id = projects.id)"
+        ),
+    },
+}
+
+# Indexes declared on models after their table was first created:
+# name -> (table, columns). Created with IF NOT EXISTS.
+ADDITIVE_INDEXES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "ix_messages_hidden_from_ui": ("messages", ("hidden_from_ui",)),
+    "ix_messages_project_conversation_created": (
+        "messages",
+        ("project_id", "conversation_id", "created_at"),
+    ),
+}
+
+
+# Triggers keeping denormalized columns in sync: name -> (table, body).
+# Triggers also cover Core bulk inserts, which bypass ORM events.
+TRIGGERS: Dict[str, Tuple[str, str]] = {
+    "trg_messages_project_last_message_at": (
+        "messages",
+        "AFTER INSERT ON messages BEGIN "
+        "UPDATE projects SET last_message_at = NEW.created_at "
+        "WHERE id = NEW.project_id "
+        "AND (last_message_at IS NULL OR last_message_at < NEW.created_at); "
+        "END",
+    ),
+    # Deleting the latest message (clearing a chat) falls back to the previous one
+    "trg_messages_project_last_message_at_delete": (
+        "messages",
+        "AFTER DELETE ON messages BEGIN "
+        "UPDATE projects SET last_message_at = "
+        "(SELECT max(created_at) FROM messages WHERE project_id = OLD.project_id) "
+        "WHERE id = OLD.project_id AND last_message_at <= OLD.created_at; "
+        "END",
+    ),
+}
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table, columns in ADDITIVE_COLUMNS.items():
+            if table not in existing_tables:
+                continue
+            present = {col["name"] for col in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name in present:
+                    continue
+                logger.info(f"Adding column {table}.{name}")
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+                backfill = COLUMN_BACKFILLS.get(table, {}).get(name)
+                if backfill:
+                    conn.execute(text(backfill))
+
+
+def _add_missing_indexes(engine: Engine) -> None:
+    existing_tables = set(inspect(engine).get_table_names())
+
+    with engine.begin() as conn:
+        for name, (table, columns) in ADDITIVE_INDEXES.items():
+            if table not in existing_tables:
+                continue
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+            ))
+
+
+def _create_triggers(engine: Engine) -> None:
+    existing_tables = set(inspect(engine).get_table_names())
+
+    with engine.begin() as conn:
+        for name, (table, body) in TRIGGERS.items():
+            if table not in existing_tables:
+                continue
+            conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+
+
+def run_sqlite_migrations(engine: Engine) -> None:
     """
     Run SQLite database migrations.
-    
+
     Args:
-        db_path: Path to the SQLite database file
+        engine: SQLAlchemy engine bound to the application database
     """
-    if db_path:
-        logger.info(f"Running migrations for SQLite database at: {db_path}")
-    else:
-        logger.info("Running migrations for in-memory SQLite database")
-    
-    # Add migration logic here as needed
-    # For now, this is a placeholder that ensures the module exists
-    pass
\ No newline at end of file
+    if engine.dialect.name != "sqlite":
+        logger.info("Skipping SQLite migrations for non-SQLite database")
+        return
+
+    logger.info(f"Running migrations for SQLite database at: {engine.url.database or ':memory:'}")
+    _add_missing_columns(engine)
+    _add_missing_indexes(engine)
+    _create_triggers(engine)
@@ -3,6 +3,7 @@ from sqlalchemy.orm import sessionmaker
 from pathlib import Path
 import os
 from app.core.config import settings
+from app.db.sqlite_profile import apply_pragmas, get_profile
 
 # Ensure data directory exists - Fixed for Render
 db_path = settings.database_url.replace("sqlite:///", "")
@@ -28,20 +29,37 @@ if settings.database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
 engine = create_engine(
-    settings.database_url, 
+    settings.database_url,
     connect_args=connect_args,
-    pool_pre_ping=True
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
 )
 
-# Enable foreign key constraints for SQLite
+# Separate pool for read-only GET endpoints so UI polling never waits
+# behind write sessions for a connection
+read_engine = create_engine(
+    settings.database_url,
+    connect_args=connect_args,
+    pool_pre_ping=True,
+    pool_size=settings.db_read_pool_size,
+    max_overflow=settings.db_max_overflow,
+)
+
+# Apply the SQLite performance profile (WAL, synchronous, busy_timeout, ...)
 if settings.database_url.startswith("sqlite"):
+    sqlite_pragmas = get_profile()
+
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+        apply_pragmas(dbapi_conn, sqlite_pragmas)
+
+    @event.listens_for(read_engine, "connect")
+    def set_sqlite_read_pragma(dbapi_conn, connection_record):
+        apply_pragmas(dbapi_conn, sqlite_pragmas, read_only=True)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False)
 
 def get_db():
     """Database session dependency"""
@@ -50,3 +68,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Read-only database session dependency for GET endpoints"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,64 @@
+"""SQLite connection profiles.
+
+Pragmas applied to every new DBAPI connection. The "performance" profile
+enables WAL so readers (UI polling) don't block the writer (streaming
+agents), relaxes fsync to once per checkpoint and waits on locks instead of
+failing with "database is locked".
+"""
+import os
+from typing import Dict, Optional, Union
+
+PragmaValue = Union[str, int]
+
+PROFILES: Dict[str, Dict[str, PragmaValue]] = {
+    # Pre-WAL behaviour: rollback journal, full fsync, no lock wait
+    "legacy": {
+        "foreign_keys": "ON",
+    },
+    "performance": {
+        "foreign_keys": "ON",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,  # ms
+        "mmap_size": 268435456,  # 256MB
+        "cache_size": -20000,  # ~20MB (negative = KiB)
+        "temp_store": "MEMORY",
+    },
+}
+
+# Env overrides for individual pragmas, e.g. SQLITE_BUSY_TIMEOUT=10000
+_ENV_OVERRIDES = {
+    "journal_mode": "SQLITE_JOURNAL_MODE",
+    "synchronous": "SQLITE_SYNCHRONOUS",
+    "busy_timeout": "SQLITE_BUSY_TIMEOUT",
+    "mmap_size": "SQLITE_MMAP_SIZE",
+    "cache_size": "SQLITE_CACHE_SIZE",
+}
+
+# Pragmas that change the database file and must not run on read-only connections
+_WRITE_PRAGMAS = {"journal_mode"}
+
+
+def get_profile(name: Optional[str] = None) -> Dict[str, PragmaValue]:
+    """Return the pragma set for a profile name, with env overrides applied."""
+    name = (name or os.getenv("SQLITE_PROFILE", "performance")).lower()
+    pragmas = dict(PROFILES.get(name, PROFILES["performance"]))
+    for pragma, env_name in _ENV_OVERRIDES.items():
+        value = os.getenv(env_name)
+        if value:
+            pragmas[pragma] = value
+    return pragmas
+
+
+def apply_pragmas(dbapi_conn, pragmas: Dict[str, PragmaValue], read_only: bool = False) -> None:
+    """Apply pragmas to a raw sqlite3 connection."""
+    cursor = dbapi_conn.cursor()
+    try:
+        for pragma, value in pragmas.items():
+            if read_only and pragma in _WRITE_PRAGMAS:
+                continue
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
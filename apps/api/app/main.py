@@ -18,8 +18,18 @@ from app.core.terminal_ui import ui
 from sqlalchemy import inspect
 from app.db.base import Base
 import app.models  # noqa: F401 ensures models are imported for metadata
-from app.db.session import engine
+from app.db.session import engine, SessionLocal
 from app.db.migrations import run_sqlite_migrations
+from app.services.request_queue import request_queue
+from app.services.cli.process_pool import cli_process_pool
+from app.services.cli.availability import cli_availability
+from app.services.preview_events import preview_events
+from app.services.template_cache import template_cache
+from app.services.preview_supervisor import preview_supervisor
+from app.services.git_backend import git_backends
+from app.services.http_client import http_clients
+from app.services.deployment_tracker import deployment_tracker
+from app.services.key_rotation import key_rotation
 import os
 
 configure_logging()
@@ -62,7 +72,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["*"]
+    # "*" is not honored for credentialed requests, so name the headers clients read
+    expose_headers=[
+        "*",
+        "ETag",
+        "Accept-Ranges",
+        "Content-Range",
+        "X-Before-Cursor",
+        "X-After-Cursor",
+        "X-Has-More",
+        "X-Next-Cursor",
+        "X-Tree-Revision",
+    ]
 )
 
 # Routers
@@ -139,3 +160,36 @@ def on_startup() -> None:
         "Port": os.getenv("PORT", "8000")
     }
     ui.status_line(env_info)
+
+
+@app.on_event("startup")
+async def start_background_services() -> None:
+    # Runs after on_startup, so queued requests are recovered against a migrated schema
+    await request_queue.start()
+    # Warm the CLI availability cache so status endpoints never wait on a probe
+    cli_availability.start_background_refresh()
+    # Preview monitor threads hand events to this loop
+    preview_events.start()
+    # Build/refresh the project template off the request path
+    template_cache.start_background_refresh()
+    # Hibernate idle preview servers
+    preview_supervisor.start()
+    # Re-encrypt secrets still under ENCRYPTION_KEYS_PREVIOUS
+    key_rotation.start(SessionLocal)
+
+
+@app.on_event("shutdown")
+async def stop_background_services() -> None:
+    await request_queue.stop()
+    await key_rotation.stop()
+    await cli_availability.stop_background_refresh()
+    await preview_events.stop()
+    await template_cache.stop_background_refresh()
+    await preview_supervisor.close_all()
+    # Terminate warm CLI agent processes so they don't outlive the server
+    await cli_process_pool.close_all()
+    # Persistent `git cat-file --batch` readers
+    git_backends.close_all()
+    # Shared Vercel deployment poller, then pooled GitHub/Vercel connections
+    await deployment_tracker.stop()
+    await http_clients.close_all()
@@ -1,15 +1,25 @@
 """
 Unified message model for all chat, Claude Code SDK, and tool interactions
 """
-from sqlalchemy import String, DateTime, ForeignKey, Text, JSON, Integer, Numeric, Boolean
+from sqlalchemy import String, DateTime, ForeignKey, Text, JSON, Integer, Numeric, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.base import Base
 
 
+def _hidden_from_metadata(context) -> bool:
+    """Default hidden_from_ui from metadata_json when not set explicitly"""
+    metadata = context.get_current_parameters().get("metadata_json") or {}
+    return bool(isinstance(metadata, dict) and metadata.get("hidden_from_ui", False))
+
+
 class Message(Base):
     """Unified message table for all interactions"""
     __tablename__ = "messages"
+    __table_args__ = (
+        # Keyset pagination of conversation history
+        Index("ix_messages_project_conversation_created", "project_id", "conversation_id", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     project_id: Mapped[str] = mapped_column(String(64), ForeignKey("projects.id", ondelete="CASCADE"), index=True)
@@ -23,6 +33,7 @@ class Message(Base):
     
     # Metadata - flexible JSON storage for various message types
     metadata_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    hidden_from_ui: Mapped[bool] = mapped_column(Boolean, default=_hidden_from_metadata, nullable=False, index=True)
     
     # Threading & Session
     parent_message_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("messages.id", ondelete="SET NULL"), nullable=True)
@@ -2,7 +2,7 @@
 User Request Model
 사용자 요청별 작업 상태 추적 모델
 """
-from sqlalchemy import String, DateTime, ForeignKey, Boolean, Text, JSON
+from sqlalchemy import String, DateTime, ForeignKey, Boolean, Text, JSON, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.base import Base
@@ -54,7 +54,11 @@ class UserRequest(Base):
     # CLI 정보
     cli_type_used: Mapped[str | None] = mapped_column(String(32), nullable=True)
     model_used: Mapped[str | None] = mapped_column(String(64), nullable=True)
-    
+
+    # 큐 실행 정보 (재시작 후 재개용)
+    queue_payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # conversation_id, cli_preference, images ...
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
     # 타임스탬프
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
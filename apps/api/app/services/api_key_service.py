@@ -15,6 +15,7 @@ def save_api_key(db: Session, provider: str, key: str) -> APIKey:
     
     if existing_key:
         # Update existing key
+        secret_box.invalidate(existing_key.key)
         existing_key.key = secret_box.encrypt(key)
         existing_key.updated_at = datetime.utcnow()
         db.commit()
@@ -51,6 +52,7 @@ def get_all_api_keys(db: Session) -> dict[str, str]:
                 print(f"Failed to decrypt key for provider {key.provider}: {e}")
                 # Try to delete the corrupted key
                 try:
+                    secret_box.invalidate(key.key)
                     db.delete(key)
                     db.commit()
                     print(f"Deleted corrupted key for provider {key.provider}")
@@ -66,6 +68,7 @@ def delete_api_key(db: Session, provider: str) -> bool:
     """Delete API key for a provider"""
     api_key = db.query(APIKey).filter(APIKey.provider == provider).first()
     if api_key:
+        secret_box.invalidate(api_key.key)
         db.delete(api_key)
         db.commit()
         return True
@@ -12,12 +12,58 @@ import shlex
 import subprocess
 import uuid
 from datetime import datetime
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, List, Optional
 
 from app.core.terminal_ui import ui
 from app.models.messages import Message
 
-from ..base import BaseCLI, CLIType
+from ..base import BaseCLI, CLIType, StreamEvent, iter_stream_events
+from ..process_pool import cli_process_pool
+
+
+def _codex_event_type(data: Any) -> Optional[str]:
+    """Codex proto events carry their type in msg.type"""
+    if isinstance(data, dict) and isinstance(data.get("msg"), dict):
+        return data["msg"].get("type")
+    return None
+
+
+class _CodexProtoProcess:
+    """A running `codex proto` process that has completed session setup."""
+
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        session_info: Dict[str, Any],
+        events: Optional[AsyncIterator[StreamEvent]] = None,
+    ):
+        self.process = process
+        self.session_info = session_info
+        # One decoder per process: chunks read during setup may already hold later events
+        self.events = events or iter_stream_events(process.stdout, _codex_event_type)
+
+    def is_alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def close(self) -> None:
+        process = self.process
+        if process.returncode is not None:
+            return
+        if process.stdin:
+            try:
+                shutdown_cmd = {"id": "shutdown", "op": {"type": "shutdown"}}
+                json_str = json.dumps(shutdown_cmd)
+                process.stdin.write(json_str.encode("utf-8") + b"\n")
+                await process.stdin.drain()
+                process.stdin.close()
+                ui.debug("Sent shutdown command to Codex", "Codex")
+            except Exception as e:
+                ui.debug(f"Failed to send shutdown: {e}", "Codex")
+        try:
+            await asyncio.wait_for(process.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
 
 
 class CodexCLI(BaseCLI):
@@ -237,77 +283,59 @@ class CodexCLI(BaseCLI):
             "Codex",
         )
 
+        # `codex proto` is long-lived: keep a pre-warmed standby per workdir/config
+        # so the next run skips CLI startup. Resume mode bakes the rollout path
+        # into the command line, so it always spawns fresh.
+        pool_key = None if enable_resume else (self.cli_type.value, workdir_abs, tuple(command))
+
+        async def _spawn() -> "_CodexProtoProcess":
+            return await self._spawn_proto_process(command, project_repo_path, env)
+
+        agent: Optional[_CodexProtoProcess] = None
         try:
-            # Start Codex process
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=project_repo_path,
-                env=env,
-            )
+            # Start Codex process (or take the warm standby)
+            try:
+                if pool_key:
+                    agent = await cli_process_pool.acquire(pool_key, _spawn)
+                else:
+                    agent = await _spawn()
+            except RuntimeError as e:
+                ui.error(f"Failed to initialize Codex session: {e}", "Codex")
+                return
+            process = agent.process
+            session_info = agent.session_info
 
             # Message buffering
             agent_message_buffer = ""
             current_request_id = None
 
-            # Wait for session_configured
-            session_ready = False
-            timeout_count = 0
-            max_timeout = 100  # Max lines to read for session init
-
-            while not session_ready and timeout_count < max_timeout:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-
-                line_str = line.decode().strip()
-                if not line_str:
-                    timeout_count += 1
-                    continue
-
-                try:
-                    event = json.loads(line_str)
-                    if event.get("msg", {}).get("type") == "session_configured":
-                        session_info = event["msg"]
-                        codex_session_id = session_info.get("session_id")
-                        if codex_session_id:
-                            await self.set_session_id(project_id, codex_session_id)
-
-                        ui.success(
-                            f"Codex session configured: {codex_session_id}", "Codex"
-                        )
-
-                        # Send init message (hidden)
-                        yield Message(
-                            id=str(uuid.uuid4()),
-                            project_id=project_path,
-                            role="system",
-                            message_type="system",
-                            content=(
-                                f"🚀 Codex initialized (Model: {session_info.get('model', cli_model)})"
-                            ),
-                            metadata_json={
-                                "cli_type": self.cli_type.value,
-                                "hidden_from_ui": True,
-                            },
-                            session_id=session_id,
-                            created_at=datetime.utcnow(),
-                        )
+            codex_session_id = session_info.get("session_id")
+            if codex_session_id:
+                await self.set_session_id(project_id, codex_session_id)
 
-                        # After initialization, set approval policy to auto-approve
-                        await self._set_codex_approval_policy(process, session_id or "")
+            ui.success(
+                f"Codex session configured: {codex_session_id}", "Codex"
+            )
 
-                        session_ready = True
-                        break
-                except json.JSONDecodeError:
-                    timeout_count += 1
-                    continue
+            # Send init message (hidden)
+            yield Message(
+                id=str(uuid.uuid4()),
+                project_id=project_path,
+                role="system",
+                message_type="system",
+                content=(
+                    f"🚀 Codex initialized (Model: {session_info.get('model', cli_model)})"
+                ),
+                metadata_json={
+                    "cli_type": self.cli_type.value,
+                    "hidden_from_ui": True,
+                },
+                session_id=session_id,
+                created_at=datetime.utcnow(),
+            )
 
-            if not session_ready:
-                ui.error("Failed to initialize Codex session", "Codex")
-                return
+            # After initialization, set approval policy to auto-approve
+            await self._set_codex_approval_policy(process, session_id or "")
 
             # Send user input
             request_id = f"msg_{uuid.uuid4().hex[:8]}"
@@ -441,15 +469,14 @@ Do not create subdirectories unless specifically requested by the user.
                 ui.debug(f"Sent user input: {request_id}", "Codex")
 
             # Process streaming events
-            async for line in process.stdout:
-                line_str = line.decode().strip()
-                if not line_str:
+            async for stream_event in agent.events:
+                if stream_event.type == "parse_error" or not isinstance(stream_event.data, dict):
                     continue
 
                 try:
-                    event = json.loads(line_str)
+                    event = stream_event.data
                     event_id = event.get("id", "")
-                    msg_type = event.get("msg", {}).get("type")
+                    msg_type = stream_event.type
 
                     # Only process events for current request (exclude system events)
                     if (
@@ -650,7 +677,8 @@ Do not create subdirectories unless specifically requested by the user.
 
                     # Removed duplicate agent_message handler - already handled above
 
-                except json.JSONDecodeError:
+                except (KeyError, TypeError) as e:
+                    ui.debug(f"Skipping malformed Codex event: {e}", "Codex")
                     continue
 
             # Flush any remaining buffer
@@ -666,19 +694,15 @@ Do not create subdirectories unless specifically requested by the user.
                     created_at=datetime.utcnow(),
                 )
 
-            # Clean shutdown
-            if process.stdin:
-                try:
-                    shutdown_cmd = {"id": "shutdown", "op": {"type": "shutdown"}}
-                    json_str = json.dumps(shutdown_cmd)
-                    process.stdin.write(json_str.encode("utf-8") + b"\n")
-                    await process.stdin.drain()
-                    process.stdin.close()
-                    ui.debug("Sent shutdown command to Codex", "Codex")
-                except Exception as e:
-                    ui.debug(f"Failed to send shutdown: {e}", "Codex")
-
-            await process.wait()
+            # Clean shutdown; a proto session holds conversation state, so the
+            # process is not reused. Warm up a fresh standby for the next run.
+            if pool_key:
+                await cli_process_pool.release(pool_key, agent, reuse=False)
+                agent = None
+                cli_process_pool.prewarm(pool_key, _spawn)
+            else:
+                await agent.close()
+                agent = None
 
         except FileNotFoundError:
             yield Message(
@@ -702,6 +726,12 @@ Do not create subdirectories unless specifically requested by the user.
                 session_id=session_id,
                 created_at=datetime.utcnow(),
             )
+        finally:
+            if agent is not None:
+                if pool_key:
+                    await cli_process_pool.release(pool_key, agent, reuse=False)
+                else:
+                    await agent.close()
 
     async def get_session_id(self, project_id: str) -> Optional[str]:
         """Get stored session ID for project"""
@@ -923,6 +953,34 @@ Do not create subdirectories unless specifically requested by the user.
         except Exception as e:
             ui.error(f"Failed to create AGENTS.md: {e}", "Codex")
 
+    async def _spawn_proto_process(
+        self, command: List[str], cwd: str, env: Dict[str, str]
+    ) -> "_CodexProtoProcess":
+        """Start `codex proto` and wait until it reports session_configured"""
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+        )
+
+        events = iter_stream_events(process.stdout, _codex_event_type)
+        max_events = 100  # Max events to read for session init
+
+        seen = 0
+        async for event in events:
+            if event.type == "session_configured":
+                return _CodexProtoProcess(process, event.data["msg"], events)
+            seen += 1
+            if seen >= max_events:
+                break
+
+        proc = _CodexProtoProcess(process, {}, events)
+        await proc.close()
+        raise RuntimeError("Codex did not report session_configured")
+
     async def _set_codex_approval_policy(self, process, session_id: str):
         """Set Codex approval policy to never (full-auto mode)"""
         try:
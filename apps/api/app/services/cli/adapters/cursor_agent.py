@@ -14,7 +14,7 @@ from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
 from app.models.messages import Message
 from app.core.terminal_ui import ui
 
-from ..base import BaseCLI, CLIType
+from ..base import BaseCLI, CLIType, iter_stream_events
 
 # Try to import stream-json, fallback to manual parsing if not available
 try:
@@ -333,126 +333,118 @@ class CursorAgentCLI(BaseCLI):
             assistant_message_buffer = ""
             result_received = False  # Track if we received result event
 
-            async for line in process.stdout:
-                line_str = line.decode().strip()
-                if not line_str:
+            async for stream_event in iter_stream_events(process.stdout):
+                if stream_event.type == "parse_error":
+                    # Handle malformed JSON, still yield as raw output
+                    print(f"⚠️ [Cursor] JSON decode error: {stream_event.error}")
+                    print(f"⚠️ [Cursor] Raw line: {stream_event.raw}")
+                    yield Message(
+                        id=str(uuid.uuid4()),
+                        project_id=project_path,
+                        role="assistant",
+                        message_type="chat",
+                        content=stream_event.raw,
+                        metadata_json={
+                            "cli_type": "cursor",
+                            "raw_output": stream_event.raw,
+                            "parse_error": stream_event.error,
+                        },
+                        session_id=session_id,
+                        created_at=datetime.utcnow(),
+                    )
                     continue
-
-                try:
-                    # Parse NDJSON event
-                    event = json.loads(line_str)
-
-                    event_type = event.get("type")
-
-                    # Priority: Extract session ID from type: "result" event (most reliable)
-                    if event_type == "result" and not cursor_session_id:
-                        print(f"🔍 [Cursor] Result event received: {event}")
-                        session_id_from_result = event.get("session_id")
-                        if session_id_from_result:
-                            cursor_session_id = session_id_from_result
-                            await self.set_session_id(project_id, cursor_session_id)
-                            print(
-                                f"💾 [Cursor] Session ID extracted from result event: {cursor_session_id}"
-                            )
-
-                        # Mark that we received result event
-                        result_received = True
-
-                    # Extract session ID from various event types
-                    if not cursor_session_id:
-                        # Try to extract session ID from any event that contains it
-                        potential_session_id = (
-                            event.get("sessionId")
-                            or event.get("chatId")
-                            or event.get("session_id")
-                            or event.get("chat_id")
-                            or event.get("threadId")
-                            or event.get("thread_id")
-                        )
-
-                        # Also check in nested structures
-                        if not potential_session_id and isinstance(
-                            event.get("message"), dict
-                        ):
-                            potential_session_id = (
-                                event["message"].get("sessionId")
-                                or event["message"].get("chatId")
-                                or event["message"].get("session_id")
-                                or event["message"].get("chat_id")
-                            )
-
-                        if potential_session_id and potential_session_id != active_session_id:
-                            cursor_session_id = potential_session_id
-                            await self.set_session_id(project_id, cursor_session_id)
-                            print(
-                                f"💾 [Cursor] Updated session ID for project {project_id}: {cursor_session_id}"
-                            )
-                            print(f"   Previous: {active_session_id}")
-                            print(f"   New: {cursor_session_id}")
-
-                    # If we receive a non-assistant message, flush the buffer first
-                    if event.get("type") != "assistant" and assistant_message_buffer:
-                        yield Message(
-                            id=str(uuid.uuid4()),
-                            project_id=project_path,
-                            role="assistant",
-                            message_type="chat",
-                            content=assistant_message_buffer,
-                            metadata_json={
-                                "cli_type": "cursor",
-                                "event_type": "assistant_aggregated",
-                            },
-                            session_id=session_id,
-                            created_at=datetime.utcnow(),
+                if not isinstance(stream_event.data, dict):
+                    continue
+                event = stream_event.data
+                event_type = stream_event.type
+
+                # Priority: Extract session ID from type: "result" event (most reliable)
+                if event_type == "result" and not cursor_session_id:
+                    print(f"🔍 [Cursor] Result event received: {event}")
+                    session_id_from_result = event.get("session_id")
+                    if session_id_from_result:
+                        cursor_session_id = session_id_from_result
+                        await self.set_session_id(project_id, cursor_session_id)
+                        print(
+                            f"💾 [Cursor] Session ID extracted from result event: {cursor_session_id}"
                         )
-                        assistant_message_buffer = ""
 
-                    # Process the event
-                    message = self._handle_cursor_stream_json(
-                        event, project_path, session_id
+                    # Mark that we received result event
+                    result_received = True
+
+                # Extract session ID from various event types
+                if not cursor_session_id:
+                    # Try to extract session ID from any event that contains it
+                    potential_session_id = (
+                        event.get("sessionId")
+                        or event.get("chatId")
+                        or event.get("session_id")
+                        or event.get("chat_id")
+                        or event.get("threadId")
+                        or event.get("thread_id")
                     )
 
-                    if message:
-                        if message.role == "assistant" and message.message_type == "chat":
-                            assistant_message_buffer += message.content
-                        else:
-                            if log_callback:
-                                await log_callback(f"📝 [Cursor] {message.content}")
-                            yield message
+                    # Also check in nested structures
+                    if not potential_session_id and isinstance(
+                        event.get("message"), dict
+                    ):
+                        potential_session_id = (
+                            event["message"].get("sessionId")
+                            or event["message"].get("chatId")
+                            or event["message"].get("session_id")
+                            or event["message"].get("chat_id")
+                        )
 
-                    # ★ CRITICAL: Break after result event to end streaming
-                    if result_received:
+                    if potential_session_id and potential_session_id != active_session_id:
+                        cursor_session_id = potential_session_id
+                        await self.set_session_id(project_id, cursor_session_id)
                         print(
-                            f"🏁 [Cursor] Result event received, terminating stream early"
+                            f"💾 [Cursor] Updated session ID for project {project_id}: {cursor_session_id}"
                         )
-                        try:
-                            process.terminate()
-                            print(f"🔪 [Cursor] Process terminated")
-                        except Exception as e:
-                            print(f"⚠️ [Cursor] Failed to terminate process: {e}")
-                        break
-
-                except json.JSONDecodeError as e:
-                    # Handle malformed JSON
-                    print(f"⚠️ [Cursor] JSON decode error: {e}")
-                    print(f"⚠️ [Cursor] Raw line: {line_str}")
-
-                    # Still yield as raw output
-                    message = Message(
+                        print(f"   Previous: {active_session_id}")
+                        print(f"   New: {cursor_session_id}")
+
+                # If we receive a non-assistant message, flush the buffer first
+                if event.get("type") != "assistant" and assistant_message_buffer:
+                    yield Message(
                         id=str(uuid.uuid4()),
                         project_id=project_path,
                         role="assistant",
                         message_type="chat",
-                        content=line_str,
+                        content=assistant_message_buffer,
                         metadata_json={
                             "cli_type": "cursor",
-                            "raw_output": line_str,
-                            "parse_error": str(e),
+                            "event_type": "assistant_aggregated",
                         },
                         session_id=session_id,
                         created_at=datetime.utcnow(),
                     )
-                    yield message
+                    assistant_message_buffer = ""
+
+                # Process the event
+                message = self._handle_cursor_stream_json(
+                    event, project_path, session_id
+                )
+
+                if message:
+                    if message.role == "assistant" and message.message_type == "chat":
+                        assistant_message_buffer += message.content
+                    else:
+                        if log_callback:
+                            await log_callback(f"📝 [Cursor] {message.content}")
+                        yield message
+
+                # ★ CRITICAL: Break after result event to end streaming
+                if result_received:
+                    print(
+                        f"🏁 [Cursor] Result event received, terminating stream early"
+                    )
+                    try:
+                        process.terminate()
+                        print(f"🔪 [Cursor] Process terminated")
+                    except Exception as e:
+                        print(f"⚠️ [Cursor] Failed to terminate process: {e}")
+                    break
 
             # Flush any remaining content in the buffer
             if assistant_message_buffer:
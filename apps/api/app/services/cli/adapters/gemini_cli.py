@@ -18,15 +18,13 @@ from app.core.terminal_ui import ui
 from app.models.messages import Message
 
 from ..base import BaseCLI, CLIType
+from ..process_pool import cli_process_pool
 from .qwen_cli import _ACPClient, _mime_for  # Reuse minimal ACP client
 
 
 class GeminiCLI(BaseCLI):
     """Gemini CLI via ACP. Streams message and thought chunks to UI."""
 
-    _SHARED_CLIENT: Optional[_ACPClient] = None
-    _SHARED_INITIALIZED: bool = False
-
     def __init__(self, db_session=None):
         super().__init__(CLIType.GEMINI)
         self.db_session = db_session
@@ -87,45 +85,48 @@ class GeminiCLI(BaseCLI):
             ui.warning(f"Failed to create GEMINI.md: {e}", "Gemini")
 
     async def _ensure_client(self) -> _ACPClient:
-        if GeminiCLI._SHARED_CLIENT is None:
-            cmd = ["gemini", "--experimental-acp"]
-            env = os.environ.copy()
-            # Prefer device-code-like flow if CLI supports it
-            env.setdefault("NO_BROWSER", "1")
-            GeminiCLI._SHARED_CLIENT = _ACPClient(cmd, env=env)
-
-            # Client-side request handlers: auto-approve permissions
-            async def _handle_permission(params: Dict[str, Any]) -> Dict[str, Any]:
-                options = params.get("options") or []
-                chosen = None
-                for kind in ("allow_always", "allow_once"):
-                    chosen = next((o for o in options if o.get("kind") == kind), None)
-                    if chosen:
-                        break
-                if not chosen and options:
-                    chosen = options[0]
-                if not chosen:
-                    return {"outcome": {"outcome": "cancelled"}}
-                return {
-                    "outcome": {"outcome": "selected", "optionId": chosen.get("optionId")}
-                }
+        # One ACP process serves every project; the pool respawns it if it dies
+        # and closes it after the idle timeout
+        self._client = await cli_process_pool.get_shared((CLIType.GEMINI.value,), self._create_client)
+        return self._client
 
-            async def _fs_read(params: Dict[str, Any]) -> Dict[str, Any]:
-                return {"content": ""}
+    async def _create_client(self) -> _ACPClient:
+        cmd = ["gemini", "--experimental-acp"]
+        env = os.environ.copy()
+        # Prefer device-code-like flow if CLI supports it
+        env.setdefault("NO_BROWSER", "1")
+        client = _ACPClient(cmd, env=env)
+
+        # Client-side request handlers: auto-approve permissions
+        async def _handle_permission(params: Dict[str, Any]) -> Dict[str, Any]:
+            options = params.get("options") or []
+            chosen = None
+            for kind in ("allow_always", "allow_once"):
+                chosen = next((o for o in options if o.get("kind") == kind), None)
+                if chosen:
+                    break
+            if not chosen and options:
+                chosen = options[0]
+            if not chosen:
+                return {"outcome": {"outcome": "cancelled"}}
+            return {
+                "outcome": {"outcome": "selected", "optionId": chosen.get("optionId")}
+            }
 
-            async def _fs_write(params: Dict[str, Any]) -> Dict[str, Any]:
-                return {}
+        def _fs_read(params: Dict[str, Any]) -> Dict[str, Any]:
+            return {"content": ""}
 
-            GeminiCLI._SHARED_CLIENT.on_request("session/request_permission", _handle_permission)
-            GeminiCLI._SHARED_CLIENT.on_request("fs/read_text_file", _fs_read)
-            GeminiCLI._SHARED_CLIENT.on_request("fs/write_text_file", _fs_write)
+        def _fs_write(params: Dict[str, Any]) -> Dict[str, Any]:
+            return {}
 
-            await GeminiCLI._SHARED_CLIENT.start()
+        client.on_request("session/request_permission", _handle_permission)
+        client.on_request("fs/read_text_file", _fs_read, blocking=True)
+        client.on_request("fs/write_text_file", _fs_write, blocking=True)
 
-        self._client = GeminiCLI._SHARED_CLIENT
+        await client.start()
 
-        if not GeminiCLI._SHARED_INITIALIZED:
-            await self._client.request(
+        try:
+            await client.request(
                 "initialize",
                 {
                     "clientCapabilities": {
@@ -134,8 +135,10 @@ class GeminiCLI(BaseCLI):
                     "protocolVersion": 1,
                 },
             )
-            GeminiCLI._SHARED_INITIALIZED = True
-        return self._client
+        except Exception:
+            await client.stop()
+            raise
+        return client
 
     async def execute_with_streaming(
         self,
@@ -221,8 +224,6 @@ class GeminiCLI(BaseCLI):
 
         def _on_update(params: Dict[str, Any]) -> None:
             try:
-                if params.get("sessionId") != stored_session_id:
-                    return
                 update = params.get("update") or {}
                 try:
                     kind = update.get("sessionUpdate") or update.get("type")
@@ -241,7 +242,8 @@ class GeminiCLI(BaseCLI):
             except Exception:
                 pass
 
-        client.on_notification("session/update", _on_update)
+        # Only this session's updates are routed here (the process is shared)
+        client.subscribe(stored_session_id, _on_update)
 
         # Build prompt parts
         parts: List[Dict[str, Any]] = []
@@ -287,88 +289,96 @@ class GeminiCLI(BaseCLI):
             )
         prompt_task = _make_prompt_task()
 
-        while True:
-            done, _ = await asyncio.wait(
-                {prompt_task, asyncio.create_task(q.get())},
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            if prompt_task in done:
-                ui.debug(f"[{turn_id}] prompt_task completed; draining updates", "Gemini")
-                # Drain remaining
-                while not q.empty():
-                    update = q.get_nowait()
+        update_task: Optional[asyncio.Task] = None
+        try:
+            while True:
+                if update_task is None:
+                    update_task = asyncio.create_task(q.get())
+                done, _ = await asyncio.wait({prompt_task, update_task}, return_when=asyncio.FIRST_COMPLETED)
+                # Handle an update that arrived with the prompt response before draining
+                if update_task in done:
+                    update = update_task.result()
+                    update_task = None
+                    try:
+                        kind = update.get("sessionUpdate") or update.get("type")
+                        ui.debug(f"[{turn_id}] processing update kind={kind}", "Gemini")
+                    except Exception:
+                        pass
                     async for m in self._update_to_messages(update, project_path, session_id, thought_buffer, text_buffer):
                         if m:
                             yield m
-                exc = prompt_task.exception()
-                if exc:
-                    msg = str(exc)
-                    if "Session not found" in msg or "session not found" in msg.lower():
-                        ui.warning(f"[{turn_id}] session expired; creating a new session and retrying", "Gemini")
-                        try:
-                            result = await client.request(
-                                "session/new", {"cwd": project_repo_path, "mcpServers": []}
-                            )
-                            stored_session_id = result.get("sessionId")
-                            if stored_session_id:
-                                await self.set_session_id(project_id, stored_session_id)
-                                ui.info(f"[{turn_id}] new session={stored_session_id}; retrying prompt", "Gemini")
-                                prompt_task = _make_prompt_task()
-                                continue
-                        except Exception as e2:
-                            ui.error(f"[{turn_id}] session recovery failed: {e2}", "Gemini")
+                if prompt_task in done:
+                    ui.debug(f"[{turn_id}] prompt_task completed; draining updates", "Gemini")
+                    # Drain remaining
+                    while not q.empty():
+                        update = q.get_nowait()
+                        async for m in self._update_to_messages(update, project_path, session_id, thought_buffer, text_buffer):
+                            if m:
+                                yield m
+                    exc = prompt_task.exception()
+                    if exc:
+                        msg = str(exc)
+                        if "Session not found" in msg or "session not found" in msg.lower():
+                            ui.warning(f"[{turn_id}] session expired; creating a new session and retrying", "Gemini")
+                            try:
+                                result = await client.request(
+                                    "session/new", {"cwd": project_repo_path, "mcpServers": []}
+                                )
+                                client.unsubscribe(stored_session_id, _on_update)
+                                stored_session_id = result.get("sessionId")
+                                if stored_session_id:
+                                    client.subscribe(stored_session_id, _on_update)
+                                    await self.set_session_id(project_id, stored_session_id)
+                                    ui.info(f"[{turn_id}] new session={stored_session_id}; retrying prompt", "Gemini")
+                                    prompt_task = _make_prompt_task()
+                                    continue
+                            except Exception as e2:
+                                ui.error(f"[{turn_id}] session recovery failed: {e2}", "Gemini")
+                                yield Message(
+                                    id=str(uuid.uuid4()),
+                                    project_id=project_path,
+                                    role="assistant",
+                                    message_type="error",
+                                    content=f"Gemini session recovery failed: {e2}",
+                                    metadata_json={"cli_type": self.cli_type.value},
+                                    session_id=session_id,
+                                    created_at=datetime.utcnow(),
+                                )
+                        else:
+                            ui.error(f"[{turn_id}] prompt error: {msg}", "Gemini")
                             yield Message(
                                 id=str(uuid.uuid4()),
                                 project_id=project_path,
                                 role="assistant",
                                 message_type="error",
-                                content=f"Gemini session recovery failed: {e2}",
+                                content=f"Gemini prompt error: {msg}",
                                 metadata_json={"cli_type": self.cli_type.value},
                                 session_id=session_id,
                                 created_at=datetime.utcnow(),
                             )
-                    else:
-                        ui.error(f"[{turn_id}] prompt error: {msg}", "Gemini")
+                    # Final flush of buffered assistant content (with <thinking> block)
+                    if thought_buffer or text_buffer:
+                        ui.debug(
+                            f"[{turn_id}] flushing buffered content thought_len={sum(len(x) for x in thought_buffer)} text_len={sum(len(x) for x in text_buffer)}",
+                            "Gemini",
+                        )
                         yield Message(
                             id=str(uuid.uuid4()),
                             project_id=project_path,
                             role="assistant",
-                            message_type="error",
-                            content=f"Gemini prompt error: {msg}",
+                            message_type="chat",
+                            content=self._compose_content(thought_buffer, text_buffer),
                             metadata_json={"cli_type": self.cli_type.value},
                             session_id=session_id,
                             created_at=datetime.utcnow(),
                         )
-                # Final flush of buffered assistant content (with <thinking> block)
-                if thought_buffer or text_buffer:
-                    ui.debug(
-                        f"[{turn_id}] flushing buffered content thought_len={sum(len(x) for x in thought_buffer)} text_len={sum(len(x) for x in text_buffer)}",
-                        "Gemini",
-                    )
-                    yield Message(
-                        id=str(uuid.uuid4()),
-                        project_id=project_path,
-                        role="assistant",
-                        message_type="chat",
-                        content=self._compose_content(thought_buffer, text_buffer),
-                        metadata_json={"cli_type": self.cli_type.value},
-                        session_id=session_id,
-                        created_at=datetime.utcnow(),
-                    )
-                    thought_buffer.clear()
-                    text_buffer.clear()
-                break
-            for task in done:
-                if task is not prompt_task:
-                    update = task.result()
-                    try:
-                        kind = update.get("sessionUpdate") or update.get("type")
-                        ui.debug(f"[{turn_id}] processing update kind={kind}", "Gemini")
-                    except Exception:
-                        pass
-                    async for m in self._update_to_messages(update, project_path, session_id, thought_buffer, text_buffer):
-                        if m:
-                            yield m
+                        thought_buffer.clear()
+                        text_buffer.clear()
+                    break
+        finally:
+            if update_task is not None:
+                update_task.cancel()
+            client.unsubscribe(stored_session_id, _on_update)
 
         yield Message(
             id=str(uuid.uuid4()),
@@ -420,6 +430,11 @@ class GeminiCLI(BaseCLI):
                     )
                     thought_buffer.clear()
                 text_buffer.append(text)
+            # Live preview until the consolidated message is flushed
+            if text:
+                yield self.stream_delta(
+                    text, "thought" if kind == "agent_thought_chunk" else "text", project_path, session_id
+                )
             return
         elif kind in ("tool_call", "tool_call_update"):
             tool_name = self._parse_tool_name(update)
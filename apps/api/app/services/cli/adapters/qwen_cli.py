@@ -11,15 +11,18 @@ import base64
 import json
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import shutil
 from datetime import datetime
-from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Set, Union
 
+from app.core.config import settings
 from app.core.terminal_ui import ui
 from app.models.messages import Message
 
-from ..base import BaseCLI, CLIType
+from ..base import BaseCLI, CLIType, iter_stream_events
+from ..process_pool import cli_process_pool
 
 
 @dataclass
@@ -27,8 +30,26 @@ class _Pending:
     fut: asyncio.Future
 
 
+@dataclass
+class _RequestHandler:
+    fn: Union[Callable[[Dict[str, Any]], Awaitable[Any]], Callable[[Dict[str, Any]], Any]]
+    blocking: bool = False  # plain function run on the fs thread pool
+
+
+# Filesystem handlers (fs/read_text_file, fs/write_text_file) run here so slow
+# disk I/O never stalls the event loop or the ACP reader. Shared by all clients.
+_FS_EXECUTOR = ThreadPoolExecutor(max_workers=settings.acp_fs_workers, thread_name_prefix="acp-fs")
+
+
 class _ACPClient:
-    """Minimal JSON-RPC client over newline-delimited JSON on stdio."""
+    """Minimal JSON-RPC client over newline-delimited JSON on stdio.
+
+    The reader only routes messages: agent->client requests run as tasks
+    (at most `acp_max_concurrent_requests` at a time), so a slow handler never
+    delays responses or notifications behind it. `session/update`
+    notifications are routed by sessionId to the subscribers of that session,
+    which lets one agent process serve many projects concurrently.
+    """
 
     def __init__(self, cmd: List[str], env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None):
         self._cmd = cmd
@@ -38,7 +59,11 @@ class _ACPClient:
         self._next_id = 1
         self._pending: Dict[int, _Pending] = {}
         self._notif_handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
-        self._request_handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {}
+        self._session_handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._request_handlers: Dict[str, _RequestHandler] = {}
+        self._request_slots = asyncio.Semaphore(settings.acp_max_concurrent_requests)
+        self._request_tasks: Set[asyncio.Task] = set()
+        self._write_lock = asyncio.Lock()
         self._reader_task: Optional[asyncio.Task] = None
 
     async def start(self) -> None:
@@ -69,12 +94,41 @@ class _ACPClient:
             if self._reader_task:
                 self._reader_task.cancel()
                 self._reader_task = None
+            for task in list(self._request_tasks):
+                task.cancel()
+            self._request_tasks.clear()
+
+    async def close(self) -> None:
+        await self.stop()
+
+    def is_alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    def is_busy(self) -> bool:
+        return bool(self._pending)
 
     def on_notification(self, method: str, handler: Callable[[Dict[str, Any]], None]) -> None:
         self._notif_handlers.setdefault(method, []).append(handler)
 
-    def on_request(self, method: str, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
-        self._request_handlers[method] = handler
+    def subscribe(self, session_id: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        """Receive `session/update` params for one ACP session"""
+        self._session_handlers.setdefault(session_id, []).append(handler)
+
+    def unsubscribe(self, session_id: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        handlers = self._session_handlers.get(session_id)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self._session_handlers.pop(session_id, None)
+
+    def on_request(
+        self,
+        method: str,
+        handler: Union[Callable[[Dict[str, Any]], Awaitable[Any]], Callable[[Dict[str, Any]], Any]],
+        blocking: bool = False,
+    ) -> None:
+        """Register an agent->client request handler; `blocking` ones run on the fs thread pool"""
+        self._request_handlers[method] = _RequestHandler(handler, blocking)
 
     async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
         if not self._proc or not self._proc.stdin:
@@ -83,28 +137,16 @@ class _ACPClient:
         self._next_id += 1
         fut: asyncio.Future = asyncio.get_running_loop().create_future()
         self._pending[msg_id] = _Pending(fut=fut)
-        obj = {"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params or {}}
-        data = (json.dumps(obj) + "\n").encode("utf-8")
-        self._proc.stdin.write(data)
-        await self._proc.stdin.drain()
+        await self._send({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params or {}})
         return await fut
 
     async def _reader_loop(self) -> None:
         assert self._proc and self._proc.stdout
-        stdout = self._proc.stdout
-        buffer = b""
-        while True:
-            line = await stdout.readline()
-            if not line:
-                break
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                msg = json.loads(line.decode("utf-8"))
-            except Exception:
+        async for event in iter_stream_events(self._proc.stdout):
+            if event.type == "parse_error":
                 # best-effort: ignore malformed
                 continue
+            msg = event.data
 
             # Response
             if isinstance(msg, dict) and "id" in msg and "method" not in msg:
@@ -117,54 +159,70 @@ class _ACPClient:
                     slot.fut.set_result(msg.get("result"))
                 continue
 
-            # Request from agent (client-side)
+            # Request from agent (client-side): handled off the reader
             if isinstance(msg, dict) and "method" in msg and "id" in msg:
-                req_id = msg["id"]
-                method = msg["method"]
-                params = msg.get("params") or {}
-                handler = self._request_handlers.get(method)
-                if handler:
-                    try:
-                        result = await handler(params)
-                        await self._send({"jsonrpc": "2.0", "id": req_id, "result": result})
-                    except Exception as e:
-                        await self._send({
-                            "jsonrpc": "2.0",
-                            "id": req_id,
-                            "error": {"code": -32000, "message": str(e)},
-                        })
-                else:
-                    await self._send({
-                        "jsonrpc": "2.0",
-                        "id": req_id,
-                        "error": {"code": -32601, "message": "Method not found"},
-                    })
+                task = asyncio.create_task(self._handle_request(msg))
+                self._request_tasks.add(task)
+                task.add_done_callback(self._request_tasks.discard)
                 continue
 
             # Notification from agent
             if isinstance(msg, dict) and "method" in msg and "id" not in msg:
                 method = msg["method"]
                 params = msg.get("params") or {}
-                for h in self._notif_handlers.get(method, []) or []:
+                handlers = list(self._notif_handlers.get(method, []))
+                if method == "session/update":
+                    handlers.extend(self._session_handlers.get(params.get("sessionId"), []))
+                for h in handlers:
                     try:
                         h(params)
                     except Exception:
                         pass
 
+        # Process exited: fail in-flight requests instead of hanging forever
+        for slot in self._pending.values():
+            if not slot.fut.done():
+                slot.fut.set_exception(RuntimeError("ACP process exited"))
+        self._pending.clear()
+
+    async def _handle_request(self, msg: Dict[str, Any]) -> None:
+        req_id = msg["id"]
+        params = msg.get("params") or {}
+        handler = self._request_handlers.get(msg["method"])
+        if not handler:
+            await self._send({
+                "jsonrpc": "2.0",
+                "id": req_id,
+                "error": {"code": -32601, "message": "Method not found"},
+            })
+            return
+        async with self._request_slots:
+            try:
+                if handler.blocking:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(_FS_EXECUTOR, handler.fn, params)
+                else:
+                    result = await handler.fn(params)
+                reply = {"jsonrpc": "2.0", "id": req_id, "result": result}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reply = {"jsonrpc": "2.0", "id": req_id, "error": {"code": -32000, "message": str(e)}}
+        await self._send(reply)
+
     async def _send(self, obj: Dict[str, Any]) -> None:
         if not self._proc or not self._proc.stdin:
             return
-        self._proc.stdin.write((json.dumps(obj) + "\n").encode("utf-8"))
-        await self._proc.stdin.drain()
+        data = (json.dumps(obj) + "\n").encode("utf-8")
+        # Replies come from concurrent handler tasks; keep one writer at a time
+        async with self._write_lock:
+            self._proc.stdin.write(data)
+            await self._proc.stdin.drain()
 
 
 class QwenCLI(BaseCLI):
     """Qwen CLI via ACP. Streams message and thought chunks to UI."""
 
-    # Shared ACP client across instances to preserve sessions
-    _SHARED_CLIENT: Optional[_ACPClient] = None
-    _SHARED_INITIALIZED: bool = False
-
     def __init__(self, db_session=None):
         super().__init__(CLIType.QWEN)
         self.db_session = db_session
@@ -225,134 +283,135 @@ class QwenCLI(BaseCLI):
             ui.warning(f"Failed to create QWEN.md: {e}", "Qwen")
 
     async def _ensure_client(self) -> _ACPClient:
-        # Use shared client across adapter instances
-        if QwenCLI._SHARED_CLIENT is None:
-            # Resolve command: env(QWEN_CMD) -> qwen -> qwen-code
-            candidates = []
-            env_cmd = os.getenv("QWEN_CMD")
-            if env_cmd:
-                candidates.append(env_cmd)
-            candidates.extend(["qwen", "qwen-code"])
-            resolved = None
-            for c in candidates:
-                if shutil.which(c):
-                    resolved = c
+        # One ACP process serves every project; the pool respawns it if it dies
+        # and closes it after the idle timeout
+        self._client = await cli_process_pool.get_shared((CLIType.QWEN.value,), self._create_client)
+        return self._client
+
+    async def _create_client(self) -> _ACPClient:
+        # Resolve command: env(QWEN_CMD) -> qwen -> qwen-code
+        candidates = []
+        env_cmd = os.getenv("QWEN_CMD")
+        if env_cmd:
+            candidates.append(env_cmd)
+        candidates.extend(["qwen", "qwen-code"])
+        resolved = None
+        for c in candidates:
+            if shutil.which(c):
+                resolved = c
+                break
+        if not resolved:
+            raise RuntimeError(
+                "Qwen CLI not found. Set QWEN_CMD or install 'qwen' CLI in PATH."
+            )
+        cmd = [resolved, "--experimental-acp"]
+        # Prefer device-code / no-browser flow to avoid launching windows
+        env = os.environ.copy()
+        env.setdefault("NO_BROWSER", "1")
+        client = _ACPClient(cmd, env=env)
+
+        # Register client-side request handlers
+        async def _handle_permission(params: Dict[str, Any]) -> Dict[str, Any]:
+            # Auto-approve: prefer allow_always -> allow_once -> first
+            options = params.get("options") or []
+            chosen = None
+            for kind in ("allow_always", "allow_once"):
+                chosen = next((o for o in options if o.get("kind") == kind), None)
+                if chosen:
                     break
-            if not resolved:
-                raise RuntimeError(
-                    "Qwen CLI not found. Set QWEN_CMD or install 'qwen' CLI in PATH."
-                )
-            cmd = [resolved, "--experimental-acp"]
-            # Prefer device-code / no-browser flow to avoid launching windows
-            env = os.environ.copy()
-            env.setdefault("NO_BROWSER", "1")
-            QwenCLI._SHARED_CLIENT = _ACPClient(cmd, env=env)
-
-            # Register client-side request handlers
-            async def _handle_permission(params: Dict[str, Any]) -> Dict[str, Any]:
-                # Auto-approve: prefer allow_always -> allow_once -> first
-                options = params.get("options") or []
-                chosen = None
-                for kind in ("allow_always", "allow_once"):
-                    chosen = next((o for o in options if o.get("kind") == kind), None)
-                    if chosen:
-                        break
-                if not chosen and options:
-                    chosen = options[0]
-                if not chosen:
-                    return {"outcome": {"outcome": "cancelled"}}
-                return {
-                    "outcome": {"outcome": "selected", "optionId": chosen.get("optionId")}
-                }
+            if not chosen and options:
+                chosen = options[0]
+            if not chosen:
+                return {"outcome": {"outcome": "cancelled"}}
+            return {
+                "outcome": {"outcome": "selected", "optionId": chosen.get("optionId")}
+            }
 
-            async def _fs_read(params: Dict[str, Any]) -> Dict[str, Any]:
-                # Conservative: deny reading arbitrary files from agent perspective
-                return {"content": ""}
-
-            async def _fs_write(params: Dict[str, Any]) -> Dict[str, Any]:
-                # Validate required parameters for file editing
-                if "old_string" not in params and "content" in params:
-                    # If old_string is missing but content exists, log warning
-                    ui.warning(
-                        f"Qwen edit missing 'old_string' parameter: {params.get('path', 'unknown')}",
-                        "Qwen"
-                    )
-                    return {"error": "Missing required parameter: old_string"}
-                # Not fully implemented for safety, but return success to avoid blocking
-                return {"success": True}
+        def _fs_read(params: Dict[str, Any]) -> Dict[str, Any]:
+            # Conservative: deny reading arbitrary files from agent perspective
+            return {"content": ""}
 
-            async def _edit_file(params: Dict[str, Any]) -> Dict[str, Any]:
-                # Handle edit requests with proper parameter validation
-                path = params.get('path', params.get('file_path', 'unknown'))
-                
-                # Log the edit attempt for debugging
-                ui.debug(f"Qwen edit request: path={path}, has_old_string={'old_string' in params}", "Qwen")
-                
-                if "old_string" not in params:
-                    ui.warning(
-                        f"Qwen edit missing 'old_string': {path}",
-                        "Qwen"
-                    )
-                    # Return success anyway to not block Qwen's workflow
-                    # This allows Qwen to continue even with malformed requests
-                    return {"success": True}
-                
-                # For safety, we don't actually perform the edit but return success
-                ui.debug(f"Qwen edit would modify: {path}", "Qwen")
+        def _fs_write(params: Dict[str, Any]) -> Dict[str, Any]:
+            # Validate required parameters for file editing
+            if "old_string" not in params and "content" in params:
+                # If old_string is missing but content exists, log warning
+                ui.warning(
+                    f"Qwen edit missing 'old_string' parameter: {params.get('path', 'unknown')}",
+                    "Qwen"
+                )
+                return {"error": "Missing required parameter: old_string"}
+            # Not fully implemented for safety, but return success to avoid blocking
+            return {"success": True}
+
+        async def _edit_file(params: Dict[str, Any]) -> Dict[str, Any]:
+            # Handle edit requests with proper parameter validation
+            path = params.get('path', params.get('file_path', 'unknown'))
+            
+            # Log the edit attempt for debugging
+            ui.debug(f"Qwen edit request: path={path}, has_old_string={'old_string' in params}", "Qwen")
+            
+            if "old_string" not in params:
+                ui.warning(
+                    f"Qwen edit missing 'old_string': {path}",
+                    "Qwen"
+                )
+                # Return success anyway to not block Qwen's workflow
+                # This allows Qwen to continue even with malformed requests
                 return {"success": True}
+            
+            # For safety, we don't actually perform the edit but return success
+            ui.debug(f"Qwen edit would modify: {path}", "Qwen")
+            return {"success": True}
+
+        client.on_request("session/request_permission", _handle_permission)
+        client.on_request("fs/read_text_file", _fs_read, blocking=True)
+        client.on_request("fs/write_text_file", _fs_write, blocking=True)
+        client.on_request("edit", _edit_file)
+        client.on_request("str_replace_editor", _edit_file)
+
+        await client.start()
+        # Attach simple stderr logger (filtering out polling messages)
+        try:
+            proc = client._proc
+            if proc and proc.stderr:
+                async def _log_stderr(stream):
+                    while True:
+                        line = await stream.readline()
+                        if not line:
+                            break
+                        decoded = line.decode(errors="ignore").strip()
+                        # Skip polling for token messages
+                        if "polling for token" in decoded.lower():
+                            continue
+                        # Skip ImportProcessor errors (these are just warnings about npm packages)
+                        if "[ERROR] [ImportProcessor]" in decoded:
+                            continue
+                        # Skip ENOENT errors for node_modules paths
+                        if "ENOENT" in decoded and ("node_modules" in decoded or "tailwind" in decoded or "supabase" in decoded):
+                            continue
+                        # Only log meaningful errors
+                        if decoded and not decoded.startswith("DEBUG"):
+                            ui.warning(decoded, "Qwen STDERR")
+                asyncio.create_task(_log_stderr(proc.stderr))
+        except Exception:
+            pass
 
-            QwenCLI._SHARED_CLIENT.on_request("session/request_permission", _handle_permission)
-            QwenCLI._SHARED_CLIENT.on_request("fs/read_text_file", _fs_read)
-            QwenCLI._SHARED_CLIENT.on_request("fs/write_text_file", _fs_write)
-            QwenCLI._SHARED_CLIENT.on_request("edit", _edit_file)
-            QwenCLI._SHARED_CLIENT.on_request("str_replace_editor", _edit_file)
-
-            await QwenCLI._SHARED_CLIENT.start()
-            # Attach simple stderr logger (filtering out polling messages)
-            try:
-                proc = QwenCLI._SHARED_CLIENT._proc
-                if proc and proc.stderr:
-                    async def _log_stderr(stream):
-                        while True:
-                            line = await stream.readline()
-                            if not line:
-                                break
-                            decoded = line.decode(errors="ignore").strip()
-                            # Skip polling for token messages
-                            if "polling for token" in decoded.lower():
-                                continue
-                            # Skip ImportProcessor errors (these are just warnings about npm packages)
-                            if "[ERROR] [ImportProcessor]" in decoded:
-                                continue
-                            # Skip ENOENT errors for node_modules paths
-                            if "ENOENT" in decoded and ("node_modules" in decoded or "tailwind" in decoded or "supabase" in decoded):
-                                continue
-                            # Only log meaningful errors
-                            if decoded and not decoded.startswith("DEBUG"):
-                                ui.warning(decoded, "Qwen STDERR")
-                    asyncio.create_task(_log_stderr(proc.stderr))
-            except Exception:
-                pass
-
-        self._client = QwenCLI._SHARED_CLIENT
-
-        if not QwenCLI._SHARED_INITIALIZED:
-            try:
-                await self._client.request(
-                    "initialize",
-                    {
-                        "clientCapabilities": {
-                            "fs": {"readTextFile": False, "writeTextFile": False}
-                        },
-                        "protocolVersion": 1,
+        try:
+            await client.request(
+                "initialize",
+                {
+                    "clientCapabilities": {
+                        "fs": {"readTextFile": False, "writeTextFile": False}
                     },
-                )
-                QwenCLI._SHARED_INITIALIZED = True
-            except Exception as e:
-                ui.error(f"Qwen initialize failed: {e}", "Qwen")
-                raise
+                    "protocolVersion": 1,
+                },
+            )
+        except Exception as e:
+            ui.error(f"Qwen initialize failed: {e}", "Qwen")
+            await client.stop()
+            raise
 
-        return self._client
+        return client
 
     async def execute_with_streaming(
         self,
@@ -440,14 +499,13 @@ class QwenCLI(BaseCLI):
 
         def _on_update(params: Dict[str, Any]) -> None:
             try:
-                if params.get("sessionId") != stored_session_id:
-                    return
                 update = params.get("update") or {}
                 q.put_nowait(update)
             except Exception:
                 pass
 
-        client.on_notification("session/update", _on_update)
+        # Only this session's updates are routed here (the process is shared)
+        client.subscribe(stored_session_id, _on_update)
 
         # Build prompt parts
         parts: List[Dict[str, Any]] = []
@@ -479,80 +537,85 @@ class QwenCLI(BaseCLI):
         prompt_task = _make_prompt_task()
 
         # Stream notifications until prompt completes
-        while True:
-            done, pending = await asyncio.wait(
-                {prompt_task, asyncio.create_task(q.get())},
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            if prompt_task in done:
-                ui.debug(f"[{turn_id}] prompt_task completed; draining updates", "Qwen")
-                # Flush remaining updates quickly
-                while not q.empty():
-                    update = q.get_nowait()
+        update_task: Optional[asyncio.Task] = None
+        try:
+            while True:
+                if update_task is None:
+                    update_task = asyncio.create_task(q.get())
+                done, _ = await asyncio.wait({prompt_task, update_task}, return_when=asyncio.FIRST_COMPLETED)
+                # Handle an update that arrived with the prompt response before draining
+                if update_task in done:
+                    update = update_task.result()
+                    update_task = None
                     async for m in self._update_to_messages(update, project_path, session_id, thought_buffer, text_buffer):
                         if m:
                             yield m
-                # Handle prompt exception (e.g., session not found) with one retry
-                exc = prompt_task.exception()
-                if exc:
-                    msg = str(exc)
-                    if "Session not found" in msg or "session not found" in msg.lower():
-                        ui.warning("Qwen session expired; creating a new session and retrying", "Qwen")
-                        try:
-                            result = await client.request(
-                                "session/new", {"cwd": project_repo_path, "mcpServers": []}
-                            )
-                            stored_session_id = result.get("sessionId")
-                            if stored_session_id:
-                                await self.set_session_id(project_id, stored_session_id)
-                                prompt_task = _make_prompt_task()
-                                continue  # re-enter wait loop
-                        except Exception as e2:
+                if prompt_task in done:
+                    ui.debug(f"[{turn_id}] prompt_task completed; draining updates", "Qwen")
+                    # Flush remaining updates quickly
+                    while not q.empty():
+                        update = q.get_nowait()
+                        async for m in self._update_to_messages(update, project_path, session_id, thought_buffer, text_buffer):
+                            if m:
+                                yield m
+                    # Handle prompt exception (e.g., session not found) with one retry
+                    exc = prompt_task.exception()
+                    if exc:
+                        msg = str(exc)
+                        if "Session not found" in msg or "session not found" in msg.lower():
+                            ui.warning("Qwen session expired; creating a new session and retrying", "Qwen")
+                            try:
+                                result = await client.request(
+                                    "session/new", {"cwd": project_repo_path, "mcpServers": []}
+                                )
+                                client.unsubscribe(stored_session_id, _on_update)
+                                stored_session_id = result.get("sessionId")
+                                if stored_session_id:
+                                    client.subscribe(stored_session_id, _on_update)
+                                    await self.set_session_id(project_id, stored_session_id)
+                                    prompt_task = _make_prompt_task()
+                                    continue  # re-enter wait loop
+                            except Exception as e2:
+                                yield Message(
+                                    id=str(uuid.uuid4()),
+                                    project_id=project_path,
+                                    role="assistant",
+                                    message_type="error",
+                                    content=f"Qwen session recovery failed: {e2}",
+                                    metadata_json={"cli_type": self.cli_type.value},
+                                    session_id=session_id,
+                                    created_at=datetime.utcnow(),
+                                )
+                        else:
                             yield Message(
                                 id=str(uuid.uuid4()),
                                 project_id=project_path,
                                 role="assistant",
                                 message_type="error",
-                                content=f"Qwen session recovery failed: {e2}",
+                                content=f"Qwen prompt error: {msg}",
                                 metadata_json={"cli_type": self.cli_type.value},
                                 session_id=session_id,
                                 created_at=datetime.utcnow(),
                             )
-                    else:
+                    # Final flush of buffered assistant text
+                    if thought_buffer or text_buffer:
                         yield Message(
                             id=str(uuid.uuid4()),
                             project_id=project_path,
                             role="assistant",
-                            message_type="error",
-                            content=f"Qwen prompt error: {msg}",
+                            message_type="chat",
+                            content=self._compose_content(thought_buffer, text_buffer),
                             metadata_json={"cli_type": self.cli_type.value},
                             session_id=session_id,
                             created_at=datetime.utcnow(),
                         )
-                # Final flush of buffered assistant text
-                if thought_buffer or text_buffer:
-                    yield Message(
-                        id=str(uuid.uuid4()),
-                        project_id=project_path,
-                        role="assistant",
-                        message_type="chat",
-                        content=self._compose_content(thought_buffer, text_buffer),
-                        metadata_json={"cli_type": self.cli_type.value},
-                        session_id=session_id,
-                        created_at=datetime.utcnow(),
-                    )
-                    thought_buffer.clear()
-                    text_buffer.clear()
-                break
-
-            # Process one update
-            for task in done:
-                if task is not prompt_task:
-                    update = task.result()
-                    # Suppress verbose per-chunk logs; log only tool calls below
-                    async for m in self._update_to_messages(update, project_path, session_id, thought_buffer, text_buffer):
-                        if m:
-                            yield m
+                        thought_buffer.clear()
+                        text_buffer.clear()
+                    break
+        finally:
+            if update_task is not None:
+                update_task.cancel()
+            client.unsubscribe(stored_session_id, _on_update)
 
         # Yield hidden result/system message for bookkeeping
         yield Message(
@@ -587,6 +650,11 @@ class QwenCLI(BaseCLI):
                 text_buffer.append(text)
             # Do not flush here: we flush only before tool events or at end,
             # to match result_qwen.md behavior (message → tools → message ...)
+            # The UI still gets live text through coalesced deltas.
+            if text:
+                yield self.stream_delta(
+                    text, "thought" if kind == "agent_thought_chunk" else "text", project_path, session_id
+                )
             return
         elif kind in ("tool_call", "tool_call_update"):
             # Qwen emits frequent tool_call_update events and opaque call IDs
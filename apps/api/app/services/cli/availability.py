@@ -0,0 +1,133 @@
+"""
+Cached CLI availability probing.
+
+`check_availability()` spawns a shell per provider (`claude --version`,
+`gemini --help`, ...). Results are cached per CLI type with a TTL; stale
+entries are served immediately while a refresh runs in the background, and
+concurrent callers share a single in-flight probe.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+from .base import BaseCLI, CLIType
+
+
+class CLIAvailabilityCache:
+    """TTL cache in front of adapter `check_availability()` calls"""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+    ):
+        self.ttl = ttl if ttl is not None else settings.cli_status_ttl
+        # Unavailable results expire sooner so a fresh install shows up quickly
+        self.negative_ttl = negative_ttl if negative_ttl is not None else settings.cli_status_negative_ttl
+        self._entries: Dict[CLIType, Tuple[Dict[str, Any], float]] = {}
+        self._inflight: Dict[CLIType, asyncio.Task] = {}
+        self._adapters: Dict[CLIType, BaseCLI] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _adapter(self, cli_type: CLIType) -> BaseCLI:
+        adapter = self._adapters.get(cli_type)
+        if adapter is None:
+            from .adapters import ClaudeCodeCLI, CursorAgentCLI, CodexCLI, QwenCLI, GeminiCLI
+
+            factories = {
+                CLIType.CLAUDE: ClaudeCodeCLI,
+                CLIType.CURSOR: CursorAgentCLI,
+                CLIType.CODEX: CodexCLI,
+                CLIType.QWEN: QwenCLI,
+                CLIType.GEMINI: GeminiCLI,
+            }
+            adapter = self._adapters[cli_type] = factories[cli_type]()
+        return adapter
+
+    def _is_fresh(self, status: Dict[str, Any], checked_at: float) -> bool:
+        ok = status.get("available") and status.get("configured")
+        ttl = self.ttl if ok else self.negative_ttl
+        return time.monotonic() - checked_at < ttl
+
+    def _probe(self, cli_type: CLIType, adapter: Optional[BaseCLI] = None) -> asyncio.Task:
+        task = self._inflight.get(cli_type)
+        if task is not None and not task.done():
+            return task
+
+        async def _run() -> Dict[str, Any]:
+            try:
+                status = await (adapter or self._adapter(cli_type)).check_availability()
+            except Exception as e:
+                status = {"available": False, "configured": False, "error": str(e)}
+            self._entries[cli_type] = (status, time.monotonic())
+            return status
+
+        task = asyncio.create_task(_run())
+        self._inflight[cli_type] = task
+        task.add_done_callback(lambda _t: self._inflight.pop(cli_type, None))
+        return task
+
+    async def get(
+        self,
+        cli_type: CLIType,
+        adapter: Optional[BaseCLI] = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """Return availability for one CLI. The returned dict is a copy."""
+        cached = self._entries.get(cli_type)
+        if cached and not force:
+            status, checked_at = cached
+            if not self._is_fresh(status, checked_at):
+                # Stale-while-revalidate
+                self._probe(cli_type, adapter)
+            return dict(status)
+
+        return dict(await asyncio.shield(self._probe(cli_type, adapter)))
+
+    async def get_all(
+        self,
+        cli_types: Optional[Iterable[CLIType]] = None,
+        force: bool = False,
+    ) -> Dict[CLIType, Dict[str, Any]]:
+        """Probe several CLIs concurrently"""
+        types = list(cli_types or CLIType)
+        results = await asyncio.gather(*(self.get(t, force=force) for t in types))
+        return dict(zip(types, results))
+
+    def invalidate(self, cli_type: Optional[CLIType] = None) -> None:
+        """Drop cached results (all CLIs when `cli_type` is None)"""
+        if cli_type is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(cli_type, None)
+
+    def start_background_refresh(self, interval: Optional[float] = None) -> None:
+        """Keep entries warm so status endpoints never wait on a probe"""
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        interval = interval or settings.cli_status_refresh_interval
+
+        async def _loop() -> None:
+            while True:
+                try:
+                    await self.get_all(force=True)
+                except Exception as e:
+                    ui.debug(f"CLI availability refresh failed: {e}", "CLI")
+                await asyncio.sleep(interval)
+
+        self._refresh_task = asyncio.create_task(_loop())
+
+    async def stop_background_refresh(self) -> None:
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+
+# Global availability cache
+cli_availability = CLIAvailabilityCache()
@@ -6,15 +6,25 @@ helpers so that adding a new provider remains consistent and easy.
 """
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import uuid
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, List, Optional
 
 from app.models.messages import Message
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 
 def get_project_root() -> str:
     """Return project root directory using relative path navigation.
@@ -102,6 +112,98 @@ MODEL_MAPPING: Dict[str, Dict[str, str]] = {
 }
 
 
+# ---- Streaming JSONL decoding --------------------------------------------
+#
+# Agent CLIs emit one JSON object per line. Reading them with
+# StreamReader.readline() fails on lines longer than the reader limit (64KB
+# by default, easily exceeded by a file diff or tool output), so adapters read
+# large chunks and split lines themselves through the stage below.
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+
+def decode_json(data: bytes | str) -> Any:
+    """json.loads, through orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass
+class StreamEvent:
+    """One decoded line of agent output.
+
+    `type` is the adapter's dispatch key (see `event_type` of iter_stream_events);
+    undecodable lines arrive with type "parse_error", the raw text and the error.
+    """
+
+    type: Optional[str]
+    data: Any
+    raw: Optional[str] = None
+    error: Optional[str] = None
+
+
+class JSONLDecoder:
+    """Incremental bytes -> JSON decoder without a line length limit"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[StreamEvent]:
+        """Decode every complete line in `chunk` (plus what was buffered before)"""
+        self._buffer += chunk
+        end = self._buffer.rfind(b"\n")
+        if end < 0:
+            return []
+        complete = bytes(self._buffer[:end])
+        del self._buffer[:end + 1]
+        return [event for event in map(self._decode, complete.split(b"\n")) if event is not None]
+
+    def flush(self) -> List[StreamEvent]:
+        """Decode a final line that was not newline-terminated"""
+        rest, self._buffer = bytes(self._buffer), bytearray()
+        event = self._decode(rest)
+        return [event] if event is not None else []
+
+    @staticmethod
+    def _decode(line: bytes) -> Optional[StreamEvent]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return StreamEvent(type=None, data=decode_json(line))
+        except ValueError as e:  # json.JSONDecodeError and orjson.JSONDecodeError
+            return StreamEvent(
+                type="parse_error", data=None, raw=line.decode("utf-8", errors="replace"), error=str(e)
+            )
+
+
+def default_event_type(data: Any) -> Optional[str]:
+    return data.get("type") if isinstance(data, dict) else None
+
+
+async def iter_stream_events(
+    stream: asyncio.StreamReader,
+    event_type: Callable[[Any], Optional[str]] = default_event_type,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[StreamEvent]:
+    """Typed events from a JSONL stream until EOF.
+
+    Safe on long-lived processes: it only reads what is available, so callers
+    can stop iterating (e.g. on a completion event) without waiting for EOF.
+    """
+    decoder = JSONLDecoder()
+    while True:
+        chunk = await stream.read(chunk_size)
+        events = decoder.feed(chunk) if chunk else decoder.flush()
+        for event in events:
+            if event.type is None:
+                event.type = event_type(event.data)
+            yield event
+        if not chunk:
+            return
+
+
 class CLIType(str, Enum):
     """Provider key used across the manager and adapters."""
 
@@ -223,6 +325,24 @@ class BaseCLI(ABC):
             created_at=datetime.utcnow(),
         )
 
+    def stream_delta(
+        self, text: str, channel: str, project_path: str, session_id: Optional[str]
+    ) -> Message:
+        """Ephemeral text/thought delta: coalesced onto the WebSocket, never persisted.
+
+        The consolidated message the adapter flushes later is the durable copy.
+        """
+        return Message(
+            id=str(uuid.uuid4()),
+            project_id=project_path,
+            role="assistant",
+            message_type="chat",
+            content=text,
+            metadata_json={"cli_type": self.cli_type.value, "stream_delta": True, "channel": channel},
+            session_id=session_id,
+            created_at=datetime.utcnow(),
+        )
+
     def _normalize_role(self, role: str) -> str:
         role_mapping = {
             "model": "assistant",
@@ -10,7 +10,10 @@ from typing import Any, Dict, List, Optional
 from app.core.terminal_ui import ui
 from app.core.websocket.manager import manager as ws_manager
 from app.models.messages import Message
+from app.services.delta_coalescer import DeltaCoalescer
+from app.services.message_writer import MessageWriter
 
+from .availability import cli_availability
 from .base import CLIType
 from .adapters import ClaudeCodeCLI, CursorAgentCLI, CodexCLI, QwenCLI, GeminiCLI
 
@@ -58,7 +61,7 @@ class UnifiedCLIManager:
             ui.warning("Fallback CLI Claude not configured", "CLI")
             return None
 
-        status = await fallback_cli.check_availability()
+        status = await cli_availability.get(fallback_type, fallback_cli)
         if not status.get("available") or not status.get("configured"):
             ui.error(
                 f"Fallback CLI {fallback_type.value} unavailable: {status.get('error', 'unknown error')}",
@@ -100,8 +103,8 @@ class UnifiedCLIManager:
         if cli_type in self.cli_adapters:
             cli = self.cli_adapters[cli_type]
 
-            # Check if CLI is available
-            status = await cli.check_availability()
+            # Check if CLI is available (cached; probes run in the background)
+            status = await cli_availability.get(cli_type, cli)
             if status.get("available") and status.get("configured"):
                 try:
                     return await self._execute_with_cli(
@@ -109,6 +112,8 @@ class UnifiedCLIManager:
                     )
                 except Exception as e:
                     ui.error(f"CLI {cli_type.value} failed: {e}", "CLI")
+                    # The cached status may be outdated (e.g. CLI uninstalled)
+                    cli_availability.invalidate(cli_type)
                     if fallback_enabled:
                         fallback_result = await self._attempt_fallback(
                             cli_type, instruction, images, model, is_initial_prompt
@@ -175,107 +180,143 @@ class UnifiedCLIManager:
             # CLI output logs are now only printed to console, not sent to UI
             pass
 
-        async for message in cli.execute_with_streaming(
-            instruction=instruction,
-            project_path=self.project_path,
-            session_id=self.session_id,
-            log_callback=log_callback,
-            images=images,
-            model=model,
-            is_initial_prompt=is_initial_prompt,
-        ):
-            # Check for error messages or result status
-            if message.message_type == "error":
-                has_error = True
-                ui.error(f"CLI error detected: {message.content[:100]}", "CLI")
-
-            if message.metadata_json:
-                files = message.metadata_json.get("files_modified")
-                if isinstance(files, (list, tuple, set)):
-                    files_modified.update(str(f) for f in files)
-
-            # Check for Cursor result event (stored in metadata)
-            if message.metadata_json:
-                event_type = message.metadata_json.get("event_type")
-                original_event = message.metadata_json.get("original_event", {})
-
-                if event_type == "result" or original_event.get("type") == "result":
-                    # Cursor sends result event with success/error status
-                    is_error = original_event.get("is_error", False)
-                    subtype = original_event.get("subtype", "")
-
-                    # DEBUG: Log the complete result event structure
-                    ui.info(f"🔍 [Cursor] Result event received:", "DEBUG")
-                    ui.info(f"   Full event: {original_event}", "DEBUG")
-                    ui.info(f"   is_error: {is_error}", "DEBUG")
-                    ui.info(f"   subtype: '{subtype}'", "DEBUG")
-                    ui.info(f"   has event.result: {'result' in original_event}", "DEBUG")
-                    ui.info(f"   has event.status: {'status' in original_event}", "DEBUG")
-                    ui.info(f"   has event.success: {'success' in original_event}", "DEBUG")
-
-                    if is_error or subtype == "error":
-                        has_error = True
-                        result_success = False
-                        ui.error(
-                            f"Cursor result: error (is_error={is_error}, subtype='{subtype}')",
-                            "CLI",
-                        )
-                    elif subtype == "success":
-                        result_success = True
-                        ui.success(
-                            f"Cursor result: success (subtype='{subtype}')", "CLI"
-                        )
-                    else:
-                        # Handle case where subtype is not "success" but execution was successful
-                        ui.warning(
-                            f"Cursor result: no explicit success subtype (subtype='{subtype}', is_error={is_error})",
-                            "CLI",
-                        )
-                        # If there's no error indication, assume success
-                        if not is_error:
+        # Messages are persisted write-behind in batches by a writer thread;
+        # the final flush completes before this method returns
+        writer = MessageWriter(self.db.get_bind()).start()
+        # Live text deltas go to clients in coalesced frames, never to the DB
+        deltas = DeltaCoalescer(
+            lambda frame: ws_manager.send_message(self.project_id, frame), self.conversation_id
+        )
+        try:
+            async for message in cli.execute_with_streaming(
+                instruction=instruction,
+                project_path=self.project_path,
+                session_id=self.session_id,
+                log_callback=log_callback,
+                images=images,
+                model=model,
+                is_initial_prompt=is_initial_prompt,
+            ):
+                if DeltaCoalescer.is_delta(message):
+                    await deltas.add(message)
+                    continue
+                # Any regular message ends the live stream; the consolidated
+                # assistant message replaces the preview on the client
+                stream_id = await deltas.close()
+
+                # Check for error messages or result status
+                if message.message_type == "error":
+                    has_error = True
+                    ui.error(f"CLI error detected: {message.content[:100]}", "CLI")
+
+                if message.metadata_json:
+                    files = message.metadata_json.get("files_modified")
+                    if isinstance(files, (list, tuple, set)):
+                        files_modified.update(str(f) for f in files)
+
+                # Check for Cursor result event (stored in metadata)
+                if message.metadata_json:
+                    event_type = message.metadata_json.get("event_type")
+                    original_event = message.metadata_json.get("original_event", {})
+
+                    if event_type == "result" or original_event.get("type") == "result":
+                        # Cursor sends result event with success/error status
+                        is_error = original_event.get("is_error", False)
+                        subtype = original_event.get("subtype", "")
+
+                        # DEBUG: Log the complete result event structure
+                        ui.info(f"🔍 [Cursor] Result event received:", "DEBUG")
+                        ui.info(f"   Full event: {original_event}", "DEBUG")
+                        ui.info(f"   is_error: {is_error}", "DEBUG")
+                        ui.info(f"   subtype: '{subtype}'", "DEBUG")
+                        ui.info(f"   has event.result: {'result' in original_event}", "DEBUG")
+                        ui.info(f"   has event.status: {'status' in original_event}", "DEBUG")
+                        ui.info(f"   has event.success: {'success' in original_event}", "DEBUG")
+
+                        if is_error or subtype == "error":
+                            has_error = True
+                            result_success = False
+                            ui.error(
+                                f"Cursor result: error (is_error={is_error}, subtype='{subtype}')",
+                                "CLI",
+                            )
+                        elif subtype == "success":
                             result_success = True
                             ui.success(
-                                f"Cursor result: assuming success (no error detected)", "CLI"
+                                f"Cursor result: success (subtype='{subtype}')", "CLI"
                             )
+                        else:
+                            # Handle case where subtype is not "success" but execution was successful
+                            ui.warning(
+                                f"Cursor result: no explicit success subtype (subtype='{subtype}', is_error={is_error})",
+                                "CLI",
+                            )
+                            # If there's no error indication, assume success
+                            if not is_error:
+                                result_success = True
+                                ui.success(
+                                    f"Cursor result: assuming success (no error detected)", "CLI"
+                                )
+
+                # Queue message for batched persistence (order is preserved)
+                message.project_id = self.project_id
+                message.conversation_id = self.conversation_id
+                writer.add(message)
+
+                messages_collected.append(message)
+
+                # Check if message should be hidden from UI
+                should_hide = (
+                    message.metadata_json and message.metadata_json.get("hidden_from_ui", False)
+                )
 
-            # Save message to database
-            message.project_id = self.project_id
-            message.conversation_id = self.conversation_id
-            self.db.add(message)
-            self.db.commit()
-
-            messages_collected.append(message)
-
-            # Check if message should be hidden from UI
-            should_hide = (
-                message.metadata_json and message.metadata_json.get("hidden_from_ui", False)
-            )
-
-            # Send message via WebSocket only if not hidden
-            if not should_hide:
-                ws_message = {
-                    "type": "message",
-                    "data": {
-                        "id": message.id,
-                        "role": message.role,
-                        "message_type": message.message_type,
-                        "content": message.content,
-                        "metadata": message.metadata_json,
-                        "parent_message_id": getattr(message, "parent_message_id", None),
-                        "session_id": message.session_id,
-                        "conversation_id": self.conversation_id,
-                        "created_at": message.created_at.isoformat(),
-                    },
-                    "timestamp": message.created_at.isoformat(),
-                }
-                try:
-                    await ws_manager.send_message(self.project_id, ws_message)
-                except Exception as e:
-                    ui.error(f"WebSocket send failed: {e}", "Message")
+                # Only a visible assistant chat message stands in for the preview
+                replaces_preview = bool(
+                    stream_id
+                    and not should_hide
+                    and message.role == "assistant"
+                    and message.message_type == "chat"
+                )
+                if stream_id and not replaces_preview:
+                    await deltas.end_preview(stream_id)
+
+                # Send message via WebSocket only if not hidden
+                if not should_hide:
+                    ws_message = {
+                        "type": "message",
+                        "data": {
+                            "id": message.id,
+                            "role": message.role,
+                            "message_type": message.message_type,
+                            "content": message.content,
+                            "metadata": message.metadata_json,
+                            "parent_message_id": getattr(message, "parent_message_id", None),
+                            "session_id": message.session_id,
+                            "conversation_id": self.conversation_id,
+                            "created_at": message.created_at.isoformat(),
+                            "stream_id": stream_id if replaces_preview else None,
+                        },
+                        "timestamp": message.created_at.isoformat(),
+                    }
+                    try:
+                        await ws_manager.send_message(self.project_id, ws_message)
+                    except Exception as e:
+                        ui.error(f"WebSocket send failed: {e}", "Message")
+
+                # Check if changes were made
+                if message.metadata_json and "changes_made" in message.metadata_json:
+                    has_changes = True
+        finally:
+            stream_id = await deltas.close()
+            if stream_id:
+                await deltas.end_preview(stream_id)
+            write_stats = await writer.close()
 
-            # Check if changes were made
-            if message.metadata_json and "changes_made" in message.metadata_json:
-                has_changes = True
+        ui.info(
+            f"Persisted {write_stats.rows} messages in {write_stats.batches} batches "
+            f"({write_stats.db_time_ms:.1f}ms DB write time)",
+            "CLI",
+        )
 
         # Determine final success status
         # For Cursor: check result_success if available, otherwise check has_error
@@ -310,16 +351,25 @@ class UnifiedCLIManager:
             "message": f"{'Successfully' if success else 'Failed to'} execute with {cli.cli_type.value}",
             "error": "Execution failed" if not success else None,
             "messages_count": len(messages_collected),
+            "db_write_ms": round(write_stats.db_time_ms, 1),
+            "db_write_batches": write_stats.batches,
+            "stream_deltas": deltas.deltas,
+            "stream_frames": deltas.frames,
         }
 
         # End _execute_with_cli
 
     async def check_cli_status(
-        self, cli_type: CLIType, selected_model: Optional[str] = None
+        self,
+        cli_type: CLIType,
+        selected_model: Optional[str] = None,
+        force_refresh: bool = False,
     ) -> Dict[str, Any]:
         """Check status of a specific CLI"""
         if cli_type in self.cli_adapters:
-            status = await self.cli_adapters[cli_type].check_availability()
+            status = await cli_availability.get(
+                cli_type, self.cli_adapters[cli_type], force=force_refresh
+            )
 
             # Add model validation if model is specified
             if selected_model and status.get("available"):
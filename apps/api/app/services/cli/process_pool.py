@@ -0,0 +1,270 @@
+"""
+Pool of warm, long-lived CLI agent processes.
+
+Adapters that speak a stdio protocol (ACP for Qwen/Gemini, `codex proto`)
+pay several seconds of Node/CLI startup per spawn. The pool keeps those
+processes around per key (typically ``(cli_type, project/workdir, ...)``):
+
+- shared handles serve every caller (ACP multiplexes sessions over one process)
+- exclusive handles are checked out for a single run; a fresh standby can be
+  pre-warmed in the background so the next run skips startup entirely
+
+Handles are evicted LRU when the pool is full, closed after an idle timeout,
+and health-checked (process still alive) before being handed out.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+
+PoolKey = Hashable
+HandleFactory = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class _PoolEntry:
+    key: PoolKey
+    handle: Any
+    shared: bool
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    in_use: bool = False
+
+
+def _is_alive(handle: Any) -> bool:
+    try:
+        return bool(handle.is_alive())
+    except Exception:
+        return False
+
+
+def _is_busy(handle: Any) -> bool:
+    is_busy = getattr(handle, "is_busy", None)
+    try:
+        return bool(is_busy()) if is_busy else False
+    except Exception:
+        return False
+
+
+async def _close(handle: Any) -> None:
+    try:
+        await handle.close()
+    except Exception as e:
+        ui.debug(f"Failed to close pooled process: {e}", "CLI Pool")
+
+
+class CLIProcessPool:
+    """Keyed pool of agent process handles.
+
+    A handle is any object exposing ``is_alive() -> bool`` and
+    ``async close()``; an optional ``is_busy() -> bool`` keeps shared handles
+    with in-flight requests from being evicted.
+    """
+
+    def __init__(
+        self,
+        max_processes: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.max_processes = max_processes or settings.cli_pool_max_processes
+        self.idle_timeout = idle_timeout or settings.cli_pool_idle_timeout
+        self._entries: Dict[PoolKey, List[_PoolEntry]] = {}
+        self._warming: Dict[PoolKey, asyncio.Task] = {}
+        self._locks: Dict[PoolKey, asyncio.Lock] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+        self.spawned = 0
+        self.reused = 0
+
+    # ---- public API ------------------------------------------------------
+
+    async def get_shared(self, key: PoolKey, factory: HandleFactory) -> Any:
+        """Return the live shared handle for ``key``, spawning it if needed."""
+        self._ensure_reaper()
+        async with self._lock_for(key):
+            for entry in self._entries.get(key, []):
+                if not entry.shared:
+                    continue
+                if _is_alive(entry.handle):
+                    entry.last_used = time.monotonic()
+                    self.reused += 1
+                    return entry.handle
+                ui.warning(f"Pooled process for {key} died, respawning", "CLI Pool")
+                await self._remove(entry)
+                break
+
+            await self._make_room()
+            handle = await factory()
+            self.spawned += 1
+            self._entries.setdefault(key, []).append(_PoolEntry(key, handle, shared=True))
+            return handle
+
+    async def acquire(self, key: PoolKey, factory: HandleFactory) -> Any:
+        """Check out an exclusive handle, preferring a pre-warmed standby."""
+        self._ensure_reaper()
+        warming = self._warming.get(key)
+        if warming is not None:
+            try:
+                await asyncio.shield(warming)
+            except Exception:
+                pass
+
+        async with self._lock_for(key):
+            for entry in list(self._entries.get(key, [])):
+                if entry.shared or entry.in_use:
+                    continue
+                if not _is_alive(entry.handle):
+                    await self._remove(entry)
+                    continue
+                entry.in_use = True
+                entry.last_used = time.monotonic()
+                self.reused += 1
+                return entry.handle
+
+            await self._make_room()
+            handle = await factory()
+            self.spawned += 1
+            self._entries.setdefault(key, []).append(
+                _PoolEntry(key, handle, shared=False, in_use=True)
+            )
+            return handle
+
+    async def release(self, key: PoolKey, handle: Any, reuse: bool = True) -> None:
+        """Return an exclusive handle. Dead or non-reusable handles are closed."""
+        entry = self._find(key, handle)
+        if entry is None:
+            await _close(handle)
+            return
+        entry.in_use = False
+        entry.last_used = time.monotonic()
+        if not reuse or not _is_alive(handle):
+            await self._remove(entry)
+
+    def prewarm(self, key: PoolKey, factory: HandleFactory) -> None:
+        """Spawn an idle standby for ``key`` in the background (no-op if one exists)."""
+        if not settings.cli_pool_prewarm or key in self._warming:
+            return
+        if any(
+            not e.shared and not e.in_use and _is_alive(e.handle)
+            for e in self._entries.get(key, [])
+        ):
+            return
+
+        async def _warm() -> None:
+            try:
+                async with self._lock_for(key):
+                    await self._make_room()
+                    handle = await factory()
+                    self.spawned += 1
+                    self._entries.setdefault(key, []).append(
+                        _PoolEntry(key, handle, shared=False)
+                    )
+                ui.debug(f"Pre-warmed standby process for {key}", "CLI Pool")
+            except Exception as e:
+                ui.warning(f"Pre-warm failed for {key}: {e}", "CLI Pool")
+            finally:
+                self._warming.pop(key, None)
+
+        self._ensure_reaper()
+        self._warming[key] = asyncio.create_task(_warm())
+
+    async def discard(self, key: PoolKey) -> None:
+        """Close every idle handle registered under ``key``."""
+        for entry in list(self._entries.get(key, [])):
+            if not entry.in_use:
+                await self._remove(entry)
+
+    async def close_all(self) -> None:
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+        for task in list(self._warming.values()):
+            task.cancel()
+        self._warming.clear()
+        for entries in list(self._entries.values()):
+            for entry in list(entries):
+                await self._remove(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = [e for group in self._entries.values() for e in group]
+        return {
+            "processes": len(entries),
+            "in_use": sum(1 for e in entries if e.in_use or _is_busy(e.handle)),
+            "warming": len(self._warming),
+            "spawned": self.spawned,
+            "reused": self.reused,
+            "max_processes": self.max_processes,
+        }
+
+    # ---- internals -------------------------------------------------------
+
+    def _lock_for(self, key: PoolKey) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def _find(self, key: PoolKey, handle: Any) -> Optional[_PoolEntry]:
+        for entry in self._entries.get(key, []):
+            if entry.handle is handle:
+                return entry
+        return None
+
+    def _evictable(self, entry: _PoolEntry) -> bool:
+        return not entry.in_use and not _is_busy(entry.handle)
+
+    async def _remove(self, entry: _PoolEntry) -> None:
+        group = self._entries.get(entry.key, [])
+        if entry in group:
+            group.remove(entry)
+        if not group:
+            self._entries.pop(entry.key, None)
+        await _close(entry.handle)
+
+    async def _make_room(self) -> None:
+        """Evict least recently used idle handles until there is a free slot."""
+        while True:
+            entries = [e for group in self._entries.values() for e in group]
+            if len(entries) < self.max_processes:
+                return
+            candidates = [e for e in entries if self._evictable(e)]
+            if not candidates:
+                ui.warning(
+                    f"CLI process pool is full ({len(entries)} busy processes), spawning beyond limit",
+                    "CLI Pool",
+                )
+                return
+            victim = min(candidates, key=lambda e: e.last_used)
+            ui.debug(f"Evicting LRU pooled process for {victim.key}", "CLI Pool")
+            await self._remove(victim)
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper())
+
+    async def _reaper(self) -> None:
+        """Periodically close idle and dead handles."""
+        interval = max(5.0, min(60.0, self.idle_timeout / 4))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for entries in list(self._entries.values()):
+                for entry in list(entries):
+                    if entry.in_use:
+                        continue
+                    if not _is_alive(entry.handle):
+                        await self._remove(entry)
+                    elif _is_busy(entry.handle):
+                        entry.last_used = now
+                    elif now - entry.last_used > self.idle_timeout:
+                        ui.debug(f"Closing idle pooled process for {entry.key}", "CLI Pool")
+                        await self._remove(entry)
+
+
+# Global pool shared by all adapters
+cli_process_pool = CLIProcessPool()
@@ -0,0 +1,172 @@
+"""
+Commit history cache.
+
+Commit metadata never changes for a given SHA, so the history walked from a
+HEAD can be kept and paged through without re-running `git log`. Each repo's
+cache is keyed by the HEAD it was walked from: a different HEAD (new commit,
+reset, checkout) discards it, and git_ops invalidates it explicitly after
+its own writes. The walk is lazy, so page N only reads as far as page N.
+
+Path-filtered history is one `git log -- <path>` per (HEAD, path); the
+commits it returns are resolved through the same metadata cache.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.git_backend import GitError, git_backends
+
+
+class CursorError(ValueError):
+    """The pagination cursor is not part of the current history"""
+
+
+class _RepoHistory:
+    def __init__(self, head: Optional[str]):
+        self.head = head
+        self.commits: List[dict] = []
+        self.positions: Dict[str, int] = {}
+        self.walker: Optional[Iterator[dict]] = None
+        self.exhausted = head is None
+        self.paths: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def extend_to(self, repo_path: str, count: int) -> None:
+        """Walk until `count` commits are cached (or history ends)"""
+        if self.exhausted or len(self.commits) >= count:
+            return
+        if self.walker is None:
+            self.walker = git_backends.get(repo_path).walk(self.head)
+        for commit in self.walker:
+            self.positions[commit["commit_sha"]] = len(self.commits)
+            self.commits.append(commit)
+            if len(self.commits) >= count:
+                return
+        self.exhausted = True
+        self.walker = None
+
+    def find(self, repo_path: str, sha: str) -> int:
+        """Position of `sha` in history, walking further if needed"""
+        if sha not in self.positions and not self.exhausted:
+            # Only walk on for SHAs that name a commit at all
+            try:
+                git_backends.get(repo_path).commit(sha)
+            except GitError:
+                raise CursorError(f"Unknown cursor: {sha}")
+        step = max(settings.commit_page_max_limit, 50)
+        while sha not in self.positions and not self.exhausted:
+            self.extend_to(repo_path, len(self.commits) + step)
+        if sha not in self.positions:
+            raise CursorError(f"Unknown cursor: {sha}")
+        return self.positions[sha]
+
+    def close(self) -> None:
+        if self.walker is not None and hasattr(self.walker, "close"):
+            self.walker.close()
+        self.walker = None
+
+
+def _public(commit: dict) -> dict:
+    return {k: v for k, v in commit.items() if not k.startswith("_")}
+
+
+class CommitHistoryCache:
+    """Per-repo commit metadata, LRU-bounded"""
+
+    def __init__(self, max_repos: Optional[int] = None):
+        self.max_repos = max_repos or settings.commit_history_max_repos
+        self._repos: "OrderedDict[str, _RepoHistory]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _history(self, repo_path: str) -> _RepoHistory:
+        key = os.path.abspath(repo_path)
+        try:
+            head: Optional[str] = git_backends.get(key).head()
+        except (GitError, OSError):
+            head = None  # unborn HEAD: empty history
+        with self._lock:
+            history = self._repos.get(key)
+            if history is not None and history.head == head:
+                self._repos.move_to_end(key)
+                self.hits += 1
+                return history
+            self.misses += 1
+            if history is not None:
+                history.close()
+            history = self._repos[key] = _RepoHistory(head)
+            while len(self._repos) > self.max_repos:
+                _key, evicted = self._repos.popitem(last=False)
+                evicted.close()
+            return history
+
+    def page(
+        self,
+        repo_path: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """One page of history after `cursor` (a commit SHA), plus the next cursor"""
+        history = self._history(repo_path)
+        with history.lock:
+            if path:
+                return self._path_page(repo_path, history, path, limit, cursor)
+            start = history.find(repo_path, cursor) + 1 if cursor else 0
+            history.extend_to(repo_path, start + limit + 1)
+            page = history.commits[start:start + limit]
+            has_more = len(history.commits) > start + limit
+        next_cursor = page[-1]["commit_sha"] if page and has_more else None
+        return [_public(c) for c in page], next_cursor
+
+    def _path_page(
+        self, repo_path: str, history: _RepoHistory, path: str, limit: int, cursor: Optional[str]
+    ) -> Tuple[List[dict], Optional[str]]:
+        shas = history.paths.get(path)
+        if shas is None:
+            shas = git_backends.get(repo_path).path_history(path, history.head) if history.head else []
+            history.paths[path] = shas
+            while len(history.paths) > settings.commit_history_max_paths:
+                history.paths.popitem(last=False)
+        else:
+            history.paths.move_to_end(path)
+
+        start = 0
+        if cursor:
+            try:
+                start = shas.index(cursor) + 1
+            except ValueError:
+                raise CursorError(f"Unknown cursor: {cursor}")
+        selected = shas[start:start + limit]
+
+        backend = git_backends.get(repo_path)
+        page = []
+        for sha in selected:
+            position = history.positions.get(sha)
+            page.append(_public(history.commits[position] if position is not None else backend.commit(sha)))
+        next_cursor = selected[-1] if selected and len(shas) > start + limit else None
+        return page, next_cursor
+
+    def invalidate(self, repo_path: str) -> None:
+        with self._lock:
+            history = self._repos.pop(os.path.abspath(repo_path), None)
+        if history is not None:
+            history.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "repos": len(self._repos),
+                "cached_commits": sum(len(h.commits) for h in self._repos.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Global history cache
+commit_history = CommitHistoryCache()
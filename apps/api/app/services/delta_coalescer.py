@@ -0,0 +1,116 @@
+"""
+Coalescing of streamed assistant text for WebSocket clients.
+
+ACP adapters (Gemini, Qwen) receive assistant text and thoughts as many tiny
+`session/update` chunks but only persist a consolidated message before tool
+calls and at the end of a turn. The chunks they yield as `stream_delta`
+messages are merged here into `message_delta` frames, sent at most once per
+interval or when a size bound is reached, so the UI shows text as it arrives
+without one frame and one re-render per token. Deltas are never persisted.
+
+A stream is the run of deltas between two regular messages; its id is put on
+the consolidated message that ends it so clients can swap the live preview
+for the stored message. A stream ended by a hidden message (or by the end of
+the run) gets a final `done` frame instead, and the preview stays as is.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+from app.models.messages import Message
+
+
+class DeltaCoalescer:
+    """Merges consecutive text/thought deltas into time- and size-bounded frames"""
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+        conversation_id: Optional[str] = None,
+        interval_ms: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ):
+        self._send = send
+        self.conversation_id = conversation_id
+        self.interval = (interval_ms if interval_ms is not None else settings.stream_delta_interval_ms) / 1000
+        self.max_chars = max_chars or settings.stream_delta_max_chars
+        self.stream_id: Optional[str] = None
+        self._seq = 0
+        self._pending: Dict[str, List[str]] = {}
+        self._pending_chars = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_task: Optional[asyncio.Task] = None
+        self.deltas = 0
+        self.frames = 0
+
+    @staticmethod
+    def is_delta(message: Message) -> bool:
+        return bool(message.metadata_json and message.metadata_json.get("stream_delta"))
+
+    async def add(self, message: Message) -> None:
+        """Buffer one delta; flushes when the frame is full, otherwise arms the timer"""
+        if self.stream_id is None:
+            self.stream_id = str(uuid.uuid4())
+            self._seq = 0
+        channel = (message.metadata_json or {}).get("channel", "text")
+        self._pending.setdefault(channel, []).append(message.content or "")
+        self._pending_chars += len(message.content or "")
+        self.deltas += 1
+        if self._pending_chars >= self.max_chars:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._timer_task = asyncio.ensure_future(self.flush())
+
+    async def flush(self) -> None:
+        """Send buffered deltas as one `message_delta` frame"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self.stream_id is None:
+            return
+        # Swap before awaiting so a concurrent timer flush cannot resend
+        pending, self._pending, self._pending_chars = self._pending, {}, 0
+        now = datetime.utcnow().isoformat()
+        frame = {
+            "type": "message_delta",
+            "data": {
+                "stream_id": self.stream_id,
+                "seq": self._seq,
+                "text": "".join(pending.get("text", [])),
+                "thought": "".join(pending.get("thought", [])),
+                "conversation_id": self.conversation_id,
+            },
+            "timestamp": now,
+        }
+        self._seq += 1
+        await self._emit(frame)
+
+    async def _emit(self, frame: Dict[str, Any]) -> None:
+        self.frames += 1
+        try:
+            await self._send(frame)
+        except Exception as e:
+            ui.error(f"WebSocket delta send failed: {e}", "Message")
+
+    async def close(self) -> Optional[str]:
+        """Flush and end the current stream; returns its id (None if none was open)"""
+        await self.flush()
+        stream_id, self.stream_id = self.stream_id, None
+        return stream_id
+
+    async def end_preview(self, stream_id: str) -> None:
+        """Tell clients a closed stream gets no consolidated message to replace it"""
+        await self._emit({
+            "type": "message_delta",
+            "data": {"stream_id": stream_id, "done": True, "conversation_id": self.conversation_id},
+            "timestamp": datetime.utcnow().isoformat(),
+        })
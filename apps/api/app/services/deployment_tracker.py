@@ -0,0 +1,286 @@
+"""
+Shared Vercel deployment status tracker.
+
+Replaces one polling task per project (fixed 3s interval, one DB session per
+tick) with a single loop for all in-flight deployments:
+
+- every tick polls the deployments that are due, concurrently over the
+  pooled Vercel client, deduplicated by deployment id;
+- each deployment backs off while its state is unchanged (x1.5 up to
+  DEPLOY_POLL_MAX_INTERVAL) and goes back to the short interval after a
+  transition; failures back off faster;
+- the DB is written only on state transitions, all transitions of a tick
+  in one session and one commit; a transition counts as seen only once
+  committed, so a failed write is retried on the next poll;
+- Vercel webhooks (POST /api/vercel/webhook, when VERCEL_WEBHOOK_SECRET is
+  set) push transitions immediately; polling then only runs as a slow
+  safety net.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+
+TERMINAL_STATES = {"READY", "ERROR", "CANCELED"}
+
+# Vercel webhook event type -> deployment readyState
+WEBHOOK_STATES = {
+    "deployment.created": "QUEUED",
+    "deployment.building": "BUILDING",
+    "deployment.succeeded": "READY",
+    "deployment.ready": "READY",
+    "deployment.error": "ERROR",
+    "deployment.canceled": "CANCELED",
+}
+
+
+@dataclass
+class _Tracked:
+    project_id: str
+    deployment_id: str
+    token: str
+    session_factory: Callable[[], Any]
+    status: Optional[str] = None
+    url: Optional[str] = None
+    interval: float = 0.0
+    next_poll_at: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+    last_checked_at: Optional[str] = None
+    failures: int = 0
+
+
+@dataclass
+class TrackerStats:
+    polls: int = 0
+    transitions: int = 0
+    db_commits: int = 0
+    webhook_events: int = 0
+
+
+class DeploymentTracker:
+    """Polls and records the status of all in-flight Vercel deployments"""
+
+    MAX_FAILURES = 10
+
+    def __init__(self):
+        self._tracked: Dict[str, _Tracked] = {}  # project_id -> deployment
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = TrackerStats()
+
+    @property
+    def webhooks_enabled(self) -> bool:
+        return bool(settings.vercel_webhook_secret)
+
+    def _base_interval(self) -> float:
+        # With webhooks, polling is only a fallback for missed deliveries
+        return settings.deploy_poll_max_interval if self.webhooks_enabled else settings.deploy_poll_interval
+
+    # Registration -----------------------------------------------------
+
+    def track(
+        self,
+        project_id: str,
+        deployment_id: str,
+        token: str,
+        session_factory: Callable[[], Any],
+        status: Optional[str] = None,
+    ) -> None:
+        """Follow a deployment until it is READY/ERROR/CANCELED (replaces the project's previous one)"""
+        interval = self._base_interval()
+        self._tracked[project_id] = _Tracked(
+            project_id=project_id,
+            deployment_id=deployment_id,
+            token=token,
+            session_factory=session_factory,
+            status=status,
+            interval=interval,
+            next_poll_at=time.monotonic() + interval,
+        )
+        self._ensure_running()
+        self._wakeup.set()
+        ui.info(f"Tracking deployment {deployment_id} for project {project_id}", "Deploy")
+
+    def untrack(self, project_id: str) -> bool:
+        return self._tracked.pop(project_id, None) is not None
+
+    def projects(self) -> List[str]:
+        return list(self._tracked)
+
+    def snapshot(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """In-memory state of a tracked deployment (fresher than the DB between transitions)"""
+        tracked = self._tracked.get(project_id)
+        if tracked is None:
+            return None
+        return {
+            "deployment_id": tracked.deployment_id,
+            "status": tracked.status,
+            "deployment_url": tracked.url,
+            "last_checked_at": tracked.last_checked_at,
+        }
+
+    # Webhooks ---------------------------------------------------------
+
+    async def handle_webhook(self, event_type: str, deployment: Dict[str, Any]) -> bool:
+        """Apply a pushed deployment event; False if it is not for a tracked deployment"""
+        status = WEBHOOK_STATES.get(event_type)
+        deployment_id = deployment.get("id")
+        tracked = next((t for t in self._tracked.values() if t.deployment_id == deployment_id), None)
+        if status is None or tracked is None:
+            return False
+        self.stats.webhook_events += 1
+        status_data = {"id": deployment_id, "status": status, "url": deployment.get("url") or tracked.url}
+        await self._record([(tracked, status_data)])
+        return True
+
+    # Loop -------------------------------------------------------------
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            if not self._tracked:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            next_due = min(t.next_poll_at for t in self._tracked.values())
+            if next_due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._tick(now)
+            except Exception as e:
+                ui.error(f"Deployment tracker tick failed: {e}", "Deploy")
+                await asyncio.sleep(1)
+
+    async def _tick(self, now: float) -> None:
+        due: List[_Tracked] = []
+        for tracked in list(self._tracked.values()):
+            if now - tracked.started_at > settings.deploy_track_timeout:
+                ui.warning(f"Deployment {tracked.deployment_id} still not finished; giving up tracking", "Deploy")
+                self._tracked.pop(tracked.project_id, None)
+            elif tracked.next_poll_at <= now:
+                due.append(tracked)
+        if not due:
+            return
+
+        # Several projects may follow the same deployment: poll it once
+        by_deployment: Dict[str, List[_Tracked]] = {}
+        for tracked in due:
+            by_deployment.setdefault(tracked.deployment_id, []).append(tracked)
+        semaphore = asyncio.Semaphore(settings.deploy_poll_concurrency)
+
+        async def poll(group: List[_Tracked]) -> Optional[Dict[str, Any]]:
+            from app.services.vercel_service import VercelService
+
+            async with semaphore:
+                self.stats.polls += 1
+                try:
+                    return await VercelService(group[0].token).get_deployment_status(group[0].deployment_id)
+                except Exception as e:
+                    ui.warning(f"Deployment {group[0].deployment_id} status poll failed: {e}", "Deploy")
+                    return None
+
+        groups = list(by_deployment.values())
+        results = await asyncio.gather(*(poll(g) for g in groups))
+
+        checked_at = datetime.utcnow().isoformat() + "Z"
+        changes = []
+        for group, status_data in zip(groups, results):
+            for tracked in group:
+                if status_data is None:
+                    tracked.failures += 1
+                    if tracked.failures >= self.MAX_FAILURES:
+                        ui.error(f"Giving up on deployment {tracked.deployment_id} after repeated errors", "Deploy")
+                        self._tracked.pop(tracked.project_id, None)
+                        continue
+                    tracked.interval = min(tracked.interval * 2, settings.deploy_poll_max_interval)
+                else:
+                    tracked.failures = 0
+                    tracked.last_checked_at = checked_at
+                    if status_data.get("status") != tracked.status:
+                        changes.append((tracked, status_data))
+                    else:
+                        tracked.interval = min(
+                            tracked.interval * settings.deploy_poll_backoff, settings.deploy_poll_max_interval
+                        )
+                tracked.next_poll_at = time.monotonic() + tracked.interval
+        if changes:
+            await self._record(changes)
+
+    async def _record(self, changes: List[tuple]) -> None:
+        """Persist transitions (one session, one commit), then update tracking state.
+
+        Tracking state only moves forward for committed transitions: a failed
+        write leaves the old status in place, so the next poll sees the
+        transition again and retries it.
+        """
+        fresh = [(t, data) for t, data in changes if data.get("status") != t.status]
+        if not fresh:
+            return
+        from app.services.vercel_service import apply_deployment_status
+
+        by_factory: Dict[Any, List[tuple]] = {}
+        for tracked, data in fresh:
+            by_factory.setdefault(tracked.session_factory, []).append((tracked, data))
+
+        def write() -> List[tuple]:
+            written = []
+            for factory, items in by_factory.items():
+                db = factory()
+                try:
+                    for tracked, data in items:
+                        apply_deployment_status(db, tracked.project_id, data)
+                    db.commit()
+                    self.stats.db_commits += 1
+                    written.extend(items)
+                except Exception as e:
+                    db.rollback()
+                    ui.error(f"Failed to record deployment status (will retry): {e}", "Deploy")
+                finally:
+                    db.close()
+            return written
+
+        written = await asyncio.to_thread(write)
+
+        checked_at = datetime.utcnow().isoformat() + "Z"
+        for tracked, data in written:
+            ui.info(
+                f"Deployment {tracked.deployment_id}: {tracked.status or '-'} -> {data.get('status')}", "Deploy"
+            )
+            tracked.status = data.get("status")
+            tracked.url = data.get("url") or tracked.url
+            tracked.last_checked_at = checked_at
+            tracked.interval = self._base_interval()
+            tracked.next_poll_at = time.monotonic() + tracked.interval
+            if tracked.status in TERMINAL_STATES and self._tracked.get(tracked.project_id) is tracked:
+                del self._tracked[tracked.project_id]
+        self.stats.transitions += len(written)
+
+
+# Global tracker
+deployment_tracker = DeploymentTracker()
@@ -0,0 +1,459 @@
+"""
+Incremental .env <-> DB synchronization.
+
+Every sync used to re-parse the whole .env, decrypt every row and rewrite the
+file. The engine keeps, per project:
+
+- a snapshot of the .env file (mtime, size, SHA-256, parsed values): an
+  unchanged stat skips the read, an unchanged hash skips the parse;
+- the base: the values both sides held after the last sync, so a three-way
+  diff tells which side changed a key, or that both did (a conflict);
+- the file digest and a fingerprint of the DB ciphertexts from the last
+  sync that left both sides equal: when neither changed, a sync is a stat
+  and one (key, ciphertext) query, with nothing decrypted.
+
+Only changed keys are applied: DB rows in one transaction, the file by
+editing just the affected lines (comments and order are kept) and replacing
+it atomically (temp file + fsync + rename), so the dev server never sees a
+half-written .env. Decryption goes through the SecretBox cache. The base
+lives in memory; after a restart the first sync compares the two sides only.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.crypto import secret_box
+from app.models.env_vars import EnvVar
+
+
+ENV_HEADER = (
+    "# Environment Variables\n"
+    "# This file is automatically synchronized with Project Settings\n\n"
+)
+
+_KEY_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_QUOTE_CHARS = (" ", "#", "$", "`", '"', "'")
+# A file modified this close to when it was read may change again within the
+# same mtime tick without a size change: re-hash instead of trusting the stat
+_RACY_WINDOW_NS = 2_000_000_000
+# Base value of a key whose conflict was left unresolved: matches neither side
+_UNKNOWN = object()
+
+
+# Format -----------------------------------------------------------------
+
+def _parse_line(line: str) -> Optional[Tuple[str, str]]:
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    key, sep, value = line.partition("=")
+    key = key.rstrip()
+    if not sep or not _KEY_RE.fullmatch(key):
+        return None
+    value = value.lstrip()
+    # Handle quoted values
+    if value[:1] in ('"', "'") and value.endswith(value[0]):
+        value = value[1:-1]
+    return key, value
+
+
+def parse_env_text(text: str) -> Dict[str, str]:
+    """KEY=VALUE pairs of a .env file (last one wins)"""
+    values = {}
+    for line in text.splitlines():
+        parsed = _parse_line(line)
+        if parsed:
+            values[parsed[0]] = parsed[1]
+    return values
+
+
+def format_env_line(key: str, value: str) -> str:
+    # Quote values that contain spaces or special characters
+    if any(c in value for c in _QUOTE_CHARS):
+        value = f'"{value}"'
+    return f"{key}={value}\n"
+
+
+def render_env_text(values: Dict[str, str]) -> str:
+    """A fresh .env with sorted keys"""
+    return ENV_HEADER + "".join(format_env_line(key, values[key]) for key in sorted(values))
+
+
+def apply_env_changes(text: str, changes: Dict[str, Optional[str]]) -> str:
+    """Rewrite only the lines of changed keys (None removes the key); new keys are appended"""
+    pending = dict(changes)
+    lines = []
+    for line in text.splitlines(keepends=True):
+        parsed = _parse_line(line)
+        if parsed is None or parsed[0] not in changes:
+            lines.append(line)
+            continue
+        # Later duplicates of a rewritten key are dropped
+        value = pending.pop(parsed[0], None)
+        if value is not None:
+            lines.append(format_env_line(parsed[0], value))
+    additions = [format_env_line(key, value) for key, value in sorted(pending.items()) if value is not None]
+    if additions and lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    return "".join(lines + additions)
+
+
+def atomic_write_text(path: Path, text: str) -> os.stat_result:
+    """Replace `path` with `text` via a temp file in the same directory"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return path.stat()
+
+
+# Diff -------------------------------------------------------------------
+
+@dataclass
+class EnvDiff:
+    to_db: Dict[str, Optional[str]] = field(default_factory=dict)  # key -> value, None = delete
+    to_file: Dict[str, Optional[str]] = field(default_factory=dict)
+    conflicts: List[str] = field(default_factory=list)  # changed differently on both sides
+
+
+def three_way_diff(
+    base: Optional[Dict[str, Any]], file_values: Dict[str, str], db_values: Dict[str, str]
+) -> EnvDiff:
+    """Which side changed each differing key since `base` (None: unknown, all conflicts)"""
+    diff = EnvDiff()
+    for key in file_values.keys() | db_values.keys():
+        file_value, db_value = file_values.get(key), db_values.get(key)
+        if file_value == db_value:
+            continue
+        base_value = base.get(key) if base is not None else None
+        if base is not None and file_value == base_value:
+            diff.to_file[key] = db_value
+        elif base is not None and db_value == base_value:
+            diff.to_db[key] = file_value
+        else:
+            diff.conflicts.append(key)
+    diff.conflicts.sort()
+    return diff
+
+
+# Engine -----------------------------------------------------------------
+
+@dataclass
+class EnvFileSnapshot:
+    mtime_ns: int
+    size: int
+    digest: str
+    read_at_ns: int
+    text: str
+    values: Dict[str, str]
+
+
+@dataclass
+class _ProjectState:
+    file: Optional[EnvFileSnapshot] = None
+    base: Optional[Dict[str, Any]] = None  # values both sides held after the last sync
+    synced: Optional[Tuple[str, str]] = None  # (file digest, DB fingerprint) when both sides were equal
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class EnvSyncEngine:
+    """Change-detecting .env <-> env_vars synchronization"""
+
+    def __init__(self):
+        self._states: Dict[str, _ProjectState] = {}
+        self._states_lock = threading.Lock()
+        self.stats = {"file_reads": 0, "file_parses": 0, "file_writes": 0, "db_commits": 0}
+
+    def _state(self, project_id: str) -> _ProjectState:
+        with self._states_lock:
+            state = self._states.get(project_id)
+            if state is None:
+                state = self._states[project_id] = _ProjectState()
+            return state
+
+    def forget(self, project_id: str) -> None:
+        with self._states_lock:
+            self._states.pop(project_id, None)
+
+    # Sides --------------------------------------------------------------
+
+    def _read_file(self, env_path: Path, state: _ProjectState) -> Dict[str, str]:
+        try:
+            stat = env_path.stat()
+        except FileNotFoundError:
+            state.file = None
+            return {}
+        snapshot = state.file
+        if (
+            snapshot is not None
+            and snapshot.mtime_ns == stat.st_mtime_ns
+            and snapshot.size == stat.st_size
+            and snapshot.read_at_ns - stat.st_mtime_ns > _RACY_WINDOW_NS
+        ):
+            return snapshot.values
+        read_at_ns = time.time_ns()
+        data = env_path.read_bytes()
+        self.stats["file_reads"] += 1
+        digest = hashlib.sha256(data).hexdigest()
+        if snapshot is not None and snapshot.digest == digest:
+            values, text = snapshot.values, snapshot.text
+        else:
+            text = data.decode("utf-8")
+            values = parse_env_text(text)
+            self.stats["file_parses"] += 1
+        state.file = EnvFileSnapshot(stat.st_mtime_ns, stat.st_size, digest, read_at_ns, text, values)
+        return values
+
+    def _write_file(self, env_path: Path, state: _ProjectState, changes: Dict[str, Optional[str]]) -> None:
+        if not changes:
+            return
+        if state.file is not None:
+            text = apply_env_changes(state.file.text, changes)
+            values = dict(state.file.values)
+        else:
+            text = render_env_text({k: v for k, v in changes.items() if v is not None})
+            values = {}
+        for key, value in changes.items():
+            if value is None:
+                values.pop(key, None)
+            else:
+                values[key] = value
+        read_at_ns = time.time_ns()
+        stat = atomic_write_text(env_path, text)
+        self.stats["file_writes"] += 1
+        state.file = EnvFileSnapshot(
+            stat.st_mtime_ns, stat.st_size, hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            read_at_ns, text, values,
+        )
+
+    @staticmethod
+    def _db_ciphertexts(db: Session, project_id: str) -> Dict[str, str]:
+        # Plain tuples: no ORM instances for rows that are not going to change
+        return dict(db.query(EnvVar.key, EnvVar.value_encrypted).filter(EnvVar.project_id == project_id).all())
+
+    @staticmethod
+    def _fingerprint(ciphertexts: Dict[str, str]) -> str:
+        digest = hashlib.sha256()
+        for key in sorted(ciphertexts):
+            digest.update(f"{key}\0{ciphertexts[key]}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _decrypt_all(ciphertexts: Dict[str, str]) -> Dict[str, str]:
+        values = {}
+        for key, ciphertext in ciphertexts.items():
+            try:
+                values[key] = secret_box.decrypt(ciphertext)
+            except Exception as e:
+                print(f"⚠️  Failed to decrypt env var {key}: {e}")
+        return values
+
+    def _in_sync(self, state: _ProjectState, ciphertexts: Dict[str, str]) -> bool:
+        """Neither side changed since a sync that left them equal: nothing to decrypt or diff"""
+        return (
+            state.synced is not None
+            and state.file is not None
+            and state.synced == (state.file.digest, self._fingerprint(ciphertexts))
+        )
+
+    def _mark_synced(self, state: _ProjectState, ciphertexts: Dict[str, str]) -> None:
+        state.synced = (state.file.digest, self._fingerprint(ciphertexts)) if state.file is not None else None
+
+    def _apply_db(self, db: Session, project_id: str, changes: Dict[str, Optional[str]]) -> None:
+        """Apply per-key changes in one transaction"""
+        if not changes:
+            return
+        query = db.query(EnvVar).filter(EnvVar.project_id == project_id)
+        if len(changes) <= 500:  # stay well below SQLite's bound parameter limit
+            query = query.filter(EnvVar.key.in_(list(changes)))
+        rows = {row.key: row for row in query.all()}
+        try:
+            for key, value in changes.items():
+                row = rows.get(key)
+                if value is None:
+                    if row is not None:
+                        secret_box.invalidate(row.value_encrypted)
+                        db.delete(row)
+                elif row is not None:
+                    secret_box.invalidate(row.value_encrypted)
+                    row.value_encrypted = secret_box.encrypt(value)
+                else:
+                    db.add(EnvVar(
+                        id=str(uuid.uuid4()),
+                        project_id=project_id,
+                        key=key,
+                        value_encrypted=secret_box.encrypt(value),
+                        scope="runtime",
+                        var_type="string",
+                        is_secret=True
+                    ))
+            db.commit()
+            self.stats["db_commits"] += 1
+        except Exception:
+            db.rollback()
+            raise
+
+    # Operations ---------------------------------------------------------
+
+    def sync_file_to_db(self, db: Session, project_id: str, env_path: Path) -> int:
+        """Make the DB match the file; returns the number of changed keys"""
+        state = self._state(project_id)
+        with state.lock:
+            file_values = self._read_file(env_path, state)
+            ciphertexts = self._db_ciphertexts(db, project_id)
+            if self._in_sync(state, ciphertexts):
+                return 0
+            db_values = self._decrypt_all(ciphertexts)
+            changes = {
+                key: file_values.get(key)
+                for key in file_values.keys() | db_values.keys()
+                if file_values.get(key) != db_values.get(key)
+            }
+            # Rows that failed to decrypt are overwritten with the file's value (or deleted)
+            changes.update({key: file_values.get(key) for key in ciphertexts.keys() - db_values.keys()})
+            self._apply_db(db, project_id, changes)
+            state.base = dict(file_values)
+            self._mark_synced(state, self._db_ciphertexts(db, project_id) if changes else ciphertexts)
+            return len(changes)
+
+    def sync_db_to_file(self, db: Session, project_id: str, env_path: Path) -> int:
+        """Make the file match the DB; returns the number of changed keys"""
+        state = self._state(project_id)
+        with state.lock:
+            file_values = self._read_file(env_path, state)
+            return self._db_to_file(db, project_id, env_path, state, file_values)
+
+    def _db_to_file(
+        self, db: Session, project_id: str, env_path: Path, state: _ProjectState, file_values: Dict[str, str]
+    ) -> int:
+        ciphertexts = self._db_ciphertexts(db, project_id)
+        if self._in_sync(state, ciphertexts):
+            return 0
+        db_values = self._decrypt_all(ciphertexts)
+        if state.file is None:
+            # No file yet: create it, even with nothing to put in it
+            changes = dict(db_values)
+            atomic_write_text(env_path, render_env_text(db_values))
+            self.stats["file_writes"] += 1
+            self._read_file(env_path, state)
+        else:
+            changes = {
+                key: db_values.get(key)
+                for key in file_values.keys() | db_values.keys()
+                if file_values.get(key) != db_values.get(key)
+            }
+            self._write_file(env_path, state, changes)
+        state.base = dict(db_values)
+        self._mark_synced(state, ciphertexts)
+        return len(changes)
+
+    def sync(self, db: Session, project_id: str, env_path: Path, prefer: Optional[str] = None) -> Dict[str, Any]:
+        """Two-way sync: each side's changes since the last sync go to the other.
+
+        Keys changed differently on both sides are resolved by `prefer`
+        ("file" or "db") or left untouched and reported.
+        """
+        state = self._state(project_id)
+        with state.lock:
+            file_values = self._read_file(env_path, state)
+            if state.file is None:
+                # A missing .env is recreated, not read as "every key deleted"
+                return {"to_db": 0, "to_file": self._db_to_file(db, project_id, env_path, state, {}), "conflicts": []}
+            ciphertexts = self._db_ciphertexts(db, project_id)
+            if self._in_sync(state, ciphertexts):
+                return {"to_db": 0, "to_file": 0, "conflicts": []}
+            db_values = self._decrypt_all(ciphertexts)
+            diff = three_way_diff(state.base, file_values, db_values)
+            unresolved = []
+            for key in diff.conflicts:
+                if prefer == "file":
+                    diff.to_db[key] = file_values.get(key)
+                elif prefer == "db":
+                    diff.to_file[key] = db_values.get(key)
+                else:
+                    unresolved.append(key)
+            self._apply_db(db, project_id, diff.to_db)
+            self._write_file(env_path, state, diff.to_file)
+
+            merged = dict(file_values)
+            for key, value in diff.to_file.items():
+                if value is None:
+                    merged.pop(key, None)
+                else:
+                    merged[key] = value
+            base = {key: value for key, value in merged.items() if key not in unresolved}
+            for key in unresolved:
+                # Keep it a conflict until resolved
+                base[key] = state.base.get(key, _UNKNOWN) if state.base is not None else _UNKNOWN
+            state.base = base
+            if unresolved:
+                state.synced = None
+            else:
+                self._mark_synced(state, self._db_ciphertexts(db, project_id) if diff.to_db else ciphertexts)
+            return {"to_db": len(diff.to_db), "to_file": len(diff.to_file), "conflicts": unresolved}
+
+    def conflicts(self, db: Session, project_id: str, env_path: Path) -> List[Dict[str, Any]]:
+        """Keys whose file and DB values differ, with the side that changed them when known"""
+        state = self._state(project_id)
+        with state.lock:
+            file_values = self._read_file(env_path, state)
+            ciphertexts = self._db_ciphertexts(db, project_id)
+            if self._in_sync(state, ciphertexts):
+                return []
+            db_values = self._decrypt_all(ciphertexts)
+            diff = three_way_diff(state.base, file_values, db_values)
+            base = state.base
+        changed_in = {
+            **{key: "file" for key in diff.to_db},
+            **{key: "db" for key in diff.to_file},
+            **{
+                key: "both" if base is not None and base.get(key, _UNKNOWN) is not _UNKNOWN else None
+                for key in diff.conflicts
+            },
+        }
+        conflicts = []
+        for key in sorted(changed_in):
+            file_value = file_values.get(key)
+            db_value = db_values.get(key)
+            conflicts.append({
+                "key": key,
+                "file_value": file_value,
+                "db_value": db_value,
+                "conflict_type": (
+                    "file_only" if file_value and not db_value else
+                    "db_only" if db_value and not file_value else
+                    "value_mismatch"
+                ),
+                "changed_in": changed_in[key],
+            })
+        return conflicts
+
+
+# Global sync engine
+env_sync = EnvSyncEngine()
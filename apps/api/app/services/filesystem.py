@@ -32,11 +32,47 @@ def init_git_repo(repo_path: str) -> None:
         raise Exception("Failed to initialize git repository. See logs for details.")
 
 
+def create_next_app_args(project_name: str) -> list[str]:
+    """create-next-app arguments shared by per-project scaffolding and the template cache"""
+    return [
+        project_name,
+        "--typescript",
+        "--tailwind", 
+        "--eslint",
+        "--app",
+        "--import-alias", "@/*",
+        "--use-npm",
+        "--skip-install",  # We'll install dependencies later (handled by backend)
+        "--yes"            # Auto-accept all prompts
+    ]
+
+
 def scaffold_nextjs_minimal(repo_path: str) -> None:
-    """Create Next.js project using official create-next-app"""
+    """Create Next.js project from the cached template, falling back to create-next-app"""
     import subprocess
     import tempfile
     import shutil
+    from app.core.config import settings
+    from app.core.terminal_ui import ui
+    from app.services.template_cache import template_cache
+    
+    # Fast path: copy the pre-built scaffold
+    try:
+        if template_cache.materialize(repo_path):
+            return
+    except Exception as e:
+        ui.warning(f"Template copy failed, falling back to create-next-app: {e}", "Filesystem")
+        for entry in os.listdir(repo_path):
+            entry_path = os.path.join(repo_path, entry)
+            if os.path.isdir(entry_path) and not os.path.islink(entry_path):
+                shutil.rmtree(entry_path, ignore_errors=True)
+            else:
+                os.remove(entry_path)
+    
+    if settings.template_offline:
+        raise Exception(
+            "No cached project template available in offline mode. Build one while online first."
+        )
     
     # Get parent directory to create project in
     parent_dir = Path(repo_path).parent
@@ -53,19 +89,7 @@ def scaffold_nextjs_minimal(repo_path: str) -> None:
                 "Cannot find 'npx'. Install Node.js 18+ and ensure the 'npx' command is available on your PATH."
             )
         # Create Next.js app with TypeScript and Tailwind CSS
-        base_cmd = [
-            "npx",
-            "create-next-app@latest", 
-            project_name,
-            "--typescript",
-            "--tailwind", 
-            "--eslint",
-            "--app",
-            "--import-alias", "@/*",
-            "--use-npm",
-            "--skip-install",  # We'll install dependencies later (handled by backend)
-            "--yes"            # Auto-accept all prompts
-        ]
+        base_cmd = ["npx", "create-next-app@latest"] + create_next_app_args(project_name)
         if os.name == "nt":
             cmd = ["cmd.exe", "/c"] + base_cmd
         else:
@@ -95,6 +119,9 @@ def scaffold_nextjs_minimal(repo_path: str) -> None:
         # Users can run 'npm install' manually when needed
         ui.info("Skipped dependency installation for faster setup", "Filesystem")
         
+        # Seed the template cache so the next project skips create-next-app
+        template_cache.store_from(repo_path)
+        
     except subprocess.TimeoutExpired as e:
         ui.error("create-next-app timed out after 5 minutes", "Filesystem")
         raise Exception(f"Project creation timed out. This might be due to slow network or hung process.")
@@ -0,0 +1,455 @@
+"""
+Git read backends.
+
+Reads (HEAD, branch, commit history, raw objects) used to fork one `git`
+process per call. Backends here answer them without forking:
+
+- `Pygit2Backend`: in-process libgit2 (used when pygit2 is installed);
+- `CatFileBackend`: refs are read straight from the git directory and
+  objects through one persistent `git cat-file --batch` process per repo;
+- `SubprocessBackend`: the original one-fork-per-call behaviour, kept as a
+  fallback and as the benchmark baseline.
+
+Writes (add, commit, reset, push) stay on the git CLI in git_ops so hooks,
+the index and the working tree behave exactly as before.
+"""
+from __future__ import annotations
+
+import heapq
+from abc import ABC, abstractmethod
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    pygit2 = None
+    PYGIT2_AVAILABLE = False
+
+
+class GitError(RuntimeError):
+    """Raised when a git read fails (missing ref, unborn HEAD, bad object)"""
+
+
+def _format_iso(timestamp: int, offset_minutes: int) -> str:
+    """Same format as `git log --date=iso`"""
+    tz = timezone(timedelta(minutes=offset_minutes))
+    dt = datetime.fromtimestamp(timestamp, tz)
+    sign = "+" if offset_minutes >= 0 else "-"
+    hours, minutes = divmod(abs(offset_minutes), 60)
+    return dt.strftime("%Y-%m-%d %H:%M:%S") + f" {sign}{hours:02d}{minutes:02d}"
+
+
+def _parse_offset(tz: str) -> int:
+    """'+0900' -> 540"""
+    minutes = int(tz[1:3]) * 60 + int(tz[3:5])
+    return -minutes if tz.startswith("-") else minutes
+
+
+def _commit_dict(
+    sha: str,
+    parents: List[str],
+    author: Optional[str],
+    author_time: int,
+    author_offset: int,
+    commit_time: int,
+    message: str,
+) -> dict:
+    # Same shape as git_ops.list_commits; `_`-prefixed keys are walk bookkeeping
+    return {
+        "commit_sha": sha,
+        "parent_sha": parents[0] if parents else None,
+        "author": author,
+        "date": _format_iso(author_time, author_offset),
+        "message": message.split("\n", 1)[0].strip(),
+        "_time": commit_time,
+        "_parents": parents,
+    }
+
+
+class GitBackend(ABC):
+    """Read-only access to one repository"""
+
+    name = "base"
+
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+
+    # ---- Mandatory backend interface ------------------------------------
+    @abstractmethod
+    def head(self) -> str:
+        """Full SHA of HEAD"""
+
+    @abstractmethod
+    def current_branch(self) -> str:
+        """Checked-out branch name"""
+
+    @abstractmethod
+    def commit(self, sha: str) -> dict:
+        """One commit in the git_ops.list_commits shape"""
+
+    @abstractmethod
+    def read_object(self, sha: str) -> Tuple[str, bytes]:
+        """(type, raw content) of any object"""
+
+    def walk(self, start: Optional[str] = None) -> Iterator[dict]:
+        """Commits reachable from `start` (default HEAD), newest commit time first like `git log`"""
+        try:
+            tip = start or self.head()
+        except GitError:
+            return
+        seen = {tip}
+        first = self.commit(tip)
+        heap = [(-first["_time"], 0, first)]
+        counter = 1
+        while heap:
+            _t, _n, commit = heapq.heappop(heap)
+            yield commit
+            for parent in commit["_parents"]:
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                parent_commit = self.commit(parent)
+                heapq.heappush(heap, (-parent_commit["_time"], counter, parent_commit))
+                counter += 1
+
+    def log(self, limit: int = 50, start: Optional[str] = None) -> List[dict]:
+        return list(islice(self.walk(start), limit))
+
+    def path_history(self, path: str, start: Optional[str] = None) -> List[str]:
+        """SHAs of commits touching `path` (git's own history simplification, one fork)"""
+        try:
+            res = subprocess.run(
+                ["git", "log", "--format=%H", start or "HEAD", "--", path],
+                cwd=self.repo_path,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except subprocess.CalledProcessError:
+            return []
+        return res.stdout.split()
+
+    def close(self) -> None:
+        pass
+
+
+class SubprocessBackend(GitBackend):
+    """One `git` fork per call (original behaviour)"""
+
+    name = "subprocess"
+
+    def _run(self, *args: str) -> str:
+        try:
+            res = subprocess.run(["git", *args], cwd=self.repo_path, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            raise GitError(e.stderr.strip() or str(e))
+        return res.stdout.strip()
+
+    def head(self) -> str:
+        return self._run("rev-parse", "HEAD")
+
+    def current_branch(self) -> str:
+        return self._run("branch", "--show-current")
+
+    def commit(self, sha: str) -> dict:
+        out = self._run("show", "-s", "--format=%H%x01%P%x01%an%x01%at%x01%ai%x01%ct%x01%s", sha)
+        full, parents, author, at, ai, ct, subject = out.split("\x01")
+        return _commit_dict(full, parents.split(), author, int(at), _parse_offset(ai.rsplit(" ", 1)[1]), int(ct), subject)
+
+    def read_object(self, sha: str) -> Tuple[str, bytes]:
+        obj_type = self._run("cat-file", "-t", sha)
+        data = subprocess.run(
+            ["git", "cat-file", obj_type, sha], cwd=self.repo_path, check=True, capture_output=True
+        ).stdout
+        return obj_type, data
+
+    _LOG_FORMAT = "%H%x01%P%x01%an%x01%ad%x01%s"
+
+    @staticmethod
+    def _parse_log_line(line: str) -> dict:
+        sha, parents, author, date, subject = line.split("\x01")
+        parent_list = parents.split()
+        return {
+            "commit_sha": sha,
+            "parent_sha": parent_list[0] if parent_list else None,
+            "author": author,
+            "date": date,
+            "message": subject,
+            "_parents": parent_list,
+        }
+
+    def walk(self, start: Optional[str] = None) -> Iterator[dict]:
+        # One streaming `git log`; abandoning the iterator terminates it
+        proc = subprocess.Popen(
+            ["git", "log", f"--pretty=format:{self._LOG_FORMAT}", "--date=iso", start or "HEAD"],
+            cwd=self.repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        try:
+            for line in proc.stdout:
+                line = line.rstrip("\n")
+                if line:
+                    yield self._parse_log_line(line)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+
+    def log(self, limit: int = 50, start: Optional[str] = None) -> List[dict]:
+        try:
+            out = self._run(
+                "log", f"-n{limit}", f"--pretty=format:{self._LOG_FORMAT}", "--date=iso", *([start] if start else [])
+            )
+        except GitError:
+            return []
+        return [self._parse_log_line(line) for line in out.splitlines()]
+
+
+class CatFileBackend(GitBackend):
+    """Refs from the git directory, objects from a persistent `git cat-file --batch`"""
+
+    name = "catfile"
+
+    def __init__(self, repo_path: str):
+        super().__init__(repo_path)
+        self.git_dir = self._find_git_dir()
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _find_git_dir(self) -> str:
+        dot_git = os.path.join(self.repo_path, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            # Worktree/submodule: "gitdir: <path>"
+            with open(dot_git, "r", encoding="utf-8") as f:
+                target = f.read().strip().partition("gitdir:")[2].strip()
+            return os.path.normpath(os.path.join(self.repo_path, target))
+        raise GitError(f"Not a git repository: {self.repo_path}")
+
+    # Refs ------------------------------------------------------------
+
+    def _read_head(self) -> str:
+        with open(os.path.join(self.git_dir, "HEAD"), "r", encoding="utf-8") as f:
+            return f.read().strip()
+
+    def _resolve_ref(self, ref: str) -> Optional[str]:
+        path = os.path.join(self.git_dir, *ref.split("/"))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read().strip()
+            if value.startswith("ref: "):
+                return self._resolve_ref(value[5:])
+            return value
+        except FileNotFoundError:
+            pass
+        try:
+            with open(os.path.join(self.git_dir, "packed-refs"), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(("#", "^")):
+                        continue
+                    sha, _, name = line.strip().partition(" ")
+                    if name == ref:
+                        return sha
+        except FileNotFoundError:
+            pass
+        return None
+
+    def head(self) -> str:
+        head = self._read_head()
+        if not head.startswith("ref: "):
+            return head  # detached
+        sha = self._resolve_ref(head[5:])
+        if not sha:
+            raise GitError("HEAD does not point to a commit yet")
+        return sha
+
+    def current_branch(self) -> str:
+        head = self._read_head()
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+        return ""
+
+    # Objects ---------------------------------------------------------
+
+    def _process(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.repo_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._proc
+
+    def read_object(self, sha: str) -> Tuple[str, bytes]:
+        with self._lock:
+            proc = self._process()
+            try:
+                proc.stdin.write(sha.encode() + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline().decode().strip()
+                if not header or header.endswith("missing"):
+                    raise GitError(f"Object not found: {sha}")
+                _sha, obj_type, size = header.split()
+                data = proc.stdout.read(int(size))
+                proc.stdout.read(1)  # trailing newline
+                return obj_type, data
+            except (BrokenPipeError, ValueError) as e:
+                self._kill()
+                raise GitError(f"cat-file failed for {sha}: {e}")
+
+    def commit(self, sha: str) -> dict:
+        obj_type, data = self.read_object(sha)
+        if obj_type != "commit":
+            raise GitError(f"{sha} is a {obj_type}, not a commit")
+        headers, _, message = data.decode("utf-8", errors="replace").partition("\n\n")
+        parents: List[str] = []
+        author, author_time, author_offset, commit_time = None, 0, 0, 0
+        for line in headers.split("\n"):
+            key, _, value = line.partition(" ")
+            if key == "parent":
+                parents.append(value)
+            elif key in ("author", "committer"):
+                # "Name <email> 1700000000 +0900"
+                ident, _, rest = value.rpartition("> ")
+                ts, _, tz = rest.partition(" ")
+                if key == "author":
+                    author = ident.partition(" <")[0]
+                    author_time, author_offset = int(ts), _parse_offset(tz)
+                else:
+                    commit_time = int(ts)
+        return _commit_dict(sha, parents, author, author_time, author_offset, commit_time, message)
+
+    def _kill(self) -> None:
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=2)
+            except Exception:
+                pass
+            self._proc = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                try:
+                    self._proc.stdin.close()
+                    self._proc.wait(timeout=2)
+                except Exception:
+                    pass
+            self._kill()
+
+
+class Pygit2Backend(GitBackend):
+    """In-process libgit2 reads"""
+
+    name = "pygit2"
+
+    def __init__(self, repo_path: str):
+        super().__init__(repo_path)
+        try:
+            self._repo = pygit2.Repository(repo_path)
+        except Exception as e:
+            raise GitError(str(e))
+
+    def head(self) -> str:
+        if self._repo.head_is_unborn:
+            raise GitError("HEAD does not point to a commit yet")
+        return str(self._repo.head.target)
+
+    def current_branch(self) -> str:
+        if self._repo.head_is_detached or self._repo.head_is_unborn:
+            return ""
+        return self._repo.head.shorthand
+
+    def commit(self, sha: str) -> dict:
+        try:
+            c = self._repo[sha]
+        except (KeyError, ValueError):
+            raise GitError(f"Object not found: {sha}")
+        return _commit_dict(
+            str(c.id), [str(p) for p in c.parent_ids], c.author.name, c.author.time, c.author.offset, c.commit_time, c.message
+        )
+
+    def read_object(self, sha: str) -> Tuple[str, bytes]:
+        obj = self._repo.odb.read(sha)
+        type_names = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+        return type_names.get(obj[0], str(obj[0])), obj[1]
+
+
+_BACKENDS = {
+    "subprocess": SubprocessBackend,
+    "catfile": CatFileBackend,
+    "pygit2": Pygit2Backend,
+}
+
+
+class GitBackendRegistry:
+    """One backend per repository, LRU-bounded (each cat-file backend holds a process)"""
+
+    def __init__(self, max_repos: Optional[int] = None):
+        self.max_repos = max_repos or settings.git_backend_max_repos
+        self._backends: "OrderedDict[str, GitBackend]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def backend_name() -> str:
+        name = settings.git_backend.lower()
+        if name == "auto":
+            return "pygit2" if PYGIT2_AVAILABLE else "catfile"
+        if name == "pygit2" and not PYGIT2_AVAILABLE:
+            return "catfile"
+        return name if name in _BACKENDS else "catfile"
+
+    def get(self, repo_path: str) -> GitBackend:
+        key = os.path.abspath(repo_path)
+        with self._lock:
+            backend = self._backends.get(key)
+            if backend is not None:
+                self._backends.move_to_end(key)
+                return backend
+        try:
+            backend = _BACKENDS[self.backend_name()](key)
+        except GitError:
+            # Not initialised yet (or unusual layout): plain git still works
+            return SubprocessBackend(key)
+        with self._lock:
+            existing = self._backends.get(key)
+            if existing is not None:
+                backend.close()
+                return existing
+            self._backends[key] = backend
+            while len(self._backends) > self.max_repos:
+                _key, evicted = self._backends.popitem(last=False)
+                evicted.close()
+        return backend
+
+    def discard(self, repo_path: str) -> None:
+        with self._lock:
+            backend = self._backends.pop(os.path.abspath(repo_path), None)
+        if backend is not None:
+            backend.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            backends, self._backends = list(self._backends.values()), OrderedDict()
+        for backend in backends:
+            backend.close()
+
+
+# Global backend registry
+git_backends = GitBackendRegistry()
@@ -1,7 +1,11 @@
 import subprocess
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import os
 
+from app.core.config import settings
+from app.services.commit_history import commit_history
+from app.services.git_backend import GitError, git_backends
+
 
 def _run(cmd: list[str], cwd: str) -> str:
     res = subprocess.run(cmd, cwd=cwd, check=True, capture_output=True, text=True)
@@ -9,40 +13,164 @@ def _run(cmd: list[str], cwd: str) -> str:
 
 
 def list_commits(repo_path: str, limit: int = 50) -> list[dict]:
-    fmt = "%H%x01%P%x01%an%x01%ad%x01%s"
-    out = _run(["git", "log", f"-n{limit}", f"--pretty=format:{fmt}", "--date=iso"], cwd=repo_path)
-    commits: list[dict] = []
-    if not out:
-        return commits
-    for line in out.splitlines():
-        sha, parents, author, date, subject = line.split("\x01")
-        commits.append({
-            "commit_sha": sha,
-            "parent_sha": parents.split()[0] if parents else None,
-            "author": author,
-            "date": date,
-            "message": subject,
-        })
+    # Served from the HEAD-keyed history cache (no `git log` fork per call)
+    commits, _next_cursor = commit_history.page(repo_path, limit)
     return commits
 
 
-def show_diff(repo_path: str, commit_sha: str) -> str:
-    return _run(["git", "show", "--format=", commit_sha], cwd=repo_path)
+def show_diff(repo_path: str, commit_sha: str, max_bytes: Optional[int] = None) -> str:
+    """Full `git show` patch, cut at max_bytes (whole files are served by file_diff)"""
+    if max_bytes is None:
+        return _run(["git", "show", "--format=", commit_sha], cwd=repo_path)
+    diff, _truncated = _read_capped(["git", "show", "--format=", commit_sha], repo_path, max_bytes)
+    return diff
+
+
+def _read_capped(cmd: list[str], cwd: str, max_bytes: int) -> tuple[str, bool]:
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        data = proc.stdout.read(max_bytes + 1)
+        truncated = len(data) > max_bytes
+        if truncated:
+            proc.kill()
+        else:
+            proc.wait()
+            if proc.returncode:
+                raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=proc.stderr.read().decode(errors="replace"))
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+        proc.wait()
+    return data[:max_bytes].decode("utf-8", errors="replace"), truncated
+
+
+def _diff_tree_args(repo_path: str, commit_sha: str) -> list[str]:
+    # Merges are diffed against their first parent, root commits against the empty tree
+    try:
+        parents = git_backends.get(repo_path).commit(commit_sha)["_parents"]
+    except GitError as e:
+        raise subprocess.CalledProcessError(128, ["git", "cat-file", commit_sha], stderr=str(e))
+    return [parents[0], commit_sha] if parents else ["--root", commit_sha]
+
+
+def commit_file_stats(repo_path: str, commit_sha: str) -> list[dict]:
+    """Per-file change stats of a commit (numstat, renames detected)"""
+    out = subprocess.run(
+        ["git", "diff-tree", "-r", "-M", "--numstat", "-z", "--no-commit-id", *_diff_tree_args(repo_path, commit_sha)],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+    ).stdout.decode("utf-8", errors="replace")
+    tokens = out.split("\0")
+    files: list[dict] = []
+    i = 0
+    while i < len(tokens) and tokens[i]:
+        added, deleted, path = tokens[i].split("\t", 2)
+        old_path = None
+        if not path:
+            # Rename/copy: "<a>\t<d>\t\0<old>\0<new>\0"
+            old_path, path = tokens[i + 1], tokens[i + 2]
+            i += 2
+        i += 1
+        binary = added == "-"
+        additions = 0 if binary else int(added)
+        deletions = 0 if binary else int(deleted)
+        files.append({
+            "path": path,
+            "old_path": old_path,
+            "additions": additions,
+            "deletions": deletions,
+            "binary": binary,
+            "large": binary or additions + deletions > settings.commit_diff_inline_lines,
+        })
+    return files
+
+
+def file_diff(repo_path: str, commit_sha: str, path: str) -> dict:
+    """Patch of a single file in a commit (the lazy half of iter_commit_diff)"""
+    stat = next((f for f in commit_file_stats(repo_path, commit_sha) if f["path"] == path), None)
+    if stat is None:
+        raise FileNotFoundError(path)
+    pathspec = [path] + ([stat["old_path"]] if stat["old_path"] else [])
+    diff, truncated = _read_capped(
+        ["git", "diff-tree", "-p", "-M", "--no-commit-id", *_diff_tree_args(repo_path, commit_sha), "--", *pathspec],
+        repo_path,
+        settings.commit_diff_max_bytes,
+    )
+    return {**stat, "diff": diff, "truncated": truncated}
+
+
+def iter_commit_diff(repo_path: str, commit_sha: str) -> Iterator[dict]:
+    """Stats for every file first, then each file's patch; large files only as a placeholder"""
+    files = commit_file_stats(repo_path, commit_sha)
+    yield {
+        "type": "stats",
+        "commit_sha": commit_sha,
+        "files": files,
+        "additions": sum(f["additions"] for f in files),
+        "deletions": sum(f["deletions"] for f in files),
+    }
+    if not files:
+        return
+
+    proc = subprocess.Popen(
+        ["git", "diff-tree", "-p", "-M", "--no-commit-id", *_diff_tree_args(repo_path, commit_sha)],
+        cwd=repo_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    index = -1
+    chunk: list[str] = []
+
+    def finish() -> Optional[dict]:
+        if index < 0 or index >= len(files):
+            return None
+        stat = files[index]
+        if stat["large"]:
+            return {"type": "file", "path": stat["path"], "lazy": True}
+        return {"type": "file", "path": stat["path"], "lazy": False, "diff": "".join(chunk)}
+
+    try:
+        # numstat and patch output share git's diff queue order
+        for raw in proc.stdout:
+            line = raw.decode("utf-8", errors="replace")
+            if line.startswith("diff --git "):
+                item = finish()
+                if item:
+                    yield item
+                index += 1
+                chunk = []
+            if 0 <= index < len(files) and not files[index]["large"]:
+                chunk.append(line)
+        item = finish()
+        if item:
+            yield item
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
 
 
 def current_head(repo_path: str) -> str:
-    return _run(["git", "rev-parse", "HEAD"], cwd=repo_path)
+    try:
+        return git_backends.get(repo_path).head()
+    except (GitError, OSError):
+        # Let git report the failure (raises CalledProcessError as before)
+        return _run(["git", "rev-parse", "HEAD"], cwd=repo_path)
 
 
 # Legacy function for backward compatibility
 def commit_all_legacy(repo_path: str, message: str) -> str:
     _run(["git", "add", "-A"], cwd=repo_path)
     _run(["git", "commit", "-m", message], cwd=repo_path)
+    commit_history.invalidate(repo_path)
     return current_head(repo_path)
 
 
 def hard_reset(repo_path: str, commit_sha: str) -> None:
     _run(["git", "reset", "--hard", commit_sha], cwd=repo_path)
+    commit_history.invalidate(repo_path)
 
 
 def add_remote(repo_path: str, remote_name: str, remote_url: str) -> None:
@@ -112,8 +240,8 @@ def get_remote_url(repo_path: str, remote_name: str = "origin") -> str:
 def get_current_branch(repo_path: str) -> str:
     """Get current branch name"""
     try:
-        return _run(["git", "branch", "--show-current"], cwd=repo_path)
-    except subprocess.CalledProcessError:
+        return git_backends.get(repo_path).current_branch()
+    except (GitError, OSError, subprocess.CalledProcessError):
         return "main"  # fallback to main
 
 
@@ -159,6 +287,7 @@ def commit_all(repo_path: str, message: str) -> dict:
     try:
         _run(["git", "add", "-A"], cwd=repo_path)
         _run(["git", "commit", "-m", message], cwd=repo_path)
+        commit_history.invalidate(repo_path)
         commit_sha = current_head(repo_path)
         return {
             "success": True,
@@ -0,0 +1,264 @@
+"""
+Pooled HTTP clients for third-party APIs (GitHub, Vercel).
+
+One `httpx.AsyncClient` per API host lives for the whole application, so
+calls reuse keep-alive connections (HTTP/2 when `h2` is installed) instead of
+paying a TCP and TLS handshake each time. Each host has its own connection
+limit. On top of the client:
+
+- retries with exponential backoff for transport errors, 429 and 5xx,
+  honoring `Retry-After` and exhausted `X-RateLimit-*` headers; POST is only
+  retried when the request provably was not processed (connect errors, 429);
+- conditional GETs: responses with an ETag/Last-Modified are kept in a
+  bounded LRU, and a 304 (which GitHub does not count against the rate
+  limit) is answered from it. Entries are keyed by URL and a hash of the
+  credentials, so users never see each other's responses.
+
+Base URLs come from settings (GITHUB_API_BASE, VERCEL_API_BASE), which is
+how scripts/stub_api_server.py is plugged in for offline runs.
+"""
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import hashlib
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_IDEMPOTENT = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+@dataclass
+class _CachedResponse:
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    validators: Dict[str, str]  # If-None-Match / If-Modified-Since
+
+
+@dataclass
+class HTTPClientStats:
+    requests: int = 0
+    retries: int = 0
+    not_modified: int = 0
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds the server asked us to wait, if it said so"""
+    value = response.headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    # GitHub/Vercel: remaining=0 plus an epoch reset time (GitHub answers 403)
+    if response.headers.get("x-ratelimit-remaining") == "0":
+        reset = response.headers.get("x-ratelimit-reset")
+        if reset and reset.isdigit():
+            return max(0.0, int(reset) - time.time())
+    return None
+
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    return response.status_code == 429 or (
+        response.status_code == 403 and response.headers.get("x-ratelimit-remaining") == "0"
+    )
+
+
+class APIClient:
+    """Connection-pooled client for one API host"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.stats = HTTPClientStats()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: "OrderedDict[Tuple[str, str], _CachedResponse]" = OrderedDict()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=settings.http_max_connections_per_host,
+                max_keepalive_connections=settings.http_max_connections_per_host,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            )
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=settings.http_http2 and H2_AVAILABLE,
+                limits=limits,
+                timeout=settings.http_timeout,
+                event_hooks={"request": [self._on_request]},
+            )
+        return self._client
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.stats.requests += 1
+
+    @staticmethod
+    def _cache_key(url: str, headers: Dict[str, str]) -> Tuple[str, str]:
+        credentials = headers.get("Authorization") or headers.get("authorization") or ""
+        return url, hashlib.sha256(credentials.encode()).hexdigest()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        conditional: bool = False,
+    ) -> httpx.Response:
+        """Send a request with retries; `conditional` GETs revalidate a cached copy"""
+        method = method.upper()
+        headers = dict(headers or {})
+        client = self._get_client()
+        request = client.build_request(method, url, headers=headers, params=params, json=json)
+
+        cache_key = None
+        cached = None
+        if conditional and method == "GET":
+            cache_key = self._cache_key(str(request.url), headers)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                request.headers.update(cached.validators)
+
+        response = await self._send_with_retries(client, request, method)
+
+        if cache_key is not None:
+            if response.status_code == 304 and cached is not None:
+                self.stats.not_modified += 1
+                self._cache.move_to_end(cache_key)
+                return httpx.Response(
+                    cached.status_code, headers=cached.headers, content=cached.content, request=request
+                )
+            self._store(cache_key, response)
+        return response
+
+    async def _send_with_retries(
+        self, client: httpx.AsyncClient, request: httpx.Request, method: str
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await client.send(request)
+            except httpx.TransportError as e:
+                # Connect failures never reached the server: safe for any method
+                retryable = method in _IDEMPOTENT or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or attempt >= settings.http_max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                ui.warning(f"{request.method} {request.url} failed ({e!r}); retrying in {delay:.1f}s", "HTTP")
+            else:
+                rate_limited = _is_rate_limited(response)
+                retryable = rate_limited or (
+                    response.status_code in _RETRY_STATUSES and method in _IDEMPOTENT
+                )
+                if not retryable or attempt >= settings.http_max_retries:
+                    return response
+                wait = _retry_after(response)
+                if wait is None:
+                    wait = self._backoff(attempt)
+                if wait > settings.http_max_retry_wait:
+                    # Rate limit resets too far out: let the caller report it
+                    return response
+                delay = wait
+                await response.aclose()
+                ui.warning(
+                    f"{request.method} {request.url} -> {response.status_code}; retrying in {delay:.1f}s",
+                    "HTTP",
+                )
+            attempt += 1
+            self.stats.retries += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return settings.http_retry_backoff * (2 ** attempt) * (0.5 + random.random())
+
+    def _store(self, key: Tuple[str, str], response: httpx.Response) -> None:
+        validators = {}
+        if response.headers.get("etag"):
+            validators["If-None-Match"] = response.headers["etag"]
+        if response.headers.get("last-modified"):
+            validators["If-Modified-Since"] = response.headers["last-modified"]
+        if response.status_code != 200 or not validators:
+            self._cache.pop(key, None)
+            return
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        }
+        self._cache[key] = _CachedResponse(200, headers, response.content, validators)
+        self._cache.move_to_end(key)
+        while len(self._cache) > settings.http_etag_cache_size:
+            self._cache.popitem(last=False)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+        self._cache.clear()
+
+
+class HTTPClientRegistry:
+    """One APIClient per base URL, shared for the application's lifetime"""
+
+    def __init__(self):
+        self._clients: Dict[str, APIClient] = {}
+
+    def get(self, base_url: str) -> APIClient:
+        key = base_url.rstrip("/")
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = APIClient(key)
+        return client
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            base: {
+                "requests": c.stats.requests,
+                "retries": c.stats.retries,
+                "not_modified": c.stats.not_modified,
+                "cached": len(c._cache),
+            }
+            for base, c in self._clients.items()
+        }
+
+    async def close_all(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                ui.warning(f"Failed to close HTTP client {client.base_url}: {e}", "HTTP")
+
+
+# Global client registry
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,117 @@
+"""
+Background re-encryption of stored secrets after an ENCRYPTION_KEY change.
+
+To rotate, set the new key as ENCRYPTION_KEY and list the old one(s) in
+ENCRYPTION_KEYS_PREVIOUS (comma-separated). SecretBox then decrypts with any
+of them (MultiFernet) and encrypts with the new one, and on startup this task
+re-encrypts env_vars and api_keys rows still under an old key:
+
+- in batches of KEY_ROTATION_BATCH_SIZE rows, one short transaction each,
+  so it never holds the SQLite write lock for long;
+- with a compare-and-set UPDATE, so a value changed by a user meanwhile is
+  left alone (it is already under the new key);
+- without bumping updated_at, since the value itself did not change.
+
+Once it reports completion the previous keys can be removed.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.crypto import secret_box
+from app.core.terminal_ui import ui
+from app.models.api_keys import APIKey
+from app.models.env_vars import EnvVar
+
+
+# (model, encrypted column)
+ENCRYPTED_COLUMNS = ((EnvVar, "value_encrypted"), (APIKey, "key"))
+
+
+class KeyRotation:
+    """Re-encrypts secrets under previous keys with the primary key"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"scanned": 0, "rotated": 0, "undecryptable": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, session_factory: Callable[[], Any]) -> None:
+        """Start re-encrypting in the background if previous keys are configured"""
+        if not secret_box.has_previous_keys or self.running:
+            return
+        self._task = asyncio.create_task(self._run(session_factory))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self, session_factory: Callable[[], Any]) -> None:
+        ui.info("Re-encrypting stored secrets with the current encryption key", "Crypto")
+        try:
+            for model, column in ENCRYPTED_COLUMNS:
+                after_id = ""
+                while after_id is not None:
+                    after_id = await asyncio.to_thread(self.rotate_batch, session_factory, model, column, after_id)
+                    await asyncio.sleep(settings.key_rotation_batch_pause)
+        except Exception as e:
+            ui.error(f"Key rotation failed: {e}", "Crypto")
+            return
+        ui.success(
+            f"Key rotation complete: {self.stats['rotated']} of {self.stats['scanned']} secrets re-encrypted"
+            + (f", {self.stats['undecryptable']} undecryptable" if self.stats["undecryptable"] else ""),
+            "Crypto",
+        )
+
+    def rotate_batch(
+        self, session_factory: Callable[[], Any], model: Any, column: str, after_id: str
+    ) -> Optional[str]:
+        """Rotate one batch of rows with id > after_id; returns the last id, None when done"""
+        db = session_factory()
+        try:
+            rows = (
+                db.query(model.id, getattr(model, column), model.updated_at)
+                .filter(model.id > after_id)
+                .order_by(model.id)
+                .limit(settings.key_rotation_batch_size)
+                .all()
+            )
+            if not rows:
+                return None
+            for row_id, ciphertext, updated_at in rows:
+                self.stats["scanned"] += 1
+                try:
+                    if not secret_box.needs_rotation(ciphertext):
+                        continue
+                    rotated = secret_box.rotate(ciphertext)
+                except InvalidToken:
+                    # Under none of the configured keys; leave it for the owner to re-enter
+                    self.stats["undecryptable"] += 1
+                    continue
+                result = db.execute(
+                    update(model)
+                    .where(model.id == row_id, getattr(model, column) == ciphertext)
+                    .values({column: rotated, "updated_at": updated_at})
+                )
+                self.stats["rotated"] += result.rowcount
+            db.commit()
+            return rows[-1][0]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Global key rotation task
+key_rotation = KeyRotation()
@@ -10,11 +10,12 @@ import shutil
 from contextlib import closing
 from typing import Optional, Dict
 from app.core.config import settings
+from app.services.npm_store import npm_store
+from app.services.preview_logs import preview_log_store
 
 
 # Global process registry to track running Next.js processes
 _running_processes: Dict[str, subprocess.Popen] = {}
-_process_logs: Dict[str, list] = {}  # Store process logs for each project
 _npm_executable: Optional[str] = None
 
 
@@ -46,9 +47,8 @@ def get_npm_executable() -> str:
     return _get_npm_executable()
 
 def _monitor_preview_errors(project_id: str, process: subprocess.Popen):
-    """간단한 Preview 서버 에러 모니터링"""
-    from app.core.websocket.manager import manager
-    import asyncio
+    """간단한 Preview 서버 에러 모니터링 (이벤트는 preview_events 브리지를 통해 전송)"""
+    from app.services.preview_events import preview_events
     
     error_patterns = [
         "Build Error",
@@ -111,23 +111,15 @@ def _monitor_preview_errors(project_id: str, process: subprocess.Popen):
         """에러 관련 컨텍스트 수집"""
         nonlocal current_error, error_lines
         
-        # 프로젝트별 로그 저장 (전체 로그 수집용)
-        if project_id not in _process_logs:
-            _process_logs[project_id] = []
-        
-        # 중복 로그 제거 (같은 라인이 연속으로 오는 경우)
         stripped_line = line_text.strip()
         if not stripped_line:  # 빈 라인 무시
             return
-            
-        # 마지막 로그와 같은 경우 무시 (중복 제거)
-        if _process_logs[project_id] and _process_logs[project_id][-1] == stripped_line:
+
+        # 프로젝트별 링 버퍼에 저장 (연속 중복 라인은 None)
+        seq = preview_log_store.append(project_id, stripped_line)
+        if seq is None:
             return
-            
-        _process_logs[project_id].append(stripped_line)
-        # 최대 1000라인까지만 저장
-        if len(_process_logs[project_id]) > 1000:
-            _process_logs[project_id] = _process_logs[project_id][-1000:]
+        preview_events.publish_log(project_id, stripped_line, seq)
         
         # 성공 패턴 감지 - 에러 상태 클리어
         for pattern in success_patterns:
@@ -142,16 +134,7 @@ def _monitor_preview_errors(project_id: str, process: subprocess.Popen):
                 }
                 
                 print(f"[PreviewSuccess] 성공 메시지: {line_text.strip()}")
-                
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(
-                        manager.send_message(project_id, success_message)
-                    )
-                    print(f"[PreviewSuccess] WebSocket 전송 성공!")
-                except Exception as e:
-                    print(f"[PreviewSuccess] WebSocket 전송 실패: {e}")
+                preview_events.publish_event(project_id, success_message)
                 
                 # 현재 에러 상태 클리어
                 current_error = None
@@ -197,26 +180,17 @@ def _monitor_preview_errors(project_id: str, process: subprocess.Popen):
         }
         
         print(f"[PreviewError] 전송할 에러 (ID: {error_id}): {main_message[:100]}")
-        
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(
-                manager.send_message(project_id, message_data)
-            )
-            print(f"[PreviewError] WebSocket 전송 성공! (ID: {error_id})")
-        except Exception as e:
-            print(f"[PreviewError] WebSocket 전송 실패: {e}")
+        preview_events.publish_event(project_id, message_data)
     
     while process.poll() is None:
         try:
-            if process.stdout:
-                line = process.stdout.readline()
-                if line:
-                    line_text = line if isinstance(line, str) else line.decode('utf-8', errors='ignore')
-                    collect_error_context(line_text)
-            
-            time.sleep(0.1)
+            line = process.stdout.readline() if process.stdout else None
+            if line:
+                line_text = line if isinstance(line, str) else line.decode('utf-8', errors='ignore')
+                collect_error_context(line_text)
+            else:
+                # readline()은 블로킹이므로 EOF/빈 출력일 때만 대기
+                time.sleep(0.1)
         except Exception as e:
             print(f"[PreviewError] 모니터링 에러: {e}")
             break
@@ -235,6 +209,35 @@ def _is_port_free(port: int) -> bool:
         return sock.connect_ex(("127.0.0.1", port)) != 0
 
 
+def wait_for_preview_ready(process: subprocess.Popen, port: int, timeout: Optional[float] = None) -> bool:
+    """
+    Health probe for a freshly started dev server.
+    
+    Returns True once the server answers an HTTP request (any status), False
+    if the process exits or the deadline passes without the port accepting
+    connections. A slow first compile still counts as ready when the port is open.
+    """
+    import http.client
+    
+    deadline = time.monotonic() + (timeout or settings.preview_ready_timeout)
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        try:
+            conn.request("HEAD", "/")
+            conn.getresponse()
+            return True
+        except (ConnectionRefusedError, ConnectionResetError):
+            time.sleep(0.2)
+        except OSError:
+            # Accepted but slow to answer (compiling) - keep probing
+            time.sleep(0.2)
+        finally:
+            conn.close()
+    return process.poll() is None and not _is_port_free(port)
+
+
 def find_free_preview_port() -> int:
     """Find a free port in the preview range"""
     for port in range(settings.preview_port_start, settings.preview_port_end + 1):
@@ -330,9 +333,7 @@ def start_preview_process(project_id: str, repo_path: str, port: Optional[int] =
     stop_preview_process(project_id)
     
     # Clear previous logs for this project
-    if project_id in _process_logs:
-        _process_logs[project_id] = []
-        print(f"[PreviewError] Cleared previous logs for {project_id}")
+    preview_log_store.clear(project_id)
     
     # Assign port
     port = port or find_free_preview_port()
@@ -387,8 +388,14 @@ def start_preview_process(project_id: str, repo_path: str, port: Optional[int] =
         npm_cmd = _get_npm_executable()
 
         # Only install dependencies if needed
-        if _should_install_dependencies(repo_path):
+        needs_install = _should_install_dependencies(repo_path)
+        if needs_install and npm_store.materialize(repo_path):
+            # Same lockfile already installed elsewhere - hardlinked from the shared store
+            _save_install_hash(repo_path)
+            print(f"Dependencies restored from shared npm store for project {project_id}")
+        elif needs_install:
             print(f"Installing dependencies for project {project_id} with npm...")
+            install_started = time.perf_counter()
             install_result = subprocess.run(
                 [npm_cmd, "install"],
                 cwd=repo_path,
@@ -403,6 +410,7 @@ def start_preview_process(project_id: str, repo_path: str, port: Optional[int] =
             
             # Save hash after successful install
             _save_install_hash(repo_path)
+            npm_store.populate(repo_path, time.perf_counter() - install_started)
             print(f"Dependencies installed successfully for project {project_id} using npm")
         else:
             print(f"Dependencies already up to date for project {project_id}, skipping npm install")
@@ -425,15 +433,7 @@ def start_preview_process(project_id: str, repo_path: str, port: Optional[int] =
             **popen_kwargs
         )
         
-        # Wait a moment for the server to start
-        time.sleep(2)
-        
-        # Check if process is still running
-        if process.poll() is not None:
-            stdout, _ = process.communicate()
-            raise RuntimeError(f"Next.js server failed to start: {stdout}")
-        
-        # Start error monitoring thread
+        # Start error monitoring thread (also collects startup output)
         error_thread = threading.Thread(
             target=_monitor_preview_errors,
             args=(project_id, process),
@@ -445,6 +445,12 @@ def start_preview_process(project_id: str, repo_path: str, port: Optional[int] =
         # Store process reference
         _running_processes[project_id] = process
         
+        # Probe the server instead of sleeping a fixed time
+        if not wait_for_preview_ready(process, port):
+            output = '\n'.join(preview_log_store.tail(project_id, 50))
+            stop_preview_process(project_id)
+            raise RuntimeError(f"Next.js server failed to start: {output}")
+        
         print(f"Next.js dev server started for {project_id} on port {port} (PID: {process.pid})")
         return process_name, port
         
@@ -492,10 +498,8 @@ def stop_preview_process(project_id: str, cleanup_cache: bool = False) -> None:
         finally:
             # Remove from registry
             del _running_processes[project_id]
-            # Clear logs when process stops
-            if project_id in _process_logs:
-                del _process_logs[project_id]
-                print(f"[PreviewStop] Cleared logs for {project_id}")
+            # Clear logs when process stops (sequence numbers keep counting)
+            preview_log_store.clear(project_id)
     
     # Optionally cleanup npm cache
     if cleanup_cache:
@@ -517,6 +521,7 @@ def stop_preview_process(project_id: str, cleanup_cache: bool = False) -> None:
 def cleanup_project_resources(project_id: str) -> None:
     """Cleanup all resources for a project"""
     stop_preview_process(project_id, cleanup_cache=True)
+    preview_log_store.drop(project_id)
 
 
 def preview_status(project_id: str) -> str:
@@ -563,41 +568,10 @@ def get_all_preview_logs(project_id: str) -> str:
     Returns:
         String containing all stored logs
     """
-    if project_id not in _process_logs:
-        return "No logs available for this project"
-    
-    # 추가 중복 제거: 같은 에러 블록이 반복되는 경우
-    logs = _process_logs[project_id]
-    if not logs:
+    text = preview_log_store.deduplicated_text(project_id)
+    if text is None:
         return "No logs available for this project"
-    
-    # 큰 중복 블록 제거 (같은 에러가 여러 번 반복되는 경우)
-    unique_logs = []
-    seen_blocks = set()
-    current_block = []
-    
-    for line in logs:
-        current_block.append(line)
-        
-        # 에러 블록이 끝나는 시점 감지 (GET 요청이나 새로운 시작)
-        if line.startswith('GET /') or line.startswith('> ') or len(current_block) > 50:
-            block_str = '\n'.join(current_block)
-            block_hash = hash(block_str)
-            
-            if block_hash not in seen_blocks:
-                seen_blocks.add(block_hash)
-                unique_logs.extend(current_block)
-            
-            current_block = []
-    
-    # 마지막 블록 처리
-    if current_block:
-        block_str = '\n'.join(current_block)
-        block_hash = hash(block_str)
-        if block_hash not in seen_blocks:
-            unique_logs.extend(current_block)
-    
-    return '\n'.join(unique_logs) if unique_logs else "No unique logs available"
+    return text or "No unique logs available"
 
 def get_preview_error_logs(project_id: str) -> str:
     """
@@ -615,8 +589,9 @@ def get_preview_error_logs(project_id: str) -> str:
         return "No preview process running"
     
     # Prefer aggregated logs collected by the monitor thread for portability
-    if project_id in _process_logs and _process_logs[project_id]:
-        return '\n'.join(_process_logs[project_id])
+    logs = preview_log_store.lines(project_id)
+    if logs:
+        return '\n'.join(logs)
     return "No error logs available"
 
 def get_preview_logs(project_id: str, lines: int = 100) -> str:
@@ -631,7 +606,7 @@ def get_preview_logs(project_id: str, lines: int = 100) -> str:
         String containing the logs
     """
     # Return recent aggregated logs stored in memory
-    logs = _process_logs.get(project_id, [])
+    logs = preview_log_store.tail(project_id, lines)
     if not logs:
         return "No recent logs available"
-    return '\n'.join(logs[-lines:])
+    return '\n'.join(logs)
@@ -0,0 +1,123 @@
+"""
+Write-behind persistence for streamed CLI messages.
+
+Adapters can yield hundreds of messages per instruction. Instead of one
+commit (and one SQLite fsync) per message on the event loop thread, messages
+are handed to a dedicated writer thread that inserts them in batches, flushed
+by size or after a short interval. A single writer per run preserves order.
+"""
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+from app.models.messages import Message
+
+
+_STOP = object()
+
+
+@dataclass
+class WriterStats:
+    rows: int = 0
+    batches: int = 0
+    failed: int = 0
+    db_time_ms: float = 0.0
+
+
+class MessageWriter:
+    """Buffers Message rows and inserts them in batches from a background thread"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+    ):
+        self.engine = engine
+        self.batch_size = max(1, batch_size or settings.message_batch_size)
+        self.flush_interval = max(1, flush_interval_ms or settings.message_flush_interval_ms) / 1000
+        self.stats = WriterStats()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._columns = [c.key for c in Message.__table__.columns]
+
+    def start(self) -> "MessageWriter":
+        self._thread = threading.Thread(target=self._run, name="message-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def add(self, message: Message) -> None:
+        """Queue a message for insertion. The row is snapshotted immediately."""
+        if message.created_at is None:
+            message.created_at = datetime.utcnow()
+        if message.hidden_from_ui is None:
+            metadata = message.metadata_json or {}
+            message.hidden_from_ui = bool(metadata.get("hidden_from_ui", False))
+        row = {col: getattr(message, col) for col in self._columns}
+        self._queue.put(row)
+
+    async def close(self) -> WriterStats:
+        """Flush everything still buffered and stop the writer thread"""
+        if self._thread is None:
+            return self.stats
+        self._queue.put(_STOP)
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+        return self.stats
+
+    # ---- writer thread ---------------------------------------------------
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch: List[Dict[str, Any]] = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(Message.__table__), batch)
+            self.stats.rows += len(batch)
+            self.stats.batches += 1
+        except Exception as e:
+            # Retry row by row so a single bad message doesn't drop the batch
+            ui.warning(f"Batch insert of {len(batch)} messages failed, retrying individually: {e}", "Message")
+            for row in batch:
+                try:
+                    with self.engine.begin() as conn:
+                        conn.execute(insert(Message.__table__), row)
+                    self.stats.rows += 1
+                except Exception as row_error:
+                    self.stats.failed += 1
+                    ui.error(f"Failed to persist message {row.get('id')}: {row_error}", "Message")
+            self.stats.batches += 1
+        finally:
+            self.stats.db_time_ms += (time.perf_counter() - started) * 1000
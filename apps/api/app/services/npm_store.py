@@ -0,0 +1,320 @@
+"""
+Machine-wide content-addressed node_modules store.
+
+Projects are scaffolded from the same template, so most of them resolve to
+the same dependency tree. After a successful `npm install` the resulting
+node_modules is snapshotted into the store under a key derived from the
+lockfile and package.json's dependency sections (plus Node version and
+platform). A lockfile that no longer matches package.json gets no key, so a
+hand-edited package.json always goes through `npm install`. Later installs
+with the same key materialize node_modules with hardlinks instead of hitting
+the network; cross-device stores fall back to `cp --reflink=auto`
+(copy-on-write where the filesystem supports it) or a plain copy.
+
+Hardlinked files share inodes with the store. npm replaces files on update
+rather than writing in place, which keeps the store intact; tool caches under
+node_modules/.cache are never linked.
+"""
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+
+LOCKFILE = "package-lock.json"
+_SKIP_DIRS = {".cache"}
+_DEPENDENCY_SECTIONS = ("dependencies", "devDependencies", "optionalDependencies", "peerDependencies")
+
+
+def _manifest_dependencies(repo_path: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """Dependency sections of package.json (None if it is missing or unreadable)"""
+    try:
+        with open(os.path.join(repo_path, "package.json"), "rb") as f:
+            manifest = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict):
+        return None
+    return {section: manifest.get(section) or {} for section in _DEPENDENCY_SECTIONS}
+
+
+def _lockfile_matches(lock_bytes: bytes, manifest: Dict[str, Dict[str, str]]) -> bool:
+    """Whether the lockfile was generated from this package.json's dependencies"""
+    try:
+        lock = json.loads(lock_bytes)
+    except ValueError:
+        return False
+    root = (lock.get("packages") or {}).get("") if isinstance(lock, dict) else None
+    if not isinstance(root, dict):
+        # lockfileVersion 1 has no root entry; the manifest is still part of the key
+        return True
+    return all((root.get(section) or {}) == manifest[section] for section in _DEPENDENCY_SECTIONS)
+
+
+class NpmStore:
+    """Lockfile-keyed snapshots of installed node_modules trees"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.npm_store_root)
+        self._node_version: Optional[str] = None
+        self._stats_lock = threading.Lock()
+
+    # Keys ----------------------------------------------------------------
+
+    def _get_node_version(self) -> str:
+        if self._node_version is None:
+            try:
+                node = shutil.which("node") or "node"
+                self._node_version = subprocess.run(
+                    [node, "--version"], capture_output=True, text=True, timeout=10
+                ).stdout.strip()
+            except Exception:
+                self._node_version = "unknown"
+        return self._node_version
+
+    def key_for(self, repo_path: str) -> Optional[str]:
+        """Store key for a project, or None when it has no lockfile (or a stale one) yet"""
+        lock_path = os.path.join(repo_path, LOCKFILE)
+        if not os.path.exists(lock_path):
+            return None
+        with open(lock_path, "rb") as f:
+            lock_bytes = f.read()
+        manifest = _manifest_dependencies(repo_path)
+        if manifest is None or not _lockfile_matches(lock_bytes, manifest):
+            # package.json edited by hand after the last install: let `npm install` run
+            return None
+        digest = hashlib.sha256(lock_bytes)
+        digest.update(json.dumps(manifest, sort_keys=True).encode())
+        # Native addons differ per Node ABI and platform
+        digest.update(f"|{self._get_node_version()}|{platform.system()}|{platform.machine()}".encode())
+        return digest.hexdigest()[:32]
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key
+
+    def has(self, key: str) -> bool:
+        return (self._entry_dir(key) / "meta.json").exists()
+
+    # Materialize / populate ----------------------------------------------
+
+    def materialize(self, repo_path: str) -> bool:
+        """
+        Create repo_path/node_modules from the store.
+
+        Returns True on a hit; False when the project has no lockfile or the
+        key is not stored yet (caller should run `npm install` and `populate`).
+        """
+        if not settings.npm_store_enabled:
+            return False
+        key = self.key_for(repo_path)
+        if not key or not self.has(key):
+            self._record(hit=False)
+            return False
+
+        entry = self._entry_dir(key)
+        meta = self._read_meta(entry)
+        target = os.path.join(repo_path, "node_modules")
+        staging = f"{target}.store-{uuid.uuid4().hex[:8]}"
+        started = time.perf_counter()
+        try:
+            linked_bytes = _clone_tree(str(entry / "node_modules"), staging)
+            if os.path.exists(target):
+                shutil.rmtree(target, ignore_errors=True)
+            os.rename(staging, target)
+        except Exception as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            ui.warning(f"npm store materialize failed for {key[:8]}: {e}", "NpmStore")
+            self._record(hit=False)
+            return False
+
+        elapsed = time.perf_counter() - started
+        self._record(
+            hit=True,
+            bytes_saved=linked_bytes,
+            seconds_saved=max(0.0, float(meta.get("install_seconds", 0)) - elapsed),
+        )
+        ui.info(
+            f"node_modules restored from store {key[:8]} in {elapsed:.2f}s "
+            f"(npm install took {meta.get('install_seconds', 0):.1f}s)",
+            "NpmStore",
+        )
+        return True
+
+    def populate(self, repo_path: str, install_seconds: float = 0.0) -> Optional[str]:
+        """Snapshot a freshly installed node_modules into the store"""
+        if not settings.npm_store_enabled:
+            return None
+        key = self.key_for(repo_path)
+        source = os.path.join(repo_path, "node_modules")
+        if not key or self.has(key) or not os.path.isdir(source):
+            return key
+
+        entry = self._entry_dir(key)
+        staging = self.root / f".staging-{key}-{uuid.uuid4().hex[:8]}"
+        try:
+            staging.mkdir(parents=True)
+            size = _clone_tree(source, str(staging / "node_modules"))
+            shutil.copy2(os.path.join(repo_path, LOCKFILE), staging / LOCKFILE)
+            (staging / "meta.json").write_text(json.dumps({
+                "key": key,
+                "node_version": self._get_node_version(),
+                "install_seconds": round(install_seconds, 2),
+                "bytes": size,
+                "created_at": time.time(),
+            }))
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another project populated the same key concurrently
+                shutil.rmtree(staging, ignore_errors=True)
+                return key
+        except Exception as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            ui.warning(f"npm store populate failed for {key[:8]}: {e}", "NpmStore")
+            return None
+
+        ui.info(f"Stored node_modules {key[:8]} ({size / 1024 / 1024:.1f} MB)", "NpmStore")
+        return key
+
+    def warm(self, repo_path: str) -> Optional[str]:
+        """
+        Install a project's lockfile into the store without touching the project.
+
+        Runs `npm ci` in a scratch directory holding only package.json and the
+        lockfile, so it is safe against live preview servers.
+        """
+        if not os.path.exists(os.path.join(repo_path, LOCKFILE)):
+            return None
+        key = self.key_for(repo_path)
+        if key and self.has(key):
+            return key
+
+        from app.services.local_runtime import get_npm_executable
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        scratch = self.root / f".warm-{uuid.uuid4().hex[:8]}"
+        scratch.mkdir()
+        try:
+            for name in ("package.json", LOCKFILE):
+                shutil.copy2(os.path.join(repo_path, name), scratch / name)
+            started = time.perf_counter()
+            subprocess.run(
+                [get_npm_executable(), "ci", "--no-audit", "--no-fund"],
+                cwd=scratch,
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=600,
+            )
+            return self.populate(str(scratch), time.perf_counter() - started)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    def prune(self, keep: int) -> int:
+        """Remove all but the `keep` most recently created entries"""
+        entries = sorted(
+            (self._read_meta(p).get("created_at", 0), p)
+            for p in self._iter_entries()
+        )
+        removed = 0
+        for _created, path in entries[: max(0, len(entries) - keep)]:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        return removed
+
+    # Reporting -----------------------------------------------------------
+
+    def report(self) -> Dict[str, object]:
+        entries = [self._read_meta(p) for p in self._iter_entries()]
+        stats = self._read_stats()
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "store_bytes": sum(int(m.get("bytes", 0)) for m in entries),
+            **stats,
+        }
+
+    def _iter_entries(self):
+        if not self.root.is_dir():
+            return []
+        return [p for p in self.root.iterdir() if p.is_dir() and (p / "meta.json").exists()]
+
+    @staticmethod
+    def _read_meta(entry: Path) -> Dict[str, object]:
+        try:
+            return json.loads((entry / "meta.json").read_text())
+        except Exception:
+            return {}
+
+    def _read_stats(self) -> Dict[str, float]:
+        try:
+            return json.loads((self.root / "stats.json").read_text())
+        except Exception:
+            return {"hits": 0, "misses": 0, "bytes_saved": 0, "seconds_saved": 0.0}
+
+    def _record(self, hit: bool, bytes_saved: int = 0, seconds_saved: float = 0.0) -> None:
+        with self._stats_lock:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                stats = self._read_stats()
+                stats["hits" if hit else "misses"] = stats.get("hits" if hit else "misses", 0) + 1
+                stats["bytes_saved"] = stats.get("bytes_saved", 0) + bytes_saved
+                stats["seconds_saved"] = round(stats.get("seconds_saved", 0.0) + seconds_saved, 2)
+                tmp = self.root / f".stats-{uuid.uuid4().hex[:8]}"
+                tmp.write_text(json.dumps(stats))
+                os.replace(tmp, self.root / "stats.json")
+            except Exception:
+                pass
+
+
+def _clone_tree(src: str, dst: str) -> int:
+    """Hardlink a directory tree; returns bytes shared. Falls back to copying across devices."""
+    total = 0
+    try:
+        for dirpath, dirnames, filenames in os.walk(src):
+            dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+            rel = os.path.relpath(dirpath, src)
+            out_dir = dst if rel == "." else os.path.join(dst, rel)
+            os.makedirs(out_dir, exist_ok=True)
+            # os.walk lists symlinked directories as dirs without following them
+            for name in list(dirnames):
+                src_path = os.path.join(dirpath, name)
+                if os.path.islink(src_path):
+                    os.symlink(os.readlink(src_path), os.path.join(out_dir, name))
+                    dirnames.remove(name)
+            for name in filenames:
+                src_path = os.path.join(dirpath, name)
+                dst_path = os.path.join(out_dir, name)
+                if os.path.islink(src_path):
+                    os.symlink(os.readlink(src_path), dst_path)
+                    continue
+                os.link(src_path, dst_path)
+                total += os.stat(src_path).st_size
+        return total
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+    # Hardlinks unavailable: start over with a (copy-on-write when possible) copy
+    shutil.rmtree(dst, ignore_errors=True)
+    if platform.system() == "Linux" and shutil.which("cp"):
+        subprocess.run(["cp", "-a", "--reflink=auto", src, dst], check=True, capture_output=True)
+    else:
+        shutil.copytree(src, dst, symlinks=True)
+    return 0
+
+
+# Global store instance
+npm_store = NpmStore()
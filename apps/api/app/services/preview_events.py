@@ -0,0 +1,145 @@
+"""
+Thread-safe bridge from preview monitor threads to WebSocket clients.
+
+Each preview server is watched by a reader thread (see local_runtime). Those
+threads never touch asyncio directly: they push events onto a thread-safe
+queue and wake the server's event loop with `call_soon_threadsafe`. A single
+drainer task on the loop groups log lines per project into periodic
+`preview_log` frames, while success/error events are forwarded as-is in
+order, so dozens of preview servers cost one task instead of a loop per line.
+"""
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+
+# (project_id, (seq, log line) or None, event dict or None)
+_Item = Tuple[str, Optional[Tuple[int, str]], Optional[dict]]
+
+
+class PreviewEventBridge:
+    """Forwards preview events from worker threads to the event loop"""
+
+    def __init__(self, flush_interval_ms: Optional[int] = None, max_lines_per_frame: Optional[int] = None):
+        self.flush_interval = (
+            flush_interval_ms if flush_interval_ms is not None else settings.preview_log_flush_interval_ms
+        ) / 1000
+        self.max_lines_per_frame = max_lines_per_frame or settings.preview_log_max_lines_per_frame
+        self._queue: "queue.SimpleQueue[_Item]" = queue.SimpleQueue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake_scheduled = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Bind to the running loop and start the drainer task"""
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._drain_loop())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        # Deliver whatever the monitors produced before shutdown
+        await self._drain()
+        self._loop = None
+
+    # Thread-side API -------------------------------------------------
+
+    def publish_log(self, project_id: str, line: str, seq: int) -> None:
+        """Queue a stored log line; delivered in the next batched `preview_log` frame"""
+        self._put((project_id, (seq, line), None))
+
+    def publish_event(self, project_id: str, message: dict) -> None:
+        """Queue a WebSocket frame (preview_success, preview_error, ...)"""
+        self._put((project_id, None, message))
+
+    def _put(self, item: _Item) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        self._queue.put(item)
+        with self._lock:
+            if self._wake_scheduled:
+                return
+            self._wake_scheduled = True
+        try:
+            loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            # Loop closed between the check and the call
+            pass
+
+    # Loop-side ------------------------------------------------------
+
+    def _wake(self) -> None:
+        with self._lock:
+            self._wake_scheduled = False
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def _drain_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Let lines accumulate so bursts become one frame per project
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self._drain()
+            except Exception as e:
+                ui.error(f"Preview event delivery failed: {e}", "Preview")
+
+    async def _drain(self) -> None:
+        from app.core.websocket.manager import manager
+        from app.services.preview_logs import preview_log_store
+
+        pending: Dict[str, List[Tuple[int, str]]] = {}
+
+        async def flush(project_id: str) -> None:
+            entries = pending.pop(project_id, None)
+            if not entries:
+                return
+            # Wake SSE tails; seq lets WebSocket clients resume via ?since=
+            preview_log_store.notify(project_id)
+            while entries:
+                chunk, entries = entries[: self.max_lines_per_frame], entries[self.max_lines_per_frame:]
+                await manager.send_message(project_id, {
+                    "type": "preview_log",
+                    "lines": [line for _seq, line in chunk],
+                    "first_seq": chunk[0][0],
+                    "last_seq": chunk[-1][0],
+                    "timestamp": int(time.time() * 1000),
+                })
+
+        while True:
+            try:
+                project_id, line, event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if line is not None:
+                pending.setdefault(project_id, []).append(line)
+                continue
+            # Keep ordering: logs that preceded the event go out first
+            await flush(project_id)
+            await manager.send_message(project_id, event)
+
+        for project_id in list(pending):
+            await flush(project_id)
+
+
+# Global bridge instance
+preview_events = PreviewEventBridge()
@@ -0,0 +1,181 @@
+"""
+In-memory preview server logs.
+
+Each project gets a fixed-capacity ring buffer of lines tagged with a
+monotonically increasing sequence number, so clients can tail incrementally
+with `?since=<seq>` instead of re-downloading the whole log. Stopping or
+restarting the preview clears the lines but not the sequence, so a cursor
+from an earlier run never skips lines of the next one. Writers are the
+preview monitor threads; readers are API handlers on the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+LogEntry = Tuple[int, str]
+
+
+class PreviewLogBuffer:
+    """Ring buffer of (seq, line) entries for one project"""
+
+    def __init__(self, capacity: int):
+        self._entries: Deque[LogEntry] = deque(maxlen=capacity)
+        self.last_seq = 0
+        self._dedup_cache: Optional[Tuple[int, str]] = None
+
+    @property
+    def first_seq(self) -> int:
+        return self._entries[0][0] if self._entries else self.last_seq + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, line: str) -> Optional[int]:
+        # 마지막 로그와 같은 경우 무시 (중복 제거)
+        if self._entries and self._entries[-1][1] == line:
+            return None
+        self.last_seq += 1
+        self._entries.append((self.last_seq, line))
+        return self.last_seq
+
+    def clear(self) -> None:
+        # Sequence keeps counting so clients tailing across a restart don't re-read
+        self._entries.clear()
+        self._dedup_cache = None
+
+    def since(self, seq: int, limit: Optional[int] = None) -> List[LogEntry]:
+        """Entries with a sequence number greater than `seq`"""
+        start = max(0, seq + 1 - self.first_seq)
+        stop = start + limit if limit else None
+        return list(islice(self._entries, start, stop))
+
+    def tail(self, lines: int) -> List[str]:
+        start = max(0, len(self._entries) - lines)
+        return [line for _seq, line in islice(self._entries, start, None)]
+
+    def lines(self) -> List[str]:
+        return [line for _seq, line in self._entries]
+
+    def deduplicated_text(self) -> str:
+        """All lines with repeated blocks collapsed, cached until the next append"""
+        if self._dedup_cache and self._dedup_cache[0] == self.last_seq:
+            return self._dedup_cache[1]
+
+        # 큰 중복 블록 제거 (같은 에러가 여러 번 반복되는 경우)
+        unique_logs: List[str] = []
+        seen_blocks = set()
+        current_block: List[str] = []
+
+        for _seq, line in self._entries:
+            current_block.append(line)
+
+            # 에러 블록이 끝나는 시점 감지 (GET 요청이나 새로운 시작)
+            if line.startswith('GET /') or line.startswith('> ') or len(current_block) > 50:
+                block_hash = hash('\n'.join(current_block))
+                if block_hash not in seen_blocks:
+                    seen_blocks.add(block_hash)
+                    unique_logs.extend(current_block)
+                current_block = []
+
+        # 마지막 블록 처리
+        if current_block and hash('\n'.join(current_block)) not in seen_blocks:
+            unique_logs.extend(current_block)
+
+        text = '\n'.join(unique_logs)
+        self._dedup_cache = (self.last_seq, text)
+        return text
+
+
+class PreviewLogStore:
+    """Per-project log buffers plus async wake-ups for streaming readers"""
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity or settings.preview_log_capacity
+        self._buffers: Dict[str, PreviewLogBuffer] = {}
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, asyncio.Event] = {}
+
+    def append(self, project_id: str, line: str) -> Optional[int]:
+        """Store a line; returns its sequence number or None if it was a duplicate"""
+        with self._lock:
+            buffer = self._buffers.get(project_id)
+            if buffer is None:
+                buffer = self._buffers[project_id] = PreviewLogBuffer(self.capacity)
+            return buffer.append(line)
+
+    def clear(self, project_id: str) -> None:
+        with self._lock:
+            buffer = self._buffers.get(project_id)
+            if buffer:
+                buffer.clear()
+
+    def drop(self, project_id: str) -> None:
+        with self._lock:
+            self._buffers.pop(project_id, None)
+
+    def since(
+        self, project_id: str, seq: int, limit: Optional[int] = None
+    ) -> Tuple[List[LogEntry], int, int, bool]:
+        """
+        Incremental read for `?since=<seq>`.
+
+        Returns (entries, first_seq, last_seq, reset). `reset` is True when
+        lines after the client's cursor are gone: the buffer was cleared (preview
+        restarted or hibernated) or overflowed beneath it, or the cursor is ahead
+        of the buffer (API restarted or project deleted). Entries then start from
+        the oldest retained line, `first_seq`.
+        """
+        with self._lock:
+            buffer = self._buffers.get(project_id)
+            if buffer is None:
+                return [], 1, 0, seq > 0
+            reset = seq > buffer.last_seq or 0 < seq < buffer.first_seq - 1
+            entries = buffer.since(0 if reset else seq, limit)
+            return entries, buffer.first_seq, buffer.last_seq, reset
+
+    def tail(self, project_id: str, lines: int) -> List[str]:
+        with self._lock:
+            buffer = self._buffers.get(project_id)
+            return buffer.tail(lines) if buffer else []
+
+    def lines(self, project_id: str) -> List[str]:
+        with self._lock:
+            buffer = self._buffers.get(project_id)
+            return buffer.lines() if buffer else []
+
+    def deduplicated_text(self, project_id: str) -> Optional[str]:
+        with self._lock:
+            buffer = self._buffers.get(project_id)
+            if buffer is None or not len(buffer):
+                return None
+            return buffer.deduplicated_text()
+
+    # Event-loop side ------------------------------------------------
+
+    def notify(self, project_id: str) -> None:
+        """Wake streaming readers of a project (call from the event loop)"""
+        event = self._waiters.pop(project_id, None)
+        if event:
+            event.set()
+
+    async def wait(self, project_id: str, timeout: float) -> bool:
+        """Wait until new lines are announced for a project; False on timeout"""
+        event = self._waiters.get(project_id)
+        if event is None:
+            event = self._waiters[project_id] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+# Global log store instance
+preview_log_store = PreviewLogStore()
@@ -0,0 +1,278 @@
+"""
+Preview server supervisor.
+
+Every preview gets a stable public port served by a small asyncio TCP proxy
+in front of the actual `next dev` process, which listens on an internal port.
+The proxy records the last client activity per project (HTTP requests and
+HMR WebSocket traffic alike), which lets the supervisor:
+
+- cap the number of running dev servers (`PREVIEW_MAX_RUNNING`), hibernating
+  the least recently used one to make room (ones without open connections
+  first);
+- hibernate servers idle for `PREVIEW_IDLE_TIMEOUT`, while always keeping the
+  `PREVIEW_WARM_STANDBY` most recently used ones running;
+- transparently wake a hibernated server when its preview URL is requested
+  again: the connection is held until the health probe passes.
+
+`next dev` binds to its project directory at boot, so a generic pre-spawned
+Node process cannot be handed to a project; warm standby therefore means
+keeping recently used servers alive rather than booting anonymous ones.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+from app.services.local_runtime import (
+    find_free_preview_port,
+    preview_status,
+    start_preview_process,
+    stop_preview_process,
+)
+
+
+@dataclass
+class _Preview:
+    project_id: str
+    repo_path: str
+    public_port: int
+    internal_port: Optional[int] = None
+    state: str = "stopped"  # running | hibernated | starting | stopped
+    last_active: float = field(default_factory=time.monotonic)
+    server: Optional[asyncio.AbstractServer] = None
+    connections: int = 0
+    wakeups: int = 0
+
+
+class PreviewSupervisor:
+    """Caps, hibernates and wakes preview dev servers behind per-project proxies"""
+
+    def __init__(self):
+        self.enabled = settings.preview_supervisor_enabled
+        self._previews: Dict[str, _Preview] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+
+    def _lock_for(self, project_id: str) -> asyncio.Lock:
+        lock = self._locks.get(project_id)
+        if lock is None:
+            lock = self._locks[project_id] = asyncio.Lock()
+        return lock
+
+    # Public API ----------------------------------------------------------
+
+    async def ensure_running(self, project_id: str, repo_path: str, port: Optional[int] = None) -> int:
+        """Start (or wake) the preview and return the port the browser should use"""
+        if not self.enabled:
+            _name, started_port = await asyncio.to_thread(start_preview_process, project_id, repo_path, port)
+            return started_port
+
+        async with self._lock_for(project_id):
+            preview = self._previews.get(project_id)
+            if preview is None:
+                preview = await self._open_proxy(project_id, repo_path, port)
+            preview.repo_path = repo_path
+        await self._wake(preview)
+        return preview.public_port
+
+    async def restart(self, project_id: str, repo_path: str, port: Optional[int] = None) -> int:
+        preview = self._previews.get(project_id)
+        if preview and preview.state == "running":
+            async with self._lock_for(project_id):
+                await self._hibernate(preview)
+        return await self.ensure_running(project_id, repo_path, port)
+
+    async def stop(self, project_id: str) -> None:
+        """Stop the dev server and release the public port"""
+        preview = self._previews.pop(project_id, None)
+        if preview and preview.server:
+            preview.server.close()
+        await asyncio.to_thread(stop_preview_process, project_id)
+
+    def status(self, project_id: str) -> str:
+        """running | hibernated | starting | not_found | stopped"""
+        preview = self._previews.get(project_id)
+        if preview is None:
+            return preview_status(project_id)
+        if preview.state == "running" and preview_status(project_id) != "running":
+            # Dev server crashed; the next request restarts it
+            preview.state = "hibernated"
+        return preview.state
+
+    def public_port(self, project_id: str) -> Optional[int]:
+        preview = self._previews.get(project_id)
+        return preview.public_port if preview else None
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "max_running": settings.preview_max_running,
+            "running": sum(1 for p in self._previews.values() if p.state == "running"),
+            "previews": [
+                {
+                    "project_id": p.project_id,
+                    "state": p.state,
+                    "public_port": p.public_port,
+                    "internal_port": p.internal_port,
+                    "idle_seconds": round(now - p.last_active, 1),
+                    "connections": p.connections,
+                    "wakeups": p.wakeups,
+                }
+                for p in self._previews.values()
+            ],
+        }
+
+    # Lifecycle -----------------------------------------------------------
+
+    def start(self) -> None:
+        if not self.enabled or (self._reaper_task and not self._reaper_task.done()):
+            return
+        self._reaper_task = asyncio.create_task(self._reaper())
+
+    async def close_all(self) -> None:
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            await asyncio.gather(self._reaper_task, return_exceptions=True)
+            self._reaper_task = None
+        for project_id in list(self._previews):
+            await self.stop(project_id)
+
+    # Internals -----------------------------------------------------------
+
+    async def _open_proxy(self, project_id: str, repo_path: str, port: Optional[int]) -> _Preview:
+        public_port = port or await asyncio.to_thread(find_free_preview_port)
+        preview = _Preview(project_id, repo_path, public_port)
+        try:
+            preview.server = await asyncio.start_server(
+                lambda r, w: self._handle_client(preview, r, w),
+                host=settings.preview_proxy_host,
+                port=public_port,
+            )
+        except OSError:
+            raise RuntimeError(f"Preview port {public_port} is not available")
+        self._previews[project_id] = preview
+        return preview
+
+    async def _wake(self, preview: _Preview) -> int:
+        """Start the dev server if needed; returns its internal port (checked under the lock)"""
+        async with self._lock_for(preview.project_id):
+            preview.last_active = time.monotonic()
+            if preview.state == "running" and preview_status(preview.project_id) == "running":
+                return preview.internal_port
+            await self._make_room(exclude=preview.project_id)
+            preview.state = "starting"
+            try:
+                internal_port = await asyncio.to_thread(find_free_preview_port)
+                await asyncio.to_thread(
+                    start_preview_process, preview.project_id, preview.repo_path, internal_port
+                )
+            except Exception:
+                preview.state = "stopped"
+                raise
+            preview.internal_port = internal_port
+            preview.state = "running"
+            preview.wakeups += 1
+            ui.info(
+                f"Preview {preview.project_id} running on :{preview.public_port} -> :{internal_port}",
+                "Preview",
+            )
+            return internal_port
+
+    async def _hibernate(self, preview: _Preview) -> None:
+        await asyncio.to_thread(stop_preview_process, preview.project_id)
+        preview.state = "hibernated"
+        preview.internal_port = None
+        ui.info(f"Preview {preview.project_id} hibernated", "Preview")
+
+    async def _make_room(self, exclude: str) -> None:
+        running = [p for p in self._previews.values() if p.state == "running" and p.project_id != exclude]
+        excess = len(running) - settings.preview_max_running + 1
+        # Previews without open connections (HMR sockets) go first, least recently used first
+        for victim in sorted(running, key=lambda p: (p.connections > 0, p.last_active)):
+            if excess <= 0:
+                return
+            lock = self._lock_for(victim.project_id)
+            if lock.locked():
+                continue
+            async with lock:
+                if victim.state != "running":
+                    continue
+                await self._hibernate(victim)
+            excess -= 1
+        if excess > 0:
+            ui.warning(f"Preview cap of {settings.preview_max_running} exceeded: other previews are busy", "Preview")
+
+    async def _reaper(self) -> None:
+        while True:
+            await asyncio.sleep(settings.preview_reap_interval)
+            try:
+                now = time.monotonic()
+                # Most recently used first; the first N stay warm regardless of idleness
+                running = sorted(
+                    (p for p in self._previews.values() if p.state == "running"),
+                    key=lambda p: p.last_active,
+                    reverse=True,
+                )
+                for preview in running[settings.preview_warm_standby:]:
+                    idle = now - preview.last_active
+                    if preview.connections or idle < settings.preview_idle_timeout:
+                        continue
+                    lock = self._lock_for(preview.project_id)
+                    if lock.locked():
+                        continue
+                    async with lock:
+                        await self._hibernate(preview)
+            except Exception as e:
+                ui.warning(f"Preview reaper failed: {e}", "Preview")
+
+    async def _handle_client(
+        self, preview: _Preview, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        preview.connections += 1
+        preview.last_active = time.monotonic()
+        upstream_writer = None
+        try:
+            internal_port = await self._wake(preview)
+            upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", internal_port)
+
+            async def pipe(src: asyncio.StreamReader, dst: asyncio.StreamWriter, client_side: bool) -> None:
+                try:
+                    while True:
+                        data = await src.read(65536)
+                        if not data:
+                            break
+                        if client_side:
+                            preview.last_active = time.monotonic()
+                        dst.write(data)
+                        await dst.drain()
+                finally:
+                    try:
+                        dst.close()
+                    except Exception:
+                        pass
+
+            await asyncio.gather(
+                pipe(reader, upstream_writer, True),
+                pipe(upstream_reader, writer, False),
+                return_exceptions=True,
+            )
+        except Exception as e:
+            ui.debug(f"Preview proxy connection for {preview.project_id} failed: {e}", "Preview")
+        finally:
+            preview.connections -= 1
+            preview.last_active = time.monotonic()
+            for w in (writer, upstream_writer):
+                if w is not None:
+                    try:
+                        w.close()
+                    except Exception:
+                        pass
+
+
+# Global supervisor instance
+preview_supervisor = PreviewSupervisor()
@@ -38,7 +38,7 @@ async def initialize_project(project_id: str, name: str) -> str:
     ensure_dir(assets_path)
     
     try:
-        # Scaffold NextJS project using create-next-app (includes automatic git init)
+        # Scaffold NextJS project from the cached template (create-next-app on first run)
         scaffold_nextjs_minimal(project_path)
         
         # CRITICAL: Force create independent git repository for each project
@@ -90,6 +90,9 @@ async def cleanup_project(project_id: str) -> bool:
     # 1) Ensure any running preview processes for this project are terminated
     try:
         from app.services.local_runtime import cleanup_project_resources
+        from app.services.preview_supervisor import preview_supervisor
+        # Release the preview proxy port as well
+        await preview_supervisor.stop(project_id)
         cleanup_project_resources(project_id)
     except Exception as e:
         # Do not fail cleanup because of process stop errors
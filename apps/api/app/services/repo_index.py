@@ -0,0 +1,363 @@
+"""
+Per-project file index for the editor tree.
+
+The index holds one entry per path (type, size, mtime) and a revision number
+that bumps on every change, so the tree API can answer recursive `?depth=`
+listings, ETags and "changes since revision N" without touching the disk.
+
+Ignore rules control descent, not visibility: `.git`, `node_modules`,
+`.next` and directories matched by the root `.gitignore` are listed (flagged
+`ignored`) but never walked into.
+
+Freshness comes from a filesystem watcher when `watchdog` is installed (one
+non-recursive watch per indexed directory, so ignored trees cost nothing);
+otherwise the index rescans at most every `REPO_INDEX_POLL_INTERVAL` seconds.
+Either way only the difference is recorded as changes.
+"""
+from __future__ import annotations
+
+import fnmatch
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+
+ALWAYS_IGNORED = {".git", "node_modules", ".next"}
+ROOT = "."
+
+
+@dataclass
+class IndexEntry:
+    type: str  # file | dir
+    size: Optional[int]
+    mtime_ns: int
+    ignored: bool = False
+
+    def same_as(self, other: "IndexEntry") -> bool:
+        return (self.type, self.size, self.mtime_ns, self.ignored) == (
+            other.type, other.size, other.mtime_ns, other.ignored
+        )
+
+
+def _parent(path: str) -> str:
+    head = path.rpartition("/")[0]
+    return head or ROOT
+
+
+def _is_under(path: str, directory: str) -> bool:
+    return directory == ROOT or path.startswith(directory + "/")
+
+
+def _depth(path: str, directory: str) -> int:
+    rel = path if directory == ROOT else path[len(directory) + 1:]
+    return rel.count("/") + 1
+
+
+class GitIgnore:
+    """Minimal root .gitignore matcher (globs, dir-only `/` suffix, anchors, `!` negation)"""
+
+    def __init__(self, root: str):
+        self.rules: List[Tuple[str, bool, bool, bool]] = []  # pattern, negate, dir_only, anchored
+        try:
+            with open(os.path.join(root, ".gitignore"), "r", encoding="utf-8", errors="ignore") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            lines = []
+        for raw in lines:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            self.rules.append((line.lstrip("/"), negate, dir_only, anchored))
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        ignored = False
+        name = path.rpartition("/")[2]
+        for pattern, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            target = path if anchored else name
+            if fnmatch.fnmatchcase(target, pattern):
+                ignored = not negate
+        return ignored
+
+
+class _WatchHandler(FileSystemEventHandler):
+    def __init__(self, index: "RepoIndex"):
+        self.index = index
+
+    def on_any_event(self, event):
+        for attr in ("src_path", "dest_path"):
+            path = getattr(event, attr, None)
+            if path:
+                self.index.mark_dirty(os.fsdecode(path), bool(event.is_directory))
+
+
+class RepoIndex:
+    """Cached file index for one project repository"""
+
+    def __init__(self, root: str):
+        self.root = os.path.normpath(root)
+        self.instance = uuid.uuid4().hex[:8]
+        self.revision = 0
+        self.entries: Dict[str, IndexEntry] = {}
+        self._changes: Deque[Tuple[int, str, str]] = deque(maxlen=settings.repo_index_max_changes)
+        self._lock = threading.RLock()
+        self._dirty: Set[str] = set()
+        self._built = False
+        self._last_scan = 0.0
+        self._gitignore = GitIgnore(self.root)
+        self._observer = None
+        self._watches: Dict[str, object] = {}
+
+    # Public --------------------------------------------------------------
+
+    @property
+    def etag(self) -> str:
+        return f'W/"{self.instance}-{self.revision}"'
+
+    def refresh(self) -> None:
+        """Bring the index up to date (cheap when nothing changed)"""
+        with self._lock:
+            if not self._built:
+                self._scan(ROOT, recursive=True, record=False)
+                self._built = True
+                self._last_scan = time.monotonic()
+                self._start_watcher()
+                return
+            if self._observer is not None:
+                dirty, self._dirty = self._dirty, set()
+                for rel_dir in sorted(dirty, key=lambda d: d.count("/")):
+                    if rel_dir == ROOT or rel_dir in self.entries:
+                        self._scan(rel_dir, recursive=False)
+            elif time.monotonic() - self._last_scan >= settings.repo_index_poll_interval:
+                self._scan(ROOT, recursive=True)
+                self._last_scan = time.monotonic()
+
+    def listing(self, directory: str, depth: Optional[int], include_ignored: bool = True) -> List[Tuple[str, IndexEntry]]:
+        """Entries under `directory` up to `depth` levels (None = unlimited)"""
+        with self._lock:
+            result = [
+                (path, entry)
+                for path, entry in self.entries.items()
+                if _is_under(path, directory)
+                and (depth is None or _depth(path, directory) <= depth)
+                and (include_ignored or not entry.ignored)
+            ]
+        result.sort(key=lambda item: (_parent(item[0]), item[1].type == "file", item[0].lower()))
+        return result
+
+    def snapshot(
+        self, directory: str, depth: Optional[int], include_ignored: bool = True
+    ) -> Tuple[Optional[List[Tuple[str, IndexEntry]]], str, int]:
+        """Refresh, then (listing, etag, revision) read under one lock hold so they agree.
+
+        The listing is None when `directory` is not indexed (ignored or missing).
+        """
+        with self._lock:
+            self.refresh()
+            if directory != ROOT and (directory not in self.entries or self.entries[directory].ignored):
+                return None, self.etag, self.revision
+            return self.listing(directory, depth, include_ignored), self.etag, self.revision
+
+    def changes_snapshot(self, revision: int) -> Tuple[Optional[List[dict]], int]:
+        """Refresh, then (changes_since(revision), current revision) under one lock hold"""
+        with self._lock:
+            self.refresh()
+            return self.changes_since(revision), self.revision
+
+    def changes_since(self, revision: int) -> Optional[List[dict]]:
+        """Changes after `revision`, or None when they are no longer retained"""
+        with self._lock:
+            if revision > self.revision:
+                return None
+            if revision < self.revision and (not self._changes or self._changes[0][0] > revision + 1):
+                return None
+            changes = []
+            for rev, op, path in self._changes:
+                if rev <= revision:
+                    continue
+                entry = self.entries.get(path)
+                changes.append({
+                    "revision": rev,
+                    "op": op,
+                    "path": path,
+                    "type": entry.type if entry else None,
+                    "size": entry.size if entry else None,
+                })
+            return changes
+
+    def close(self) -> None:
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+            except Exception:
+                pass
+            self._observer = None
+
+    # Watcher -------------------------------------------------------------
+
+    def mark_dirty(self, abs_path: str, is_dir: bool) -> None:
+        rel = os.path.relpath(abs_path, self.root).replace(os.sep, "/")
+        if rel.startswith(".."):
+            return
+        with self._lock:
+            self._dirty.add(_parent(rel) if rel != ROOT else ROOT)
+            if is_dir and rel != ROOT:
+                self._dirty.add(rel)
+
+    def _start_watcher(self) -> None:
+        if not WATCHDOG_AVAILABLE or not settings.repo_index_watch:
+            return
+        try:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._watch_dir(ROOT)
+            for path, entry in self.entries.items():
+                if entry.type == "dir" and not entry.ignored:
+                    self._watch_dir(path)
+            self._observer.start()
+        except Exception as e:
+            ui.warning(f"File watcher unavailable, falling back to polling: {e}", "RepoIndex")
+            self._observer = None
+            self._watches.clear()
+
+    def _watch_dir(self, rel_dir: str) -> None:
+        if self._observer is None or rel_dir in self._watches:
+            return
+        abs_dir = self.root if rel_dir == ROOT else os.path.join(self.root, rel_dir)
+        try:
+            self._watches[rel_dir] = self._observer.schedule(_WatchHandler(self), abs_dir, recursive=False)
+        except Exception:
+            pass
+
+    def _unwatch_dir(self, rel_dir: str) -> None:
+        watch = self._watches.pop(rel_dir, None)
+        if watch is not None and self._observer is not None:
+            try:
+                self._observer.unschedule(watch)
+            except Exception:
+                pass
+
+    # Scanning ------------------------------------------------------------
+
+    def _read_dir(self, rel_dir: str, recursive: bool, out: Dict[str, IndexEntry]) -> None:
+        abs_dir = self.root if rel_dir == ROOT else os.path.join(self.root, rel_dir)
+        try:
+            with os.scandir(abs_dir) as it:
+                children = list(it)
+        except OSError:
+            return
+        for child in children:
+            rel = child.name if rel_dir == ROOT else f"{rel_dir}/{child.name}"
+            try:
+                is_dir = child.is_dir(follow_symlinks=False)
+                st = child.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            ignored = child.name in ALWAYS_IGNORED or self._gitignore.matches(rel, is_dir)
+            out[rel] = IndexEntry(
+                type="dir" if is_dir else "file",
+                size=None if is_dir else st.st_size,
+                mtime_ns=0 if is_dir else st.st_mtime_ns,
+                ignored=ignored,
+            )
+            if is_dir and recursive and not ignored:
+                self._read_dir(rel, True, out)
+
+    def _scan(self, rel_dir: str, recursive: bool, record: bool = True) -> None:
+        fresh: Dict[str, IndexEntry] = {}
+        self._read_dir(rel_dir, recursive, fresh)
+        if recursive:
+            old = {p for p in self.entries if _is_under(p, rel_dir)}
+        else:
+            old = {p for p in self.entries if _parent(p) == rel_dir}
+
+        changed = False
+        for path in old - fresh.keys():
+            entry = self.entries.pop(path)
+            if entry.type == "dir":
+                # Drop the subtree of a removed directory
+                for sub in [p for p in self.entries if _is_under(p, path)]:
+                    del self.entries[sub]
+                    self._record(record, "delete", sub)
+                self._unwatch_dir(path)
+            self._record(record, "delete", path)
+            changed = True
+
+        for path, entry in fresh.items():
+            previous = self.entries.get(path)
+            if previous is not None and previous.same_as(entry):
+                continue
+            self.entries[path] = entry
+            self._record(record, "add" if previous is None else "modify", path)
+            changed = True
+            if entry.type == "dir" and not entry.ignored:
+                if previous is None and not recursive:
+                    self._scan(path, recursive=True, record=record)
+                self._watch_dir(path)
+
+        if changed and rel_dir == ROOT:
+            # Rule changes can hide or reveal whole subtrees
+            gitignore = GitIgnore(self.root)
+            if gitignore.rules != self._gitignore.rules:
+                self._gitignore = gitignore
+                self._scan(ROOT, recursive=True, record=record)
+
+    def _record(self, record: bool, op: str, path: str) -> None:
+        self.revision += 1
+        if record:
+            self._changes.append((self.revision, op, path))
+
+
+class RepoIndexRegistry:
+    """LRU of per-project indexes (each may hold a watcher)"""
+
+    def __init__(self, max_projects: Optional[int] = None):
+        self.max_projects = max_projects or settings.repo_index_max_projects
+        self._indexes: "OrderedDict[str, RepoIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, project_id: str, root: str) -> RepoIndex:
+        with self._lock:
+            index = self._indexes.get(project_id)
+            if index is not None and index.root == os.path.normpath(root):
+                self._indexes.move_to_end(project_id)
+                return index
+            if index is not None:
+                index.close()
+            index = self._indexes[project_id] = RepoIndex(root)
+            while len(self._indexes) > self.max_projects:
+                _pid, evicted = self._indexes.popitem(last=False)
+                evicted.close()
+            return index
+
+    def invalidate(self, project_id: str) -> None:
+        with self._lock:
+            index = self._indexes.pop(project_id, None)
+        if index is not None:
+            index.close()
+
+
+# Global index registry
+repo_indexes = RepoIndexRegistry()
@@ -0,0 +1,202 @@
+"""
+Request Queue
+Durable scheduling of ACT/chat executions backed by the user_requests table.
+
+Pending work is persisted as UserRequest rows, so the in-memory queue can be
+rebuilt after a restart. A bounded pool of asyncio workers executes requests
+one at a time per project, with a concurrency cap per CLI type.
+"""
+import asyncio
+import os
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+from app.db.session import SessionLocal
+from app.models.user_requests import UserRequest
+
+
+RequestRunner = Callable[[str], Awaitable[None]]
+
+
+class QueueFullError(Exception):
+    """Raised when a project already has too many pending requests"""
+
+
+@dataclass
+class QueuedRequest:
+    request_id: str
+    project_id: str
+    request_type: str  # act, chat
+    cli_type: str
+
+
+class RequestQueue:
+    """Per-project serialized worker pool for CLI executions"""
+
+    def __init__(self):
+        # project_id -> pending requests (FIFO). Project order rotates for fairness.
+        self._pending: "OrderedDict[str, Deque[QueuedRequest]]" = OrderedDict()
+        self._running: Dict[str, QueuedRequest] = {}  # project_id -> running request
+        self._running_by_cli: Dict[str, int] = {}
+        self._runners: Dict[str, RequestRunner] = {}
+        self._workers: List[asyncio.Task] = []
+        self._cond: Optional[asyncio.Condition] = None
+
+    def register_runner(self, request_type: str, runner: RequestRunner) -> None:
+        """Register the coroutine that executes requests of the given type"""
+        self._runners[request_type] = runner
+
+    def cli_limit(self, cli_type: str) -> int:
+        override = os.getenv(f"QUEUE_CLI_CONCURRENCY_{cli_type.upper()}")
+        try:
+            return max(1, int(override)) if override else max(1, settings.queue_cli_concurrency)
+        except ValueError:
+            return max(1, settings.queue_cli_concurrency)
+
+    def pending_count(self, project_id: str) -> int:
+        return len(self._pending.get(project_id, ()))
+
+    def is_running(self, project_id: str) -> bool:
+        return project_id in self._running
+
+    def ensure_capacity(self, project_id: str) -> None:
+        """Admission control: reject new work when the project backlog is full"""
+        if self.pending_count(project_id) >= settings.queue_max_pending_per_project:
+            raise QueueFullError(
+                f"Project {project_id} already has {self.pending_count(project_id)} pending requests"
+            )
+
+    async def enqueue(self, request_id: str, project_id: str, request_type: str, cli_type: str) -> int:
+        """Add a persisted UserRequest to the queue. Returns its position (0 = starts now)."""
+        job = QueuedRequest(request_id, project_id, request_type, cli_type)
+        self._pending.setdefault(project_id, deque()).append(job)
+
+        position = self.pending_count(project_id) - 1
+        if self.is_running(project_id):
+            position += 1
+
+        if self._cond is not None:
+            async with self._cond:
+                self._cond.notify_all()
+        return position
+
+    async def start(self, num_workers: Optional[int] = None) -> None:
+        """Recover unfinished requests from the database and spawn workers"""
+        if self._workers:
+            return
+        self._cond = asyncio.Condition()
+        self._recover()
+
+        num_workers = max(1, num_workers or settings.queue_workers)
+        for idx in range(num_workers):
+            self._workers.append(asyncio.create_task(self._worker(idx)))
+        ui.info(f"Request queue started with {num_workers} workers", "Queue")
+
+    async def stop(self) -> None:
+        """Cancel workers. Interrupted requests are resumed on next start."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "running": {pid: job.request_id for pid, job in self._running.items()},
+            "running_by_cli": dict(self._running_by_cli),
+            "pending": {pid: len(jobs) for pid, jobs in self._pending.items() if jobs},
+        }
+
+    # ---- internals -----------------------------------------------------
+
+    def _recover(self) -> None:
+        """Re-enqueue requests left unfinished by a previous process"""
+        db = SessionLocal()
+        try:
+            unfinished = (
+                db.query(UserRequest)
+                .filter(UserRequest.is_completed == False)  # noqa: E712
+                .filter(UserRequest.queue_payload.isnot(None))
+                .order_by(UserRequest.created_at)
+                .all()
+            )
+            resumed = 0
+            for req in unfinished:
+                if req.started_at is not None and (req.attempts or 0) >= settings.queue_max_attempts:
+                    req.is_completed = True
+                    req.is_successful = False
+                    req.completed_at = datetime.utcnow()
+                    req.error_message = "Request was interrupted by a server restart"
+                    continue
+
+                req.started_at = None
+                payload = req.queue_payload or {}
+                job = QueuedRequest(
+                    request_id=req.id,
+                    project_id=req.project_id,
+                    request_type=req.request_type or "act",
+                    cli_type=payload.get("cli_preference") or "claude",
+                )
+                self._pending.setdefault(req.project_id, deque()).append(job)
+                resumed += 1
+            db.commit()
+            if resumed:
+                ui.info(f"Resumed {resumed} queued requests", "Queue")
+        except Exception as e:
+            db.rollback()
+            ui.error(f"Failed to recover queued requests: {e}", "Queue")
+        finally:
+            db.close()
+
+    def _take_runnable(self) -> Optional[QueuedRequest]:
+        for project_id, jobs in list(self._pending.items()):
+            if not jobs:
+                del self._pending[project_id]
+                continue
+            if project_id in self._running:
+                continue
+            job = jobs[0]
+            if self._running_by_cli.get(job.cli_type, 0) >= self.cli_limit(job.cli_type):
+                continue
+            jobs.popleft()
+            if jobs:
+                self._pending.move_to_end(project_id)
+            else:
+                del self._pending[project_id]
+            return job
+        return None
+
+    async def _worker(self, worker_id: int) -> None:
+        assert self._cond is not None
+        while True:
+            async with self._cond:
+                job = self._take_runnable()
+                while job is None:
+                    await self._cond.wait()
+                    job = self._take_runnable()
+                self._running[job.project_id] = job
+                self._running_by_cli[job.cli_type] = self._running_by_cli.get(job.cli_type, 0) + 1
+
+            try:
+                runner = self._runners.get(job.request_type)
+                if runner is None:
+                    ui.error(f"No runner registered for request type '{job.request_type}'", "Queue")
+                else:
+                    await runner(job.request_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                ui.error(f"Queued request {job.request_id[:8]}... failed: {e}", "Queue")
+            finally:
+                async with self._cond:
+                    self._running.pop(job.project_id, None)
+                    self._running_by_cli[job.cli_type] = max(0, self._running_by_cli.get(job.cli_type, 1) - 1)
+                    self._cond.notify_all()
+
+
+# Global request queue instance
+request_queue = RequestQueue()
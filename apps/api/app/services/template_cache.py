@@ -0,0 +1,250 @@
+"""
+Pre-built project template cache.
+
+Running `npx create-next-app` for every project dominates project creation
+time. Instead the scaffold is built once per create-next-app version into
+data/templates/<key>/repo (with a package-lock.json, so the shared npm store
+can key node_modules immediately) and new projects are created by copying
+that snapshot (copy-on-write via `cp --reflink=auto` where supported).
+
+A background task checks for new create-next-app releases and rebuilds the
+template off the request path. In offline mode no network is touched: the
+newest local template is used, and project creation fails only if none
+exists.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.terminal_ui import ui
+
+
+TEMPLATE_NAME = "nextjs"
+# Never part of a template snapshot
+_EXCLUDE = {".git", "node_modules", ".next"}
+
+
+class TemplateCache:
+    """Versioned snapshots of the create-next-app scaffold"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.template_cache_root)
+        self._build_lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    # Lookup --------------------------------------------------------------
+
+    @staticmethod
+    def _flags_hash() -> str:
+        from app.services.filesystem import create_next_app_args
+
+        return hashlib.sha256(" ".join(create_next_app_args("repo")).encode()).hexdigest()[:8]
+
+    def _key(self, version: str) -> str:
+        return f"{TEMPLATE_NAME}-{version}-{self._flags_hash()}"
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        if not self.root.is_dir():
+            return []
+        entries = []
+        flags = self._flags_hash()
+        for path in self.root.iterdir():
+            meta_path = path / "meta.json"
+            if not meta_path.exists():
+                continue
+            try:
+                meta = json.loads(meta_path.read_text())
+            except Exception:
+                continue
+            if meta.get("flags") == flags:
+                meta["path"] = str(path / "repo")
+                entries.append(meta)
+        return sorted(entries, key=lambda m: m.get("built_at", 0), reverse=True)
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """Metadata of the newest usable template, if any"""
+        entries = self._entries()
+        return entries[0] if entries else None
+
+    def latest_version(self) -> Optional[str]:
+        """Latest create-next-app release from the registry (None when offline/unreachable)"""
+        if settings.template_offline:
+            return None
+        try:
+            from app.services.local_runtime import get_npm_executable
+
+            result = subprocess.run(
+                [get_npm_executable(), "view", "create-next-app", "version"],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+            version = result.stdout.strip()
+            return version or None
+        except Exception:
+            return None
+
+    # Build / snapshot ----------------------------------------------------
+
+    def build(self, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Run create-next-app once into the cache (blocking, minutes)"""
+        if settings.template_offline:
+            raise RuntimeError("Template cache is in offline mode; cannot build a new template")
+
+        from app.services.filesystem import create_next_app_args
+
+        version = version or self.latest_version() or "latest"
+        with self._build_lock:
+            existing = next((m for m in self._entries() if m.get("version") == version), None)
+            if existing:
+                return existing
+
+            self.root.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=".build-", dir=self.root))
+            try:
+                base_cmd = ["npx", f"create-next-app@{version}"] + create_next_app_args("repo")
+                cmd = ["cmd.exe", "/c"] + base_cmd if os.name == "nt" else base_cmd
+                env = os.environ.copy()
+                env["CI"] = "true"  # Force non-interactive mode
+
+                ui.info(f"Building project template with create-next-app@{version}", "Template")
+                started = time.perf_counter()
+                subprocess.run(cmd, cwd=staging, env=env, check=True, capture_output=True, text=True, timeout=600)
+                repo = staging / "repo"
+                shutil.rmtree(repo / ".git", ignore_errors=True)
+                self._lock_dependencies(repo)
+                return self._commit(staging, version, time.perf_counter() - started)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def store_from(self, repo_path: str, version: str = "latest") -> Optional[Dict[str, Any]]:
+        """Snapshot a scaffold that was just created in place (first-run fallback)"""
+        with self._build_lock:
+            if any(m.get("version") == version for m in self._entries()):
+                return None
+            self.root.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=".build-", dir=self.root))
+            try:
+                shutil.copytree(
+                    repo_path,
+                    staging / "repo",
+                    symlinks=True,
+                    ignore=lambda _dir, names: [n for n in names if n in _EXCLUDE],
+                )
+                return self._commit(staging, version, 0.0)
+            except Exception as e:
+                ui.warning(f"Could not snapshot project template: {e}", "Template")
+                return None
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _lock_dependencies(self, repo: Path) -> None:
+        """Add package-lock.json so every project shares one npm store key"""
+        try:
+            from app.services.local_runtime import get_npm_executable
+
+            subprocess.run(
+                [get_npm_executable(), "install", "--package-lock-only", "--no-audit", "--no-fund"],
+                cwd=repo,
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+        except Exception as e:
+            ui.warning(f"Template built without package-lock.json: {e}", "Template")
+
+    def _commit(self, staging: Path, version: str, build_seconds: float) -> Dict[str, Any]:
+        meta = {
+            "template": TEMPLATE_NAME,
+            "version": version,
+            "flags": self._flags_hash(),
+            "built_at": time.time(),
+            "build_seconds": round(build_seconds, 2),
+        }
+        (staging / "meta.json").write_text(json.dumps(meta))
+        target = self.root / self._key(version)
+        if target.exists():
+            shutil.rmtree(target, ignore_errors=True)
+        os.rename(staging, target)
+        self._prune()
+        ui.success(f"Project template {version} cached", "Template")
+        meta["path"] = str(target / "repo")
+        return meta
+
+    def _prune(self) -> None:
+        for meta in self._entries()[settings.template_cache_keep:]:
+            shutil.rmtree(Path(meta["path"]).parent, ignore_errors=True)
+
+    # Materialize ---------------------------------------------------------
+
+    def materialize(self, repo_path: str) -> bool:
+        """Copy the newest template into repo_path; False when no template is cached"""
+        meta = self.current()
+        if not meta:
+            return False
+        source = meta["path"]
+        started = time.perf_counter()
+        Path(repo_path).mkdir(parents=True, exist_ok=True)
+        if platform.system() == "Linux" and shutil.which("cp"):
+            subprocess.run(
+                ["cp", "-a", "--reflink=auto", f"{source}/.", repo_path],
+                check=True,
+                capture_output=True,
+            )
+        else:
+            shutil.copytree(source, repo_path, symlinks=True, dirs_exist_ok=True)
+        ui.info(
+            f"Created project from template {meta['version']} in {time.perf_counter() - started:.2f}s",
+            "Template",
+        )
+        return True
+
+    # Background refresh --------------------------------------------------
+
+    async def refresh(self) -> None:
+        if settings.template_offline:
+            return
+        latest = await asyncio.to_thread(self.latest_version)
+        current = self.current()
+        if current and (latest is None or current.get("version") == latest):
+            return
+        await asyncio.to_thread(self.build, latest)
+
+    def start_background_refresh(self, interval: Optional[float] = None) -> None:
+        """Build the template if missing and rebuild on new create-next-app releases"""
+        if settings.template_offline or (self._refresh_task and not self._refresh_task.done()):
+            return
+        interval = interval or settings.template_refresh_interval
+
+        async def _loop() -> None:
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    ui.warning(f"Template refresh failed: {e}", "Template")
+                await asyncio.sleep(interval)
+
+        self._refresh_task = asyncio.create_task(_loop())
+
+    async def stop_background_refresh(self) -> None:
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+
+# Global template cache
+template_cache = TemplateCache()
@@ -40,7 +40,7 @@ const hexToFilter = (hex: string): string => {
   return filters[hex] || '';
 };
 
-type Entry = { path: string; type: 'file'|'dir'; size?: number };
+type Entry = { path: string; type: 'file'|'dir'; size?: number; ignored?: boolean };
 type Params = { params: { project_id: string } };
 type ProjectStatus = 'initializing' | 'active' | 'failed';
 
@@ -446,25 +446,29 @@ export default function ChatPage({ params }: Params) {
 
   async function loadTree(dir = '.') {
     try {
-      const r = await fetch(`${API_BASE}/api/repo/${projectId}/tree?dir=${encodeURIComponent(dir)}`);
+      // depth=2: root entries plus the contents of each root directory in one round trip
+      const r = await fetch(`${API_BASE}/api/repo/${projectId}/tree?dir=${encodeURIComponent(dir)}&depth=2`);
       const data = await r.json();
       
       // Ensure data is an array
       if (Array.isArray(data)) {
-        setTree(data);
+        const parentOf = (path: string) => {
+          const idx = path.lastIndexOf('/');
+          return idx === -1 ? '.' : path.slice(0, idx);
+        };
+        const rootDir = dir === '.' ? '.' : dir.replace(/\/+$/, '');
+        const rootEntries = data.filter((entry: Entry) => parentOf(entry.path) === rootDir);
+        setTree(rootEntries);
         
-        // Load contents for all directories in the root
+        // Group second-level entries under their root directory
+        // (ignored dirs like node_modules are not indexed and load on expand)
         const newFolderContents = new Map();
-        
-        // Process each directory
-        for (const entry of data) {
-          if (entry.type === 'dir') {
-            try {
-              const subContents = await loadSubdirectory(entry.path);
-              newFolderContents.set(entry.path, subContents);
-            } catch (err) {
-              console.error(`Failed to load contents for ${entry.path}:`, err);
-            }
+        for (const entry of rootEntries) {
+          if (entry.type === 'dir' && !entry.ignored) {
+            newFolderContents.set(
+              entry.path,
+              data.filter((child: Entry) => parentOf(child.path) === entry.path)
+            );
           }
         }
         
@@ -569,7 +573,11 @@ export default function ChatPage({ params }: Params) {
       }
       
       const data = await r.json();
-      setContent(data.content || '');
+      if (data.binary) {
+        setContent(`// Binary file (${data.size} bytes) - not shown`);
+      } else {
+        setContent(data.content || '');
+      }
       setSelectedFile(path);
     } catch (error) {
       console.error('Error opening file:', error);
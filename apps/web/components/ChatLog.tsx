@@ -176,9 +176,44 @@ export default function ChatLog({ projectId, onSessionStatusChange, onProjectSta
         if (exists) {
           return prev;
         }
+        // Consolidated message takes the place of its live preview
+        const previewIndex = message.stream_id ? prev.findIndex(msg => msg.id === message.stream_id) : -1;
+        if (previewIndex >= 0) {
+          const next = [...prev];
+          next[previewIndex] = chatMessage;
+          return next;
+        }
         return [...prev, chatMessage];
       });
     },
+    onMessageDelta: (delta) => {
+      setIsWaitingForResponse(false);
+      setMessages(prev => {
+        const index = prev.findIndex(msg => msg.id === delta.stream_id);
+        const existing = index >= 0 ? prev[index] : null;
+        if (delta.done) {
+          if (!existing) return prev;
+          const next = [...prev];
+          next[index] = { ...existing, metadata_json: { ...existing.metadata_json, streaming: false } };
+          return next;
+        }
+        const thought = (existing?.metadata_json?.thought || '') + (delta.thought || '');
+        const text = (existing?.metadata_json?.text || '') + (delta.text || '');
+        const preview: ChatMessage = {
+          id: delta.stream_id,
+          role: 'assistant',
+          message_type: 'chat',
+          content: [thought.trim(), text].filter(Boolean).join('\n\n'),
+          metadata_json: { streaming: true, thought, text },
+          conversation_id: delta.conversation_id,
+          created_at: existing?.created_at || new Date().toISOString()
+        };
+        if (!existing) return [...prev, preview];
+        const next = [...prev];
+        next[index] = preview;
+        return next;
+      });
+    },
     onStatus: (status, data) => {
       
       // Handle project status updates
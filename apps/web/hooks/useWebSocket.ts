@@ -3,11 +3,12 @@
  * Manages WebSocket connection for real-time updates
  */
 import { useEffect, useRef, useCallback, useState } from 'react';
-import { Message } from '@/types/chat';
+import { Message, MessageDelta } from '@/types/chat';
 
 interface WebSocketOptions {
   projectId: string;
   onMessage?: (message: Message) => void;
+  onMessageDelta?: (delta: MessageDelta) => void;
   onStatus?: (status: string, data?: any, requestId?: string) => void;
   onConnect?: () => void;
   onDisconnect?: () => void;
@@ -17,6 +18,7 @@ interface WebSocketOptions {
 export function useWebSocket({
   projectId,
   onMessage,
+  onMessageDelta,
   onStatus,
   onConnect,
   onDisconnect,
@@ -59,6 +61,8 @@ export function useWebSocket({
           
           if (data.type === 'message' && onMessage && data.data) {
             onMessage(data.data);
+          } else if (data.type === 'message_delta' && onMessageDelta && data.data) {
+            onMessageDelta(data.data);
           } else if (data.type === 'preview_error' && onMessage) {
             onMessage(data);
           } else if (data.type === 'preview_success' && onMessage) {
@@ -110,7 +114,7 @@ export function useWebSocket({
       console.error('Failed to create WebSocket connection:', error);
       onError?.(error as Error);
     }
-  }, [projectId, onMessage, onStatus, onConnect, onDisconnect, onError]);
+  }, [projectId, onMessage, onMessageDelta, onStatus, onConnect, onDisconnect, onError]);
 
   const disconnect = useCallback(() => {
     shouldReconnectRef.current = false;
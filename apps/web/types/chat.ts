@@ -13,9 +13,20 @@ export interface Message {
   conversation_id?: string;
   cli_source?: string;
   request_id?: string; // ★ NEW: request_id 추가
+  stream_id?: string; // live preview this message replaces
   created_at: string;
 }
 
+// Coalesced live assistant text; previews are replaced by the message carrying the same stream_id
+export interface MessageDelta {
+  stream_id: string;
+  seq?: number;
+  text?: string;
+  thought?: string;
+  done?: boolean;
+  conversation_id?: string;
+}
+
 export interface ChatSession {
   id: string;
   project_id: string;
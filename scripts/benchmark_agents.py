@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Benchmark the agent streaming path offline.
+
+Puts fake `claude`, `codex`, `cursor-agent`, `qwen` and `gemini` executables
+(scripts/fake_agent.py) first on PATH, runs one instruction per CLI through
+UnifiedCLIManager._execute_with_cli against a scratch SQLite database and a
+WebSocket client connected to the real connection manager, and reports per
+CLI:
+
+- events/s: agent events replayed per second of wall time;
+- p50/p99 latency: from the agent writing an event to the next WebSocket
+  frame the client receives;
+- WebSocket frames, message rows, DB write statements and batches;
+- CPU per instruction (API process plus agent processes).
+
+Transcripts come from --transcripts DIR (<cli>.jsonl, recorded with
+`fake_agent.py record`) or are synthesized. Use --json to save results and
+--baseline to fail (exit 1) on regressions, e.g. in CI.
+
+Usage:
+    python scripts/benchmark_agents.py [--cli codex qwen] [--events 500] [--speed 0]
+    python scripts/benchmark_agents.py --json bench.json --baseline main.json --max-regression 0.25
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+FAKE_AGENT = SCRIPTS_DIR / "fake_agent.py"
+# Executable name the adapters look up for each CLI
+EXECUTABLES = {"claude": "claude", "codex": "codex", "cursor": "cursor-agent", "qwen": "qwen", "gemini": "gemini"}
+
+# Isolated scratch environment; must be set before the app reads its settings
+WORKDIR = Path(tempfile.mkdtemp(prefix="agent-bench-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR / 'bench.db'}"
+os.environ["PROJECTS_ROOT"] = str(WORKDIR / "projects")
+os.environ["HOME"] = str(WORKDIR / "home")
+(WORKDIR / "home").mkdir()
+
+# Add the API directory to the path
+sys.path.append(str(SCRIPTS_DIR.parent / "apps" / "api"))
+sys.path.append(str(SCRIPTS_DIR))
+
+from sqlalchemy import event  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.websocket.manager import manager as ws_manager  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.migrations import run_sqlite_migrations  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.projects import Project  # noqa: E402
+from app.models.sessions import Session as ChatSession  # noqa: E402
+from app.services.cli.base import CLIType  # noqa: E402
+from app.services.cli.manager import UnifiedCLIManager  # noqa: E402
+from app.services.cli.process_pool import cli_process_pool  # noqa: E402
+from fake_agent import load_transcript, synthesize  # noqa: E402
+
+
+class BenchWebSocket:
+    """Stands in for a browser tab: records when each frame arrives"""
+
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.frames.append(time.time())
+
+    async def close(self, *args, **kwargs):
+        pass
+
+
+class StatementCounter:
+    def __init__(self):
+        self.writes = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip()[:6].upper() in ("INSERT", "UPDATE", "DELETE"):
+            self.writes += 1
+
+
+def install_shims(bin_dir: Path) -> None:
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for cli, name in EXECUTABLES.items():
+        shim = bin_dir / name
+        shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_AGENT}" replay --cli {cli} "$@"\n')
+        shim.chmod(0o755)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+
+def cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def wait_for_quiet(ws: BenchWebSocket, quiet: float = 0.2, timeout: float = 10.0) -> None:
+    """Let the connection manager's sender drain queued frames"""
+    deadline = time.monotonic() + timeout
+    count = -1
+    while time.monotonic() < deadline and count != len(ws.frames):
+        count = len(ws.frames)
+        await asyncio.sleep(quiet)
+
+
+async def run_cli(cli: str, transcript: list, speed: float, counter: StatementCounter) -> dict:
+    project_id = f"bench-{cli}-{uuid.uuid4().hex[:6]}"
+    project_path = WORKDIR / "projects" / project_id
+    (project_path / "repo").mkdir(parents=True)
+    session_id = str(uuid.uuid4())
+    with SessionLocal() as db:
+        db.add(Project(id=project_id, name=project_id, preferred_cli=cli))
+        db.add(ChatSession(id=session_id, project_id=project_id, cli_type=cli))
+        db.commit()
+
+    transcript_path = WORKDIR / f"{project_id}.jsonl"
+    timeline_path = WORKDIR / f"{project_id}.timeline"
+    with open(transcript_path, "w", encoding="utf-8") as f:
+        for record in transcript:
+            f.write(json.dumps(record) + "\n")
+    os.environ["FAKE_AGENT_TRANSCRIPT"] = str(transcript_path)
+    os.environ["FAKE_AGENT_TIMELINE"] = str(timeline_path)
+    os.environ["FAKE_AGENT_SPEED"] = str(speed)
+
+    ws = BenchWebSocket()
+    await ws_manager.connect(ws, project_id)
+    db = SessionLocal()
+    manager = UnifiedCLIManager(project_id, str(project_path), session_id, str(uuid.uuid4()), db)
+    adapter = manager.cli_adapters[CLIType(cli)]
+
+    writes_before = counter.writes
+    cpu_before = cpu_seconds()
+    started = time.time()
+    try:
+        result = await manager._execute_with_cli(adapter, "Benchmark instruction", None)
+        elapsed = time.time() - started
+        await wait_for_quiet(ws)
+    finally:
+        # Reap persistent agent processes so their CPU time is accounted
+        client = getattr(adapter, "_client", None)
+        if client is not None:
+            await client.stop()
+        await cli_process_pool.close_all()
+        ws_manager.disconnect(ws, project_id)
+        db.close()
+    wall = time.time() - started
+    cpu = cpu_seconds() - cpu_before
+
+    emitted = []
+    if timeline_path.exists():
+        emitted = sorted(float(line) for line in timeline_path.read_text().split())
+    latencies = []
+    for stamp in emitted:
+        i = bisect.bisect_left(ws.frames, stamp)
+        if i < len(ws.frames):
+            latencies.append(ws.frames[i] - stamp)
+
+    return {
+        "cli": cli,
+        "success": bool(result.get("success")),
+        "events": len(emitted),
+        "events_per_s": len(emitted) / elapsed if elapsed else 0.0,
+        "ws_frames": len(ws.frames),
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "message_rows": result.get("messages_count", 0),
+        "db_writes": counter.writes - writes_before,
+        "db_batches": result.get("db_write_batches", 0),
+        "cpu_ms": cpu * 1000,
+        "wall_ms": wall * 1000,
+    }
+
+
+def compare(results: list, baseline_path: str, max_regression: float) -> list:
+    baseline = {r["cli"]: r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    failures = []
+    # metric -> True when higher is better
+    checks = {"events_per_s": True, "latency_p99_ms": False, "db_writes": False, "cpu_ms": False}
+    for r in results:
+        base = baseline.get(r["cli"])
+        if not base:
+            continue
+        for metric, higher_is_better in checks.items():
+            old, new = base.get(metric) or 0, r.get(metric) or 0
+            if not old:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > max_regression:
+                failures.append(f"{r['cli']}: {metric} {old:.1f} -> {new:.1f} ({change:+.0%})")
+    return failures
+
+
+async def main_async(args) -> int:
+    Base.metadata.create_all(bind=engine)
+    run_sqlite_migrations(engine)
+    install_shims(WORKDIR / "bin")
+    counter = StatementCounter()
+
+    results = []
+    for cli in args.cli:
+        recorded = Path(args.transcripts) / f"{cli}.jsonl" if args.transcripts else None
+        transcript = load_transcript(str(recorded)) if recorded and recorded.exists() else synthesize(cli, args.events)
+        runs = [await run_cli(cli, transcript, args.speed, counter) for _ in range(args.runs)]
+        merged = {"cli": cli, "success": all(r["success"] for r in runs)}
+        for key in runs[0]:
+            if key not in merged:
+                merged[key] = statistics.median(r[key] for r in runs)
+        results.append(merged)
+
+    print(f"🔬 Agent streaming benchmark: speed={args.speed or 'max'}, {args.runs} run(s) per CLI (median)")
+    print("=" * 118)
+    print(
+        f"{'cli':<8} {'ok':<3} {'events':>7} {'events/s':>9} {'p50':>9} {'p99':>9} {'frames':>7} "
+        f"{'rows':>6} {'db writes':>9} {'batches':>8} {'cpu':>9} {'wall':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['cli']:<8} {'✅' if r['success'] else '❌':<3} {r['events']:>7.0f} {r['events_per_s']:>9.0f} "
+            f"{r['latency_p50_ms']:>7.1f}ms {r['latency_p99_ms']:>7.1f}ms {r['ws_frames']:>7.0f} "
+            f"{r['message_rows']:>6.0f} {r['db_writes']:>9.0f} {r['db_batches']:>8.0f} "
+            f"{r['cpu_ms']:>7.0f}ms {r['wall_ms']:>7.0f}ms"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"speed": args.speed, "results": results}, indent=2))
+    status = 0 if all(r["success"] for r in results) else 1
+    if args.baseline:
+        failures = compare(results, args.baseline, args.max_regression)
+        for failure in failures:
+            print(f"❌ Regression: {failure}")
+        if failures:
+            status = 1
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cli", nargs="+", default=list(EXECUTABLES), choices=list(EXECUTABLES))
+    parser.add_argument("--transcripts", help="Directory with recorded <cli>.jsonl transcripts")
+    parser.add_argument("--events", type=int, default=500, help="Synthetic transcript size")
+    parser.add_argument("--speed", type=float, default=0, help="Replay speed factor (0 = as fast as possible)")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args()
+
+    try:
+        sys.exit(asyncio.run(main_async(args)))
+    finally:
+        engine.dispose()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Benchmark Vercel deployment status tracking against the local stub server.
+
+Starts N deployments on scripts/stub_api_server.py (time-based: QUEUED ->
+BUILDING -> READY after --deploy-seconds) and records their status into a
+scratch SQLite database, comparing:
+
+- per-task: one polling loop per deployment at a fixed interval, one DB
+  session and commit per poll, as start_deployment_monitoring used to do;
+- tracker: the shared deployment_tracker (adaptive intervals, commits only
+  on transitions, batched per tick);
+- tracker+webhooks: the stub also pushes signed deployment.* events, and
+  polling only runs as a slow safety net.
+
+Intervals are scaled down (--interval stands in for the 3s production poll)
+so a run takes seconds.
+
+Usage:
+    python scripts/benchmark_deployments.py [--deployments 20] [--deploy-seconds 3]
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+sys.path.append(str(SCRIPTS_DIR))
+from stub_api_server import start_in_thread  # noqa: E402
+
+WEBHOOK_SECRET = "benchmark-secret"
+
+
+def stub_stats(base: str) -> dict:
+    with urllib.request.urlopen(f"{base}/_stats") as r:
+        return json.loads(r.read())
+
+
+def make_database(count: int):
+    """Scratch SQLite DB with N projects, each with a Vercel connection"""
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.db.base import Base
+    import app.models  # noqa: F401  (register all tables)
+    from app.models.projects import Project
+    from app.models.project_services import ProjectServiceConnection
+
+    db_path = Path(tempfile.mkdtemp(prefix="deploy-bench-")) / "bench.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    commits = {"count": 0}
+
+    @event.listens_for(factory, "after_commit")
+    def count_commit(session):
+        commits["count"] += 1
+
+    db = factory()
+    for i in range(count):
+        db.add(Project(id=f"bench-{i}", name=f"bench-{i}"))
+        db.add(ProjectServiceConnection(
+            id=f"conn-{i}", project_id=f"bench-{i}", provider="vercel", service_data={}
+        ))
+    db.commit()
+    db.close()
+    commits["count"] = 0
+    return factory, commits
+
+
+def ready_count(factory, count: int) -> int:
+    from app.models.project_services import ProjectServiceConnection
+
+    db = factory()
+    try:
+        rows = db.query(ProjectServiceConnection).filter(ProjectServiceConnection.provider == "vercel").all()
+        return sum(1 for row in rows if (row.service_data or {}).get("deployment_url"))
+    finally:
+        db.close()
+
+
+async def start_deployments(count: int) -> list:
+    from app.services.vercel_service import VercelService
+
+    vercel = VercelService("stub")
+    deployments = []
+    for i in range(count):
+        result = await vercel.create_deployment(f"bench-{i}", github_repo_id=i)
+        deployments.append((f"bench-{i}", result["deployment_id"], result["status"], time.monotonic()))
+    return deployments
+
+
+async def per_task(count: int, interval: float, factory) -> dict:
+    """The old loop: fixed interval, one session + commit per poll"""
+    from app.services.vercel_service import VercelService, apply_deployment_status
+
+    finished = {}
+
+    async def monitor(project_id: str, deployment_id: str):
+        vercel = VercelService("stub")
+        while True:
+            status_data = await vercel.get_deployment_status(deployment_id)
+            db = factory()
+            try:
+                apply_deployment_status(db, project_id, status_data)
+                db.commit()
+            finally:
+                db.close()
+            if status_data["status"] in ("READY", "ERROR"):
+                finished[project_id] = time.monotonic()
+                return
+            await asyncio.sleep(interval)
+
+    deployments = await start_deployments(count)
+    await asyncio.gather(*(monitor(p, d) for p, d, _, _ in deployments))
+    return {"deployments": deployments, "finished": finished}
+
+
+async def tracked(count: int, factory) -> dict:
+    from app.services.deployment_tracker import deployment_tracker
+
+    finished = {}
+    deployments = await start_deployments(count)
+    for project_id, deployment_id, status, _ in deployments:
+        deployment_tracker.track(project_id, deployment_id, "stub", factory, status=status)
+    while len(finished) < count:
+        active = set(deployment_tracker.projects())
+        now = time.monotonic()
+        for project_id, _, _, _ in deployments:
+            if project_id not in active and project_id not in finished:
+                finished[project_id] = now
+        await asyncio.sleep(0.02)
+    await deployment_tracker.stop()
+    return {"deployments": deployments, "finished": finished}
+
+
+def start_webhook_receiver(loop: asyncio.AbstractEventLoop):
+    """Stand-in for POST /api/vercel/webhook: verify and hand to the tracker"""
+    from app.services.deployment_tracker import deployment_tracker
+
+    class Receiver(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            expected = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha1).hexdigest()
+            if not hmac.compare_digest(expected, self.headers.get("x-vercel-signature", "")):
+                self.send_response(401)
+            else:
+                event = json.loads(body)
+                try:
+                    future = asyncio.run_coroutine_threadsafe(
+                        deployment_tracker.handle_webhook(event["type"], event["payload"]["deployment"]), loop
+                    )
+                    future.result(timeout=10)
+                    self.send_response(200)
+                except Exception:
+                    # Late delivery after the run finished
+                    self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Receiver)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/vercel/webhook"
+
+
+def run(name: str, args, coro_factory, webhooks: bool = False) -> dict:
+    from app.core.config import settings
+    from app.services.http_client import http_clients
+
+    factory, commits = make_database(args.deployments)
+    settings.vercel_webhook_secret = WEBHOOK_SECRET if webhooks else ""
+
+    async def main():
+        receiver = None
+        options = {"deploy_seconds": args.deploy_seconds}
+        if webhooks:
+            receiver, url = start_webhook_receiver(asyncio.get_running_loop())
+            options.update(webhook_url=url, webhook_secret=WEBHOOK_SECRET)
+        server, base = start_in_thread(**options)
+        from app.services import vercel_service
+
+        vercel_service.VERCEL_API_BASE = base
+        try:
+            started = time.perf_counter()
+            result = await coro_factory(factory)
+            result["elapsed"] = time.perf_counter() - started
+            result["stats"] = stub_stats(base)
+            return result
+        finally:
+            await http_clients.close_all()
+            server.shutdown()
+            if receiver:
+                receiver.shutdown()
+
+    result = asyncio.run(main())
+    lags = sorted(
+        result["finished"][p] - (created + args.deploy_seconds)
+        for p, _, _, created in result["deployments"]
+    )
+    # The final /_stats call and the N create calls are not status polls
+    polls = result["stats"]["requests"] - 1 - args.deployments
+    return {
+        "name": name,
+        "elapsed": result["elapsed"],
+        "polls": polls,
+        "commits": commits["count"],
+        "webhooks": result["stats"]["webhooks"],
+        "lag_p50": lags[len(lags) // 2],
+        "lag_max": lags[-1],
+        "ready": ready_count(factory, args.deployments),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deployments", type=int, default=20)
+    parser.add_argument("--deploy-seconds", type=float, default=3)
+    parser.add_argument("--interval", type=float, default=0.3, help="Scaled-down 3s poll interval")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    os.environ["DEPLOY_POLL_INTERVAL"] = str(args.interval)
+    os.environ["DEPLOY_POLL_MAX_INTERVAL"] = str(args.interval * 5)
+    sys.path.append(str(SCRIPTS_DIR.parent / "apps" / "api"))
+    from app.core.terminal_ui import ui
+
+    ui.info = ui.debug = lambda *a, **k: None  # keep the table readable
+
+    rows = [
+        run("per-task", args, lambda f: per_task(args.deployments, args.interval, f)),
+        run("tracker", args, lambda f: tracked(args.deployments, f)),
+        run("tracker+hook", args, lambda f: tracked(args.deployments, f), webhooks=True),
+    ]
+
+    print(
+        f"🔬 Deployment tracking benchmark: {args.deployments} deployments, "
+        f"{args.deploy_seconds:.1f}s each, {args.interval:.2f}s base interval"
+    )
+    print("=" * 84)
+    print(
+        f"{'mode':<13} {'time':>8} {'polls':>7} {'commits':>8} {'webhooks':>9} "
+        f"{'lag p50':>9} {'lag max':>9} {'ready':>7}"
+    )
+    for r in rows:
+        print(
+            f"{r['name']:<13} {r['elapsed']:>7.2f}s {r['polls']:>7} {r['commits']:>8} {r['webhooks']:>9} "
+            f"{r['lag_p50'] * 1000:>7.0f}ms {r['lag_max'] * 1000:>7.0f}ms "
+            f"{r['ready']:>3}/{args.deployments:<3}"
+        )
+
+
+if __name__ == "__main__":
+    main()
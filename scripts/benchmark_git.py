@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark git read latency for each git backend.
+
+Builds a throwaway repository with N commits and times the reads the API
+does on every commits/preview request (HEAD, current branch, the 50-commit
+history and a raw object read) per backend (see app/services/git_backend.py).
+Results are checked against the subprocess backend so a faster backend can
+never silently return different history.
+
+Usage:
+    python scripts/benchmark_git.py [--commits 500] [--iterations 200]
+"""
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the API directory to the path
+sys.path.append(str(Path(__file__).parent.parent / "apps" / "api"))
+
+from app.services.git_backend import (  # noqa: E402
+    PYGIT2_AVAILABLE,
+    CatFileBackend,
+    Pygit2Backend,
+    SubprocessBackend,
+)
+
+
+def make_repo(path: str, commits: int) -> None:
+    def git(*args):
+        subprocess.run(["git", *args], cwd=path, check=True, capture_output=True)
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.name", "Bench")
+    git("config", "user.email", "bench@example.com")
+    # fast-import keeps setup time independent of the commit count
+    stream = []
+    for i in range(commits):
+        content = f"export const value = {i};\n"
+        message = f"commit {i}\n"
+        stream.append(
+            "commit refs/heads/main\n"
+            f"committer Bench <bench@example.com> {1700000000 + i * 60} +0900\n"
+            f"data {len(message)}\n{message}"
+            f"M 644 inline src/file{i % 20}.ts\ndata {len(content)}\n{content}\n"
+        )
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input="".join(stream).encode(), check=True)
+    git("checkout", "-q", "main")
+
+
+def time_op(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def strip(commits):
+    return [{k: v for k, v in c.items() if not k.startswith("_")} for c in commits]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--log-limit", type=int, default=50)
+    args = parser.parse_args()
+
+    backends = [SubprocessBackend, CatFileBackend] + ([Pygit2Backend] if PYGIT2_AVAILABLE else [])
+    workdir = tempfile.mkdtemp(prefix="git-bench-")
+    try:
+        make_repo(workdir, args.commits)
+        baseline = SubprocessBackend(workdir)
+        expected_log = strip(baseline.log(args.log_limit))
+        head = baseline.head()
+
+        print(f"🔬 Git read benchmark: {args.commits} commits, {args.iterations} iterations (median per call)")
+        if not PYGIT2_AVAILABLE:
+            print("   pygit2 not installed, skipping the pygit2 backend")
+        print("=" * 72)
+        print(f"{'backend':<12} {'head':>10} {'branch':>10} {'log(' + str(args.log_limit) + ')':>10} {'object':>10}  match")
+        for cls in backends:
+            backend = cls(workdir)
+            try:
+                match = strip(backend.log(args.log_limit)) == expected_log and backend.head() == head
+                r = {
+                    "head": time_op(backend.head, args.iterations),
+                    "branch": time_op(backend.current_branch, args.iterations),
+                    "log": time_op(lambda: backend.log(args.log_limit), max(1, args.iterations // 10)),
+                    "object": time_op(lambda: backend.read_object(head), args.iterations),
+                }
+            finally:
+                backend.close()
+            print(
+                f"{cls.name:<12} {r['head']:>8.3f}ms {r['branch']:>8.3f}ms {r['log']:>8.2f}ms "
+                f"{r['object']:>8.3f}ms  {'✅' if match else '❌'}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark GitHub/Vercel API calls against the local stub server.
+
+Starts scripts/stub_api_server.py in-process (with a per-connection delay
+standing in for the TCP+TLS handshake), points GITHUB_API_BASE and
+VERCEL_API_BASE at it and compares:
+
+- per-call: a new client per call, as the services used to do;
+- pooled: GitHubService / VercelService on the shared pooled clients, with
+  conditional GETs answered by 304s.
+
+A throttled round (every Nth request gets 429 + Retry-After) checks that
+calls still succeed through retries.
+
+Usage:
+    python scripts/benchmark_http.py [--calls 50] [--connect-latency-ms 40]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+sys.path.append(str(SCRIPTS_DIR))
+from stub_api_server import start_in_thread  # noqa: E402
+
+
+def stub_stats(base: str) -> dict:
+    with urllib.request.urlopen(f"{base}/_stats") as r:
+        return json.loads(r.read())
+
+
+async def per_call(base: str, calls: int) -> None:
+    import httpx
+
+    headers = {"Authorization": "token stub"}
+    for _ in range(calls):
+        async with httpx.AsyncClient() as client:
+            r = await client.get(f"{base}/user/repos", headers=headers)
+            r.raise_for_status()
+
+
+async def pooled(calls: int) -> None:
+    from app.services.github_service import GitHubService
+    from app.services.vercel_service import VercelService
+
+    github = GitHubService("stub")
+    vercel = VercelService("stub")
+    for i in range(calls):
+        if i % 2:
+            result = await github.get_user_repositories()
+            assert result["success"], result
+        else:
+            assert (await vercel.check_token_validity())["valid"]
+
+
+async def throttled(calls: int) -> int:
+    from app.services.github_service import GitHubService
+
+    github = GitHubService("stub")
+    ok = 0
+    for _ in range(calls):
+        ok += bool((await github.check_token_validity()).get("valid"))
+    return ok
+
+
+def run(name: str, base: str, coro) -> dict:
+    before = stub_stats(base)
+    started = time.perf_counter()
+    result = asyncio.run(coro)
+    elapsed = time.perf_counter() - started
+    after = stub_stats(base)
+    # The /_stats call itself is one request on one new connection
+    delta = {k: after[k] - before[k] - (1 if k in ("requests", "connections") else 0) for k in after}
+    return {"name": name, "elapsed": elapsed, "result": result, **delta}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--connect-latency-ms", type=float, default=40)
+    parser.add_argument("--throttle-every", type=int, default=4)
+    args = parser.parse_args()
+
+    server, base = start_in_thread(connect_latency_ms=args.connect_latency_ms)
+    throttled_server, throttled_base = start_in_thread(throttle_every=args.throttle_every, retry_after="0")
+
+    # Add the API directory to the path; settings are read at import time
+    os.environ["GITHUB_API_BASE"] = base
+    os.environ["VERCEL_API_BASE"] = base
+    sys.path.append(str(SCRIPTS_DIR.parent / "apps" / "api"))
+    from app.services.http_client import http_clients
+
+    async def pooled_run():
+        try:
+            await pooled(args.calls)
+        finally:
+            await http_clients.close_all()
+
+    async def throttled_run():
+        from app.services.github_service import GitHubService
+
+        GitHubService.BASE_URL = throttled_base
+        try:
+            return await throttled(args.calls)
+        finally:
+            await http_clients.close_all()
+
+    rows = [
+        run("per-call", base, per_call(base, args.calls)),
+        run("pooled", base, pooled_run()),
+    ]
+    throttled_row = run("pooled+429", throttled_base, throttled_run())
+
+    print(f"🔬 HTTP client benchmark: {args.calls} calls, {args.connect_latency_ms:.0f}ms per new connection")
+    print("=" * 78)
+    print(f"{'mode':<12} {'time':>10} {'per call':>10} {'requests':>9} {'conns':>6} {'304s':>6} {'429s':>6} {'ok':>5}")
+    for r in rows + [throttled_row]:
+        ok = r["result"] if isinstance(r["result"], int) else args.calls
+        print(
+            f"{r['name']:<12} {r['elapsed'] * 1000:>8.0f}ms {r['elapsed'] * 1000 / args.calls:>8.1f}ms "
+            f"{r['requests']:>9} {r['connections']:>6} {r['not_modified']:>6} {r['throttled']:>6} {ok:>5}"
+        )
+    server.shutdown()
+    throttled_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
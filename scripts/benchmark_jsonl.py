@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark agent output decoding.
+
+Feeds recorded agent transcripts (raw JSONL stdout of codex/cursor/ACP runs)
+through an asyncio StreamReader in pipe-sized pieces and compares:
+
+- readline: the old per-adapter `readline()` + `json.loads` loop;
+- chunked: the shared decoder in app/services/cli/base.py with json;
+- chunked+orjson: the same decoder with orjson (when installed).
+
+Without --transcript a synthetic codex-style transcript is generated, with
+token deltas, tool output and a few lines above the 64KB readline limit.
+
+Usage:
+    python scripts/benchmark_jsonl.py [--transcript run.jsonl ...] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the API directory to the path
+sys.path.append(str(Path(__file__).parent.parent / "apps" / "api"))
+
+import app.services.cli.base as cli_base  # noqa: E402
+
+
+PIPE_CHUNK = 64 * 1024
+
+
+def synthetic_transcript(events: int = 20000, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    lines = [json.dumps({"id": "", "msg": {"type": "session_configured", "model": "gpt-5"}})]
+    for i in range(events):
+        roll = rng.random()
+        if roll < 0.8:
+            msg = {"type": "agent_message_delta", "delta": rng.choice(["The ", "file ", "is ", "updated", ". ", "\n"])}
+        elif roll < 0.95:
+            msg = {"type": "exec_command_begin", "command": ["npm", "run", "build"], "cwd": "/repo"}
+        elif roll < 0.999:
+            msg = {"type": "exec_command_output_delta", "chunk": "x" * rng.randint(200, 4000)}
+        else:
+            # Large tool output (file dump, diff) beyond StreamReader's default limit
+            msg = {"type": "exec_command_end", "stdout": "y" * rng.randint(70_000, 300_000)}
+        lines.append(json.dumps({"id": "req-1", "msg": msg}))
+    lines.append(json.dumps({"id": "req-1", "msg": {"type": "task_complete"}}))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def make_reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()  # default 64KB limit, like create_subprocess_exec
+    for i in range(0, len(data), PIPE_CHUNK):
+        reader.feed_data(data[i:i + PIPE_CHUNK])
+    reader.feed_eof()
+    return reader
+
+
+async def run_readline(data: bytes) -> dict:
+    reader = make_reader(data)
+    events = errors = 0
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            # "Separator is found, but chunk is longer than limit": the old loop dies here
+            errors += 1
+            break
+        if not line:
+            break
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            json.loads(line)
+            events += 1
+        except json.JSONDecodeError:
+            errors += 1
+    return {"events": events, "errors": errors}
+
+
+async def run_chunked(data: bytes) -> dict:
+    reader = make_reader(data)
+    events = errors = 0
+    async for event in cli_base.iter_stream_events(reader):
+        if event.type == "parse_error":
+            errors += 1
+        else:
+            events += 1
+    return {"events": events, "errors": errors}
+
+
+def bench(name: str, fn, data: bytes, repeat: int) -> None:
+    samples = []
+    result = {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = asyncio.run(fn(data))
+        samples.append(time.perf_counter() - started)
+    median = statistics.median(samples)
+    mb_per_s = len(data) / median / 1e6
+    print(
+        f"{name:<16} {median * 1000:>9.1f}ms {mb_per_s:>9.1f}MB/s "
+        f"{result['events'] / median:>12.0f} ev/s {result['events']:>8} {result['errors']:>7}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transcript", nargs="*", default=[], help="Recorded JSONL agent output files")
+    parser.add_argument("--events", type=int, default=20000, help="Synthetic transcript size")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.transcript:
+        data = b"".join(Path(p).read_bytes().rstrip(b"\n") + b"\n" for p in args.transcript)
+        source = ", ".join(args.transcript)
+    else:
+        data = synthetic_transcript(args.events)
+        source = f"synthetic ({args.events} events)"
+
+    print(f"🔬 JSONL decode benchmark: {source}, {len(data) / 1e6:.1f}MB, median of {args.repeat}")
+    print("=" * 80)
+    print(f"{'decoder':<16} {'time':>11} {'throughput':>11} {'rate':>15} {'events':>8} {'errors':>7}")
+    bench("readline", run_readline, data, args.repeat)
+
+    orjson_available = cli_base.ORJSON_AVAILABLE
+    cli_base.ORJSON_AVAILABLE = False
+    bench("chunked", run_chunked, data, args.repeat)
+    cli_base.ORJSON_AVAILABLE = orjson_available
+    if orjson_available:
+        bench("chunked+orjson", run_chunked, data, args.repeat)
+    else:
+        print("   orjson not installed, skipping chunked+orjson")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite write/read contention for each connection profile.
+
+Simulates streaming agents committing messages while the UI polls
+`/requests/active`-style count queries, and reports throughput, latency and
+"database is locked" errors per profile (see app/db/sqlite_profile.py).
+
+Usage:
+    python scripts/benchmark_sqlite.py [--seconds 5] [--writers 2] [--readers 4]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Add the API directory to the path
+sys.path.append(str(Path(__file__).parent.parent / "apps" / "api"))
+
+from app.db.sqlite_profile import PROFILES, apply_pragmas  # noqa: E402
+
+
+SCHEMA = """
+CREATE TABLE messages (
+    id VARCHAR(64) PRIMARY KEY,
+    project_id VARCHAR(64),
+    role VARCHAR(32) NOT NULL,
+    content TEXT NOT NULL,
+    created_at DATETIME NOT NULL
+);
+CREATE INDEX ix_messages_project_id ON messages (project_id);
+CREATE TABLE user_requests (
+    id VARCHAR(64) PRIMARY KEY,
+    project_id VARCHAR(64),
+    is_completed BOOLEAN NOT NULL
+);
+"""
+
+
+def connect(path: str, profile: str, read_only: bool = False) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    apply_pragmas(conn, PROFILES[profile], read_only=read_only)
+    return conn
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def run_profile(profile: str, seconds: float, writers: int, readers: int) -> dict:
+    tmpdir = tempfile.mkdtemp(prefix="cc-bench-")
+    path = os.path.join(tmpdir, "bench.db")
+    setup = connect(path, profile)
+    setup.executescript(SCHEMA)
+    setup.executemany(
+        "INSERT INTO user_requests VALUES (?, ?, ?)",
+        [(str(uuid.uuid4()), f"project-{i % 4}", i % 3 == 0) for i in range(200)],
+    )
+    setup.commit()
+    setup.close()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    write_lat, read_lat = [], []
+    errors = {"write": 0, "read": 0}
+
+    def writer(idx: int):
+        conn = connect(path, profile)
+        content = "x" * 400
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                conn.execute(
+                    "INSERT INTO messages VALUES (?, ?, ?, ?, datetime('now'))",
+                    (str(uuid.uuid4()), f"project-{idx % 4}", "assistant", content),
+                )
+                conn.commit()
+                with lock:
+                    write_lat.append(time.perf_counter() - started)
+            except sqlite3.OperationalError:
+                conn.rollback()
+                with lock:
+                    errors["write"] += 1
+        conn.close()
+
+    def reader(idx: int):
+        conn = connect(path, profile, read_only=True)
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                conn.execute(
+                    "SELECT count(*) FROM user_requests WHERE project_id = ? AND is_completed = 0",
+                    (f"project-{idx % 4}",),
+                ).fetchone()
+                conn.execute(
+                    "SELECT id, content FROM messages WHERE project_id = ? ORDER BY created_at DESC LIMIT 50",
+                    (f"project-{idx % 4}",),
+                ).fetchall()
+                with lock:
+                    read_lat.append(time.perf_counter() - started)
+            except sqlite3.OperationalError:
+                with lock:
+                    errors["read"] += 1
+            time.sleep(0.001)
+        conn.close()
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+    return {
+        "profile": profile,
+        "writes_per_s": len(write_lat) / seconds,
+        "reads_per_s": len(read_lat) / seconds,
+        "write_p95_ms": percentile(write_lat, 0.95) * 1000,
+        "read_p95_ms": percentile(read_lat, 0.95) * 1000,
+        "read_median_ms": (statistics.median(read_lat) * 1000) if read_lat else 0.0,
+        "write_errors": errors["write"],
+        "read_errors": errors["read"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--profiles", nargs="+", default=["legacy", "performance"], choices=sorted(PROFILES))
+    args = parser.parse_args()
+
+    print(f"🔬 SQLite contention benchmark: {args.writers} writers, {args.readers} readers, {args.seconds}s per profile")
+    print("=" * 96)
+    print(f"{'profile':<12} {'writes/s':>10} {'reads/s':>10} {'write p95':>11} {'read p95':>10} {'read p50':>10} {'w-err':>7} {'r-err':>7}")
+    for profile in args.profiles:
+        r = run_profile(profile, args.seconds, args.writers, args.readers)
+        print(
+            f"{r['profile']:<12} {r['writes_per_s']:>10.0f} {r['reads_per_s']:>10.0f} "
+            f"{r['write_p95_ms']:>9.2f}ms {r['read_p95_ms']:>8.2f}ms {r['read_median_ms']:>8.2f}ms "
+            f"{r['write_errors']:>7} {r['read_errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
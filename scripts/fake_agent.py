@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Fake agent CLI that records and replays agent transcripts.
+
+Stands in for `claude`, `codex`, `cursor-agent`, `qwen` and `gemini` so the
+streaming path (adapter -> UnifiedCLIManager -> MessageWriter -> WebSocket)
+can be exercised offline. Each CLI's stdio protocol is spoken just enough
+for its adapter:
+
+- cursor: stream-json events written straight to stdout;
+- codex: `codex proto` (session_configured, then one replay per user_input);
+- claude: SDK stream-json (control requests acknowledged, one replay per user turn);
+- qwen/gemini: ACP JSON-RPC (initialize, session/new, session/prompt), with
+  session/update notifications replayed before the prompt result.
+
+Transcript files are JSONL: `{"dt": <seconds since previous line>, "out": <object>}`.
+
+Usage:
+    # Record a real run (stdin/stdout are passed through)
+    python scripts/fake_agent.py record --out codex.jsonl -- codex proto
+
+    # Generate a synthetic transcript
+    python scripts/fake_agent.py synth --cli qwen --events 2000 --out qwen.jsonl
+
+    # Replay (normally invoked through a PATH shim, see benchmark_agents.py)
+    python scripts/fake_agent.py replay --cli codex --transcript codex.jsonl [--speed 0]
+
+Environment (used when the shim cannot pass flags): FAKE_AGENT_TRANSCRIPT,
+FAKE_AGENT_SPEED (0 = as fast as possible), FAKE_AGENT_TIMELINE (append one
+emit timestamp per replayed event, for latency measurements).
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional
+
+CLIS = ("claude", "codex", "cursor", "qwen", "gemini")
+
+
+# Transcripts ---------------------------------------------------------------
+
+def load_transcript(path: str) -> List[Dict[str, Any]]:
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "out" in record:
+                records.append({"dt": float(record.get("dt", 0)), "out": record["out"]})
+    return records
+
+
+def synthesize(cli: str, events: int = 1000, seed: int = 7) -> List[Dict[str, Any]]:
+    """A representative transcript: mostly small text deltas, some tool calls"""
+    rng = random.Random(seed)
+    words = ["Updating ", "the ", "page ", "component", ". ", "Adding ", "styles", "\n"]
+    session = str(uuid.uuid4())
+    out: List[Dict[str, Any]] = []
+
+    def emit(obj: Dict[str, Any], dt: float = 0.0) -> None:
+        out.append({"dt": dt, "out": obj})
+
+    def delta_dt() -> float:
+        return rng.uniform(0.005, 0.03)
+
+    if cli == "codex":
+        emit({"id": "", "msg": {"type": "session_configured", "session_id": session, "model": "gpt-5"}})
+        for i in range(events):
+            if i and i % 50 == 0:
+                emit({"id": "req", "msg": {"type": "exec_command_begin", "command": ["npm", "run", "lint"]}}, delta_dt())
+                emit({"id": "req", "msg": {"type": "exec_command_end", "stdout": "ok", "exit_code": 0}}, delta_dt())
+            else:
+                emit({"id": "req", "msg": {"type": "agent_message_delta", "delta": rng.choice(words)}}, delta_dt())
+        emit({"id": "req", "msg": {"type": "agent_message", "message": ""}})
+        emit({"id": "req", "msg": {"type": "task_complete"}})
+    elif cli == "cursor":
+        emit({"type": "system", "subtype": "init", "session_id": session, "model": "gpt-5", "cwd": "."})
+        for i in range(events):
+            if i and i % 50 == 0:
+                call = {"editToolCall": {"args": {"path": f"app/page{i}.tsx"}, "result": {"success": {}}}}
+                emit({"type": "tool_call", "subtype": "started", "call_id": str(i), "tool_call": call}, delta_dt())
+                emit({"type": "tool_call", "subtype": "completed", "call_id": str(i), "tool_call": call}, delta_dt())
+            else:
+                text = rng.choice(words)
+                emit({"type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": text}]}, "session_id": session}, delta_dt())
+        emit({"type": "result", "subtype": "success", "is_error": False, "session_id": session, "duration_ms": 1000})
+    elif cli == "claude":
+        emit({"type": "system", "subtype": "init", "session_id": session, "model": "claude-sonnet-4-5", "tools": [], "cwd": "."})
+        for i in range(events):
+            if i and i % 50 == 0:
+                block = {"type": "tool_use", "id": f"toolu_{i}", "name": "Edit", "input": {"file_path": f"app/page{i}.tsx"}}
+            else:
+                block = {"type": "text", "text": rng.choice(words)}
+            emit({
+                "type": "assistant",
+                "message": {"role": "assistant", "model": "claude-sonnet-4-5", "content": [block]},
+                "session_id": session,
+            }, delta_dt())
+        emit({
+            "type": "result", "subtype": "success", "is_error": False, "session_id": session,
+            "duration_ms": 1000, "duration_api_ms": 900, "num_turns": 1, "total_cost_usd": 0.0, "usage": {},
+            "result": "done",
+        })
+    elif cli in ("qwen", "gemini"):
+        for i in range(events):
+            if i < events // 10:
+                update = {"sessionUpdate": "agent_thought_chunk", "content": {"type": "text", "text": rng.choice(words)}}
+            elif i % 50 == 0:
+                update = {"sessionUpdate": "tool_call", "toolCallId": f"call_{i}", "title": "WriteFile", "kind": "edit", "status": "completed"}
+            else:
+                update = {"sessionUpdate": "agent_message_chunk", "content": {"type": "text", "text": rng.choice(words)}}
+            emit({"jsonrpc": "2.0", "method": "session/update", "params": {"sessionId": "", "update": update}}, delta_dt())
+    else:
+        raise ValueError(f"Unknown CLI: {cli}")
+    return out
+
+
+# Replay --------------------------------------------------------------------
+
+class Replayer:
+    def __init__(self, records: List[Dict[str, Any]], speed: float, timeline: Optional[str]):
+        self.records = records
+        self.speed = speed
+        self.timeline_path = timeline
+        self._stamps: List[float] = []
+        self._lock = threading.Lock()
+
+    def write(self, obj: Dict[str, Any], stamp: bool = True) -> None:
+        data = (json.dumps(obj) + "\n").encode("utf-8")
+        with self._lock:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        if stamp:
+            self._stamps.append(time.time())
+
+    def play(self, records: List[Dict[str, Any]], rewrite=None) -> None:
+        for record in records:
+            if self.speed > 0 and record["dt"] > 0:
+                time.sleep(record["dt"] / self.speed)
+            obj = rewrite(record["out"]) if rewrite else record["out"]
+            if obj is not None:
+                self.write(obj)
+        self.flush_timeline()
+
+    def flush_timeline(self) -> None:
+        if not self.timeline_path or not self._stamps:
+            return
+        stamps, self._stamps = self._stamps, []
+        with open(self.timeline_path, "a", encoding="utf-8") as f:
+            f.write("".join(f"{s:.6f}\n" for s in stamps))
+
+
+def read_stdin_json() -> Iterator[Dict[str, Any]]:
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def replay_cursor(r: Replayer) -> None:
+    r.play(r.records)
+
+
+def replay_codex(r: Replayer) -> None:
+    def msg_type(obj):
+        return (obj.get("msg") or {}).get("type")
+
+    setup = [rec for rec in r.records if msg_type(rec["out"]) == "session_configured"]
+    turn = [rec for rec in r.records if msg_type(rec["out"]) != "session_configured"]
+    if not setup:
+        setup = [{"dt": 0, "out": {"id": "", "msg": {"type": "session_configured", "session_id": str(uuid.uuid4())}}}]
+    for record in setup:
+        r.write(record["out"], stamp=False)
+
+    for op in read_stdin_json():
+        op_type = (op.get("op") or {}).get("type")
+        if op_type == "shutdown":
+            return
+        if op_type == "user_input":
+            request_id = op.get("id")
+            r.play(turn, rewrite=lambda obj: {**obj, "id": request_id})
+
+
+def replay_claude(r: Replayer) -> None:
+    for message in read_stdin_json():
+        if message.get("type") == "control_request":
+            r.write({
+                "type": "control_response",
+                "response": {"subtype": "success", "request_id": message.get("request_id"), "response": {}},
+            }, stamp=False)
+        elif message.get("type") == "user":
+            r.play(r.records)
+
+
+def replay_acp(r: Replayer) -> None:
+    notifications = [rec for rec in r.records if rec["out"].get("method") == "session/update"]
+    for message in read_stdin_json():
+        method, msg_id = message.get("method"), message.get("id")
+        if method is None or msg_id is None:
+            continue  # responses/notifications from the client
+        params = message.get("params") or {}
+        if method == "initialize":
+            result: Any = {"protocolVersion": 1, "agentCapabilities": {}, "authMethods": []}
+        elif method == "authenticate":
+            result = {}
+        elif method == "session/new":
+            result = {"sessionId": str(uuid.uuid4())}
+        elif method == "session/prompt":
+            session_id = params.get("sessionId")
+
+            def rewrite(obj, session_id=session_id):
+                return {**obj, "params": {**obj.get("params", {}), "sessionId": session_id}}
+
+            r.play(notifications, rewrite=rewrite)
+            result = {"stopReason": "end_turn"}
+        else:
+            r.write({"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32601, "message": "Method not found"}}, stamp=False)
+            continue
+        r.write({"jsonrpc": "2.0", "id": msg_id, "result": result}, stamp=False)
+
+
+PROTOCOLS = {
+    "cursor": replay_cursor,
+    "codex": replay_codex,
+    "claude": replay_claude,
+    "qwen": replay_acp,
+    "gemini": replay_acp,
+}
+
+
+# Record --------------------------------------------------------------------
+
+def record(out_path: str, command: List[str]) -> int:
+    """Run the real CLI, passing stdio through, and save its stdout as a transcript"""
+    proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def pump_stdin() -> None:
+        try:
+            # Raw fd reads: a buffered stdin held by a daemon thread aborts interpreter shutdown
+            for chunk in iter(lambda: os.read(0, 65536), b""):
+                proc.stdin.write(chunk)
+                proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    threading.Thread(target=pump_stdin, daemon=True).start()
+    last = time.monotonic()
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"meta": {"command": command, "recorded_at": time.time()}}) + "\n")
+        for raw in proc.stdout:
+            sys.stdout.buffer.write(raw)
+            sys.stdout.buffer.flush()
+            now = time.monotonic()
+            try:
+                obj = json.loads(raw)
+            except ValueError:
+                continue
+            f.write(json.dumps({"dt": round(now - last, 6), "out": obj}) + "\n")
+            last = now
+    return proc.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    p_replay = sub.add_parser("replay")
+    p_replay.add_argument("--cli", choices=CLIS, required=True)
+    p_replay.add_argument("--transcript", default=os.getenv("FAKE_AGENT_TRANSCRIPT"))
+    p_replay.add_argument("--speed", type=float, default=float(os.getenv("FAKE_AGENT_SPEED", "1")))
+    p_replay.add_argument("--timeline", default=os.getenv("FAKE_AGENT_TIMELINE"))
+
+    p_synth = sub.add_parser("synth")
+    p_synth.add_argument("--cli", choices=CLIS, required=True)
+    p_synth.add_argument("--events", type=int, default=1000)
+    p_synth.add_argument("--seed", type=int, default=7)
+    p_synth.add_argument("--out", required=True)
+
+    p_record = sub.add_parser("record")
+    p_record.add_argument("--out", required=True)
+    p_record.add_argument("command", nargs=argparse.REMAINDER)
+
+    # Adapters append their own CLI flags (proto, --experimental-acp, -p ...)
+    args, unknown = parser.parse_known_args()
+    if {"--version", "-v", "-V"} & set(unknown):
+        # Availability/version probes
+        print("99.0.0 (fake-agent)")
+        return 0
+
+    if args.mode == "synth":
+        with open(args.out, "w", encoding="utf-8") as f:
+            for rec in synthesize(args.cli, args.events, args.seed):
+                f.write(json.dumps(rec) + "\n")
+        return 0
+    if args.mode == "record":
+        command = args.command[1:] if args.command[:1] == ["--"] else args.command
+        if not command:
+            parser.error("record needs a command after --")
+        return record(args.out, command)
+
+    records = load_transcript(args.transcript) if args.transcript else synthesize(args.cli)
+    replayer = Replayer(records, args.speed, args.timeline)
+    try:
+        PROTOCOLS[args.cli](replayer)
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+    finally:
+        replayer.flush_timeline()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Manage the shared node_modules store (see apps/api/app/services/npm_store.py).
+
+Usage:
+    python scripts/npm_store.py warm [REPO_PATH ...]   # default: every project under PROJECTS_ROOT
+    python scripts/npm_store.py report
+    python scripts/npm_store.py prune --keep 5
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add the API directory to the path
+sys.path.append(str(Path(__file__).parent.parent / "apps" / "api"))
+
+from app.core.config import settings  # noqa: E402
+from app.services.npm_store import npm_store  # noqa: E402
+
+
+def _project_repos():
+    root = Path(settings.projects_root)
+    if not root.is_dir():
+        return []
+    return [p / "repo" for p in sorted(root.iterdir()) if (p / "repo" / "package-lock.json").exists()]
+
+
+def warm(paths):
+    repos = [Path(p) for p in paths] or _project_repos()
+    if not repos:
+        print("No projects with package-lock.json found")
+        return
+    for repo in repos:
+        try:
+            key = npm_store.warm(str(repo))
+            print(f"✅ {repo}: {key or 'no lockfile'}")
+        except Exception as e:
+            print(f"❌ {repo}: {e}")
+
+
+def report():
+    r = npm_store.report()
+    print(f"📦 npm store: {r['root']}")
+    print(f"   entries:       {r['entries']}")
+    print(f"   store size:    {r['store_bytes'] / 1024 / 1024:.1f} MB")
+    print(f"   hits / misses: {r.get('hits', 0)} / {r.get('misses', 0)}")
+    print(f"   bytes saved:   {r.get('bytes_saved', 0) / 1024 / 1024:.1f} MB (hardlinked instead of downloaded/written)")
+    print(f"   time saved:    {r.get('seconds_saved', 0.0):.1f}s of npm install")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm_parser = sub.add_parser("warm", help="install lockfiles into the store")
+    warm_parser.add_argument("paths", nargs="*")
+    sub.add_parser("report", help="show store size and savings")
+    prune_parser = sub.add_parser("prune", help="drop old entries")
+    prune_parser.add_argument("--keep", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "warm":
+        warm(args.paths)
+    elif args.command == "report":
+        report()
+    elif args.command == "prune":
+        print(f"Removed {npm_store.prune(args.keep)} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub and Vercel REST APIs.
+
+Serves the endpoints GitHubService and VercelService call, on one port, with
+HTTP/1.1 keep-alive, ETags (If-None-Match -> 304) and optional throttling,
+so the integrations and the pooled HTTP layer can be exercised offline:
+
+    python scripts/stub_api_server.py --port 9876 --throttle-every 5
+    GITHUB_API_BASE=http://127.0.0.1:9876 VERCEL_API_BASE=http://127.0.0.1:9876 npm run dev
+
+Options model a remote API: --connect-latency-ms delays every new connection
+(TCP+TLS handshake), --throttle-every N answers every Nth request with 429
+and Retry-After. Vercel deployments go QUEUED -> BUILDING -> READY over
+--deploy-polls status polls, or over --deploy-seconds of wall time; in the
+latter mode --webhook-url receives signed deployment.* events (as Vercel
+sends them, x-vercel-signature = HMAC-SHA1 with --webhook-secret).
+GET /_stats returns request/connection counts.
+"""
+import argparse
+import hashlib
+import hmac
+import itertools
+import json
+import re
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+
+class StubState:
+    def __init__(self, connect_latency_ms: float = 0, throttle_every: int = 0, retry_after: str = "0",
+                 deploy_polls: int = 3, deploy_seconds: float = 0, webhook_url: Optional[str] = None,
+                 webhook_secret: str = ""):
+        self.connect_latency = connect_latency_ms / 1000
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.deploy_polls = deploy_polls
+        self.deploy_seconds = deploy_seconds
+        self.webhook_url = webhook_url
+        self.webhook_secret = webhook_secret
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "connections": 0, "not_modified": 0, "throttled": 0, "webhooks": 0}
+        self.ids = itertools.count(1000)
+        self.repos: Dict[str, dict] = {}
+        self.projects: Dict[str, dict] = {}
+        self.deployments: Dict[str, dict] = {}
+
+    def count(self, key: str) -> int:
+        with self.lock:
+            self.stats[key] += 1
+            return self.stats[key]
+
+    def schedule_webhooks(self, dep: dict) -> None:
+        """Push BUILDING/READY transitions of a time-based deployment to --webhook-url"""
+        if not (self.webhook_url and self.deploy_seconds):
+            return
+        for at, event_type in ((0.2, "deployment.building"), (1.0, "deployment.succeeded")):
+            timer = threading.Timer(self.deploy_seconds * at, self._post_webhook, (event_type, dep))
+            timer.daemon = True
+            timer.start()
+
+    def _post_webhook(self, event_type: str, dep: dict) -> None:
+        body = json.dumps({"type": event_type, "payload": {"deployment": {"id": dep["id"], "url": dep["url"]}}})
+        signature = hmac.new(self.webhook_secret.encode(), body.encode(), hashlib.sha1).hexdigest()
+        request = urllib.request.Request(
+            self.webhook_url, data=body.encode(), method="POST",
+            headers={"Content-Type": "application/json", "x-vercel-signature": signature},
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+            self.count("webhooks")
+        except Exception as e:
+            print(f"⚠️  Webhook delivery failed: {e}")
+
+
+USER = {"login": "stub-user", "id": 1, "name": "Stub User", "email": "stub@example.com",
+        "avatar_url": "https://example.com/avatar.png", "username": "stub-user"}
+
+
+def _repo(name: str, repo_id: int) -> dict:
+    full = f"{USER['login']}/{name}"
+    return {
+        "id": repo_id, "name": name, "full_name": full, "private": False, "default_branch": "main",
+        "html_url": f"https://github.com/{full}", "clone_url": f"https://github.com/{full}.git",
+        "ssh_url": f"git@github.com:{full}.git", "git_url": f"git://github.com/{full}.git",
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are separate writes
+    state: StubState  # set by make_server
+
+    def setup(self):
+        # One handler instance per connection
+        super().setup()
+        self.state.count("connections")
+        if self.state.connect_latency:
+            time.sleep(self.state.connect_latency)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _send(self, status: int, payload: Any = None, headers: Optional[Dict[str, str]] = None) -> None:
+        data = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data and self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _send_cacheable(self, payload: Any) -> None:
+        etag = '"%s"' % hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.state.count("not_modified")
+            self._send(304, None, {"ETag": etag})
+        else:
+            self._send(200, payload, {"ETag": etag})
+
+    def _throttled(self) -> bool:
+        n = self.state.count("requests")
+        if self.path == "/_stats" or not self.state.throttle_every or n % self.state.throttle_every:
+            return False
+        self.state.count("throttled")
+        self._send(429, {"message": "rate limited"}, {"Retry-After": self.state.retry_after})
+        return True
+
+    def _route(self) -> Tuple[int, Any, bool]:
+        """(status, payload, cacheable) for the current request"""
+        method, path = self.command, self.path.split("?", 1)[0]
+        state = self.state
+        if path == "/_stats":
+            return 200, dict(state.stats), False
+
+        # GitHub
+        if path == "/user" and method == "GET":
+            return 200, USER, True
+        if path == "/user/repos" and method == "GET":
+            return 200, list(state.repos.values()), True
+        if path == "/user/repos" and method == "POST":
+            body = self._body()
+            if body.get("name") in state.repos:
+                return 422, {"message": "Validation Failed", "errors": [{"message": "name already exists"}]}, False
+            repo = state.repos[body["name"]] = _repo(body["name"], next(state.ids))
+            return 201, repo, False
+        m = re.fullmatch(r"/repos/[^/]+/([^/]+)", path)
+        if m and method == "GET":
+            repo = state.repos.get(m.group(1))
+            return (200, repo, True) if repo else (404, {"message": "Not Found"}, False)
+
+        # Vercel
+        if path == "/v2/user" and method == "GET":
+            return 200, {"user": USER, **USER, "id": "user_stub"}, True
+        if path == "/v10/projects" and method == "GET":
+            return 200, {"projects": list(state.projects.values())}, True
+        if path == "/v11/projects" and method == "POST":
+            body = self._body()
+            project = {"id": f"prj_{next(state.ids)}", "name": body.get("name"), "framework": body.get("framework"),
+                       "accountId": "team_stub", "createdAt": int(time.time() * 1000),
+                       "link": {"repo": (body.get("gitRepository") or {}).get("repo")}}
+            state.projects[project["id"]] = project
+            return 201, project, False
+        m = re.fullmatch(r"/v9/projects/([^/]+)", path)
+        if m and method == "GET":
+            project = state.projects.get(m.group(1)) or next(
+                (p for p in state.projects.values() if p["name"] == m.group(1)), None)
+            return (200, project, True) if project else (404, {"error": {"message": "Project not found"}}, False)
+        if path == "/v13/deployments" and method == "POST":
+            body = self._body()
+            dep_id = f"dpl_{next(state.ids)}"
+            url = f"{body.get('name')}-{dep_id[-4:]}.vercel.app"
+            state.deployments[dep_id] = {"id": dep_id, "url": url, "readyState": "QUEUED", "polls": 0,
+                                         "createdAt": int(time.time() * 1000), "automaticAliases": [url]}
+            state.schedule_webhooks(state.deployments[dep_id])
+            return 200, {k: v for k, v in state.deployments[dep_id].items() if k != "polls"}, False
+        m = re.fullmatch(r"/v13/deployments/([^/]+)", path)
+        if m and method == "GET":
+            dep = state.deployments.get(m.group(1))
+            if not dep:
+                return 404, {"error": {"message": "Deployment not found"}}, False
+            dep["polls"] += 1
+            if state.deploy_seconds:
+                progress = (time.time() * 1000 - dep["createdAt"]) / 1000 / state.deploy_seconds
+            else:
+                progress = dep["polls"] / state.deploy_polls
+            if progress >= 1:
+                dep.update(readyState="READY", ready=True, aliasFinal=dep["url"])
+            elif progress >= 0.2 or not state.deploy_seconds:
+                dep["readyState"] = "BUILDING"
+            return 200, {k: v for k, v in dep.items() if k != "polls"}, True
+
+        return 404, {"message": "Not Found"}, False
+
+    def _handle(self) -> None:
+        if self._throttled():
+            return
+        status, payload, cacheable = self._route()
+        if status == 200 and cacheable:
+            self._send_cacheable(payload)
+        else:
+            self._send(status, payload)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+
+def make_server(port: int = 0, **options) -> ThreadingHTTPServer:
+    """Build a stub server (port 0 = any free port); run it with serve_forever()"""
+    handler = type("BoundStubHandler", (StubHandler,), {"state": StubState(**options)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(port: int = 0, **options) -> Tuple[ThreadingHTTPServer, str]:
+    server = make_server(port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9876)
+    parser.add_argument("--connect-latency-ms", type=float, default=0)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--retry-after", default="1")
+    parser.add_argument("--deploy-polls", type=int, default=3)
+    parser.add_argument("--deploy-seconds", type=float, default=0, help="Time-based deployments instead")
+    parser.add_argument("--webhook-url", help="e.g. http://127.0.0.1:8080/api/vercel/webhook")
+    parser.add_argument("--webhook-secret", default="")
+    args = parser.parse_args()
+
+    server = make_server(
+        args.port,
+        connect_latency_ms=args.connect_latency_ms,
+        throttle_every=args.throttle_every,
+        retry_after=args.retry_after,
+        deploy_polls=args.deploy_polls,
+        deploy_seconds=args.deploy_seconds,
+        webhook_url=args.webhook_url,
+        webhook_secret=args.webhook_secret,
+    )
+    print(f"🧪 Stub GitHub/Vercel API on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()